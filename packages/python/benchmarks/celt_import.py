@@ -0,0 +1,64 @@
+"""Measure the time needed to create a celt post processor.
+
+Each measurement runs in a fresh interpreter and times the import of
+`m.ci.celt.post_processor` along with the creation of the post processor
+of one tool, which imports the module of that tool. The modules loaded
+with `importlib.import_module` do not show up in `python -X importtime`,
+so the time is taken with `time.perf_counter` instead.
+
+Run from the root of the repository::
+
+    PYTHONPATH=packages/python python packages/python/benchmarks/celt_import.py
+"""
+import statistics
+import subprocess  # noqa: S404
+import sys
+
+TOOLS = ('flake8', 'eslint', 'ruff')
+RUNS = 21
+SCRIPT = """
+import sys
+import time
+import m.ci.celt.core.process
+start = time.perf_counter()
+from m.ci.celt.post_processor import get_post_processor
+from m.ci.celt.core.types import Configuration
+get_post_processor('{tool}', Configuration())
+elapsed = time.perf_counter() - start
+loaded = sum('celt.post_processors.' in name for name in sys.modules)
+print(elapsed * 1000, loaded)
+"""
+
+
+def creation_time(tool: str) -> tuple[float, int]:
+    """Create the post processor of a tool in a fresh interpreter.
+
+    The celt core modules are imported before starting the timer since
+    they are needed regardless of the tool.
+
+    Args:
+        tool: The name of the tool.
+
+    Returns:
+        The milliseconds it took and the number of post processor modules
+        that were imported.
+    """
+    output = subprocess.check_output(  # noqa: S603
+        [sys.executable, '-c', SCRIPT.format(tool=tool)],
+        text=True,
+    )
+    elapsed, loaded = output.split()
+    return float(elapsed), int(loaded)
+
+
+def main() -> None:
+    """Print the median time of each tool."""
+    print(f'{"tool":>8} {"median ms":>10} {"modules":>8}')  # noqa: WPS421
+    for tool in TOOLS:
+        runs = [creation_time(tool) for _ in range(RUNS)]
+        median = statistics.median(elapsed for elapsed, _ in runs)
+        print(f'{tool:>8} {median:10.2f} {runs[0][1]:8}')  # noqa: WPS421
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Compare the celt line tokenizer with the previous implementation.
+
+Both the time and the memory retained by the reports are measured.
+
+The previous implementation rewrote the file prefixes with `re.sub` and a
+python callback, then split the payload into lines and called `re.match`
+with an uncompiled pattern on each one of them.
+
+Run from the root of the repository::
+
+    PYTHONPATH=packages/python python packages/python/benchmarks/celt_tokenizer.py
+"""
+import re
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from m.ci.celt.core.tokenizer import path_replacer, replace_paths
+from m.ci.celt.core.types import FileReport, Violation
+from m.ci.celt.post_processors import pycodestyle
+
+FILE_PREFIX = '/workspaces/m/|/home/runner/work/m/:repo/'
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def synthetic_payload(total_lines: int) -> str:
+    """Generate a flake8 like payload.
+
+    Args:
+        total_lines: The number of lines in the payload.
+
+    Returns:
+        The payload.
+    """
+    rules = ('E303', 'E501', 'WPS210', 'D103', 'W291')
+    return '\n'.join([
+        f'/workspaces/m/src/pkg{num % 50}/mod{num % 997}.py:{num % 800}:'
+        f'{num % 80}: {rules[num % 5]} some message about line {num}'
+        for num in range(total_lines)
+    ])
+
+
+def legacy_replace_filenames(payload: str, file_prefix: str) -> str:
+    old, prefix = file_prefix.split(':')
+    return re.sub(
+        fr'({old})(.*?)\.([a-z]+)',
+        lambda x: [
+            f'{prefix}{filename}.{ext}'
+            for _, filename, ext in (x.groups(),)
+        ][0],
+        payload,
+    )
+
+
+def legacy_read_payload(payload: str) -> List[FileReport]:
+    regex = r'(.*):(\d+):(\d+): (\w+) (.*)'
+    report: Dict[str, List[Violation]] = {}
+    for line in payload.splitlines():
+        match = re.match(regex, line)
+        if match:
+            group = match.groups()
+            violation = Violation(
+                file_path=group[0],
+                line=int(group[1]),
+                column=int(group[2]),
+                rule_id=group[3],
+                message=group[4],
+            )
+            if violation.file_path not in report:
+                report[violation.file_path] = []
+            report[violation.file_path].append(violation)
+    return [
+        FileReport(file_path=name, violations=violations)
+        for name, violations in report.items()
+    ]
+
+
+def legacy(payload: str) -> List[FileReport]:
+    return legacy_read_payload(legacy_replace_filenames(payload, FILE_PREFIX))
+
+
+def current(payload: str) -> List[FileReport]:
+    replacer = path_replacer(FILE_PREFIX).value
+    return replace_paths(pycodestyle.read_payload(payload).value, replacer)
+
+
+def timeit(func: Callable[[str], List[FileReport]], payload: str) -> float:
+    start = time.perf_counter()
+    func(payload)
+    return time.perf_counter() - start
+
+
+def retained_mb(func: Callable[[str], List[FileReport]], payload: str) -> float:
+    tracemalloc.start()
+    reports = func(payload)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reports
+    return size / 2**20
+
+
+def main() -> None:
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print(
+        f'{"lines":>10} {"legacy (s)":>12} {"current (s)":>12} {"speedup":>8}'
+        f' {"legacy (MB)":>12} {"current (MB)":>13}',
+    )
+    for size in sizes:
+        payload = synthetic_payload(size)
+        assert legacy(payload) == current(payload)
+        legacy_time = timeit(legacy, payload)
+        current_time = timeit(current, payload)
+        speedup = legacy_time / current_time
+        legacy_mb = retained_mb(legacy, payload)
+        current_mb = retained_mb(current, payload)
+        print(
+            f'{size:>10} {legacy_time:>12.3f} {current_time:>12.3f}'
+            f' {speedup:>7.2f}x {legacy_mb:>12.1f} {current_mb:>13.1f}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Measure the Github requests of the release and ci commands.
+
+The requests are sent to `m.testing.FakeGithub`, a local stand in for the
+Github API, with a simulated latency. The flows only include the Github
+part of the commands, the git operations and prompts are skipped:
+
+- review_release: find the branch pull requests, read the latest release
+  and create the release pull requests.
+- end_release: find the branch pull requests and merge them.
+- github ci: run `m github ci --merge-commit` in process.
+
+Run from the root of the repository::
+
+    PYTHONPATH=packages/python python \\
+        packages/python/benchmarks/github_flows.py --latency 0.05
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Callable
+
+from m.__main__ import main as m_main
+from m.ci import end_release, review_release
+from m.ci.config import Config, GitFlowConfig, MFlowConfig, Workflow
+from m.core import Good, Res, issue, one_of
+from m.github import request as github_request
+from m.github.cli import get_latest_release
+from m.github.graphql.queries.branch_prs import fetch as fetch_branch_prs
+from m.testing import FakeGithub
+from m.testing.fake_github import FakeCommit
+
+TOKEN = 'fake-token'  # noqa: S105 - only sent to the local server
+VERSION = '1.1.0'
+BRANCH = f'release/{VERSION}'
+HEAD_SHA = 'a' * 40
+BASE_SHA = 'b' * 40
+MERGE_SHA = 'c' * 40
+CONFIG = Config(
+    owner='fake',
+    repo='hotdog',
+    version=VERSION,
+    m_dir='m',
+    workflow=Workflow.git_flow,
+    git_flow=GitFlowConfig(),
+    m_flow=MFlowConfig(),
+)
+
+
+def review_release_flow(fake: FakeGithub) -> Res[None]:
+    """Create the release pull requests.
+
+    Args:
+        fake: The fake Github server.
+
+    Returns:
+        None if successful, otherwise an issue.
+    """
+    fake.state.pull_requests.clear()
+    owner, repo = CONFIG.owner, CONFIG.repo
+    return one_of(lambda: [
+        None
+        for prs in fetch_branch_prs(TOKEN, owner, repo, BRANCH)
+        for _ in review_release.inspect_prs(prs)
+        for gh_ver in get_latest_release(TOKEN, owner, repo)
+        for _ in review_release.create_prs(
+            TOKEN,
+            CONFIG,
+            'release',
+            VERSION,
+            gh_ver,
+        )
+    ])
+
+
+def end_release_flow(fake: FakeGithub) -> Res[None]:
+    """Merge the pull requests created by `review_release_flow`.
+
+    The release is added to the server beforehand so that the second pull
+    request is merged without waiting.
+
+    Args:
+        fake: The fake Github server.
+
+    Returns:
+        None if successful, otherwise an issue.
+    """
+    fake.state.releases.append(VERSION)
+    return one_of(lambda: [
+        None
+        for prs in fetch_branch_prs(TOKEN, CONFIG.owner, CONFIG.repo, BRANCH)
+        for _ in end_release.inspect_prs(prs)
+        for _ in end_release.merge_prs(TOKEN, CONFIG, prs, VERSION)
+    ])
+
+
+def github_ci_flow(fake: FakeGithub) -> Res[None]:
+    """Run `m github ci` for a merge commit.
+
+    Args:
+        fake: The fake Github server.
+
+    Returns:
+        None if the command succeeded, otherwise an issue.
+    """
+    sys.argv = [
+        'm', 'github', 'ci',
+        '--owner', CONFIG.owner,
+        '--repo', CONFIG.repo,
+        '--sha', MERGE_SHA,
+        '--merge-commit',
+    ]
+    try:
+        m_main()
+    except SystemExit as ex:
+        if ex.code:
+            return issue('m github ci failed', context={'code': ex.code})
+    return Good(None)
+
+
+FLOWS: dict[str, Callable[[FakeGithub], Res[None]]] = {
+    'review_release': review_release_flow,
+    'end_release': end_release_flow,
+    'github ci': github_ci_flow,
+}
+
+
+def _seed(fake: FakeGithub) -> None:
+    fake.state.releases.append('1.0.0')
+    fake.state.commits.extend([
+        FakeCommit(BASE_SHA, 'base commit'),
+        FakeCommit(HEAD_SHA, 'head commit'),
+        FakeCommit(
+            MERGE_SHA,
+            f'Merge {HEAD_SHA} into {BASE_SHA}',
+            [BASE_SHA, HEAD_SHA],
+        ),
+    ])
+
+
+def main() -> None:
+    """Print the p50/p99 latency and requests of each flow."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0)
+    args = parser.parse_args()
+    os.environ['GITHUB_TOKEN'] = TOKEN
+    timings: dict[str, list[float]] = {name: [] for name in FLOWS}
+    requests: dict[str, int] = dict.fromkeys(FLOWS, 0)
+    fake = FakeGithub(latency=args.latency, error_rate=args.error_rate)
+    with fake, redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        github_request.GITHUB_API = fake.url
+        _seed(fake)
+        for _ in range(args.runs):
+            for name, flow in FLOWS.items():
+                sent = len(fake.requests)
+                start = time.perf_counter()
+                res = flow(fake)
+                timings[name].append(time.perf_counter() - start)
+                requests[name] += len(fake.requests) - sent
+                if res.is_bad:
+                    raise SystemExit(f'{name} failed: {res.value}')
+    print(  # noqa: WPS421
+        f'{"flow":>16} {"p50 ms":>8} {"p99 ms":>8} {"requests":>9}',
+    )
+    for name, runs in timings.items():
+        cuts = statistics.quantiles(runs, n=100, method='inclusive')
+        p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+        per_run = requests[name] / args.runs
+        print(  # noqa: WPS421
+            f'{name:>16} {p50:8.1f} {p99:8.1f} {per_run:9.1f}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Measure the latency of the shell prompt in a git repository.
+
+A temporary repository is created with committed, modified, staged and
+untracked files along with a stash. Four measurements are reported:
+
+- git calls: the git commands previously needed by the prompt (branch,
+  status, stash, and repository path).
+- prompter: `m.devcontainer.prompter.prompter`, which reads everything
+  from one `git status --porcelain=v2` call.
+- m devcontainer prompter: the command as run by `PROMPT_COMMAND`,
+  including the interpreter startup.
+- daemon: a prompt request to `m devcontainer prompter --daemon` over its
+  unix socket, answered from memory.
+
+Run from the root of the repository::
+
+    PYTHONPATH=packages/python python \\
+        packages/python/benchmarks/prompter.py --files 5000
+"""
+import argparse
+import os
+import statistics
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from m.devcontainer.inotify import Inotify
+from m.devcontainer.prompter import prompter
+from m.devcontainer.prompter_daemon import PromptDaemon, request_prompt
+
+# the benchmark runs in the temporary repository
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(  # noqa: S603, S607
+        ['git', *args],
+        cwd=repo,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def create_repo(repo: Path, files: int) -> None:
+    """Create a repository with changes in every state shown by the prompt.
+
+    Args:
+        repo: The directory of the repository.
+        files: The number of committed files.
+    """
+    _git(repo, 'init', '-q', '-b', 'master')
+    _git(repo, 'config', 'user.email', 'bench@example.com')
+    _git(repo, 'config', 'user.name', 'bench')
+    for index in range(files):
+        folder = repo / f'dir{index % 50}'
+        folder.mkdir(exist_ok=True)
+        (folder / f'file{index}.txt').write_text(f'{index}\n')
+    _git(repo, 'add', '.')
+    _git(repo, 'commit', '-q', '-m', 'initial commit')
+    (repo / 'dir0' / 'file0.txt').write_text('stashed\n')
+    _git(repo, 'stash', '-q')
+    (repo / 'dir1' / 'file1.txt').write_text('staged\n')
+    _git(repo, 'add', '.')
+    (repo / 'dir2' / 'file2.txt').write_text('modified\n')
+    for index in range(files // 100):
+        (repo / f'untracked{index}.txt').write_text('untracked\n')
+
+
+LEGACY_CMDS = (
+    'git rev-parse --abbrev-ref HEAD',
+    'git status',
+    'git stash show',
+    'git rev-parse --show-toplevel',
+)
+
+
+def git_calls() -> None:
+    """Run the git commands previously used by the prompt."""
+    for cmd in LEGACY_CMDS:
+        subprocess.run(  # noqa: S603, S607
+            cmd.split(' '),
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+def cli_prompter() -> None:
+    """Run `m devcontainer prompter` in a new interpreter."""
+    subprocess.run(  # noqa: S603
+        [sys.executable, '-m', 'm', 'devcontainer', 'prompter'],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        env={**os.environ, 'PYTHONPATH': str(PACKAGE_DIR)},
+    )
+
+
+def measure(func: Callable[[], object], runs: int) -> tuple[float, float]:
+    """Time a function.
+
+    Args:
+        func: The function to time.
+        runs: The number of times to run the function.
+
+    Returns:
+        The p50 and p99 in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return cuts[49], cuts[98]
+
+
+def main() -> None:
+    """Print the p50/p99 latency of the prompt."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--files', type=int, default=2000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repo = Path(tmp_dir) / 'repo'
+        repo.mkdir()
+        create_repo(repo, args.files)
+        os.chdir(repo)
+        socket_path = f'{tmp_dir}/prompter.sock'
+        daemon = PromptDaemon(Inotify.create().value)
+        server = threading.Thread(
+            target=daemon.serve_forever,
+            args=[socket_path],
+        )
+        server.start()
+        time.sleep(0.5)
+        benchmarks: dict[str, Callable[[], object]] = {
+            'git calls': git_calls,
+            'prompter': prompter,
+            'm devcontainer prompter': cli_prompter,
+            'daemon': lambda: request_prompt(socket_path, str(repo)),
+        }
+        print(f'{"":>24} {"p50 ms":>8} {"p99 ms":>8}')  # noqa: WPS421
+        for name, func in benchmarks.items():
+            p50, p99 = measure(func, args.runs)
+            print(f'{name:>24} {p50:8.1f} {p99:8.1f}')  # noqa: WPS421
+        daemon.shutdown()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
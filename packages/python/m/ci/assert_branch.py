@@ -50,7 +50,12 @@ def _verify_branch(
     return Good(0)
 
 
-def assert_branch(assertion_type: str, m_dir: str) -> Res[Config]:
+def assert_branch(
+    assertion_type: str,
+    m_dir: str,
+    *,
+    session: git.GitSession | None = None,
+) -> Res[Config]:
     """Make sure git is using the correct branch based on the workflow.
 
     Args:
@@ -58,6 +63,8 @@ def assert_branch(assertion_type: str, m_dir: str) -> Res[Config]:
             Either 'release' or 'hotfix'.
         m_dir:
             The directory for the m configuration.
+        session:
+            The git session used to find the branch.
 
     Returns:
         A OneOf containing `None` or an `Issue`.
@@ -65,6 +72,6 @@ def assert_branch(assertion_type: str, m_dir: str) -> Res[Config]:
     return one_of(lambda: [
         config
         for config in cfg_mod.read_config(m_dir)
-        for branch in git.get_branch()
+        for branch in git.get_branch(session=session)
         for _ in _verify_branch(config, branch, assertion_type)
     ])
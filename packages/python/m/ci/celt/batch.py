@@ -0,0 +1,182 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from itertools import repeat
+from typing import Any, Dict, List, Optional
+
+from pydantic import Field
+
+from ...core import Bad, Good, Res, one_of, rw
+from ...core.yaml_fp import read_yson
+from ...pydantic import CamelModel, load_model
+from .core.types import Configuration, ExitCode
+from .post_processor import get_post_processor
+
+
+class BatchEntry(CamelModel):
+    """A compiler/linter output to process in a batch."""
+
+    tool: str = Field(description='name of a supported compiler/linter')
+
+    payload: str = Field(
+        description='path to the file with the compiler/linter output',
+    )
+
+    config: Optional[str | Dict[str, Any]] = Field(
+        default=None,
+        description=(
+            'rule allowances or path to a json/yaml file with them, '
+            'defaults to the config provided to the cli'
+        ),
+    )
+
+    file_regex: Optional[str] = Field(
+        default=None,
+        description='regex expression to filter files',
+    )
+
+    file_prefix: Optional[str] = Field(
+        default=None,
+        description="replace file prefix with 'old1|old2:new'",
+    )
+
+
+class BatchManifest(CamelModel):
+    """List of compiler/linter outputs to process in a single run."""
+
+    tools: List[BatchEntry]
+
+
+@dataclass
+class BatchResult:
+    """The outcome of processing a `BatchEntry`.
+
+    Only strings are sent back from the worker processes, the violations
+    stay in the process that read them.
+    """
+
+    tool: str
+    payload: str
+    status: ExitCode
+    output: str = ''
+    error_msg: str = ''
+    issue: Optional[Dict[str, Any]] = None
+
+
+def load_manifest(file_path: str) -> Res[BatchManifest]:
+    """Read a batch manifest from a json or yaml file.
+
+    Args:
+        file_path: The path to the manifest.
+
+    Returns:
+        A `OneOf` containing an `Issue` or the `BatchManifest`.
+    """
+    return load_model(BatchManifest, file_path)
+
+
+def _rule_config(
+    config: Optional[str | Dict[str, Any]],
+    default: Dict[str, Any],
+) -> Res[Dict[str, Any]]:
+    if config is None:
+        return Good(default)
+    if isinstance(config, str):
+        return read_yson(config.removeprefix('@'), error_if_empty=True)
+    return Good(config)
+
+
+def run_entry(
+    entry: BatchEntry,
+    celt_config: Configuration,
+    default_config: Dict[str, Any],
+    stats_only: bool = False,
+) -> BatchResult:
+    """Process a single entry of a batch.
+
+    This function runs in a worker process.
+
+    Args:
+        entry: The entry to process.
+        celt_config: The post processor configuration shared by all entries.
+        default_config: The rule allowances for entries without a config.
+        stats_only: Render the stats json instead of the report.
+
+    Returns:
+        A `BatchResult` with the rendered report.
+    """
+    config = replace(
+        celt_config,
+        file_regex=entry.file_regex or celt_config.file_regex,
+        file_prefix=entry.file_prefix or celt_config.file_prefix,
+    )
+    either = one_of(lambda: [
+        (tool, project)
+        for tool in get_post_processor(entry.tool, config)
+        for rule_config in _rule_config(entry.config, default_config)
+        for payload in rw.read_file(entry.payload.removeprefix('@'))
+        for project in tool.run(payload, rule_config)
+    ])
+    if isinstance(either, Bad):
+        return BatchResult(
+            entry.tool,
+            entry.payload,
+            ExitCode.error,
+            issue=dict(either.value.to_dict()),
+        )
+    tool, project = either.value
+    return BatchResult(
+        entry.tool,
+        entry.payload,
+        project.status,
+        tool.stats_json(project) if stats_only else tool.to_str(project),
+        project.error_msg,
+    )
+
+
+def run_batch(
+    entries: List[BatchEntry],
+    celt_config: Configuration,
+    default_config: Dict[str, Any],
+    stats_only: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[BatchResult]:
+    """Process several compiler/linter outputs in parallel.
+
+    Each entry is processed in its own worker process so that the total
+    time is close to the time of the slowest entry.
+
+    Args:
+        entries: The entries to process.
+        celt_config: The post processor configuration shared by all entries.
+        default_config: The rule allowances for entries without a config.
+        stats_only: Render the stats json instead of the report.
+        max_workers: Number of worker processes, defaults to one per entry
+            up to the number of CPUs.
+
+    Returns:
+        The results in the same order as the entries.
+    """
+    workers = max_workers or min(len(entries), os.cpu_count() or 1)
+    args = (repeat(celt_config), repeat(default_config), repeat(stats_only))
+    if workers <= 1:
+        return list(map(run_entry, entries, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_entry, entries, *args))
+
+
+def combined_status(results: List[BatchResult]) -> ExitCode:
+    """Compute the exit code of a batch.
+
+    Args:
+        results: The results of the batch.
+
+    Returns:
+        `ExitCode.error` if an entry failed, `ExitCode.needs_readjustment`
+        if an entry needs readjustment and `ExitCode.ok` otherwise.
+    """
+    statuses = {res.status for res in results}
+    for status in (ExitCode.error, ExitCode.needs_readjustment):
+        if status in statuses:
+            return status
+    return ExitCode.ok
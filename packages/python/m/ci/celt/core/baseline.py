@@ -0,0 +1,335 @@
+import hashlib
+import os
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from ....core import Good, Res, issue
+from .types import FileReport, ViolationView
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    tool TEXT NOT NULL,
+    path TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (tool, path)
+);
+CREATE TABLE IF NOT EXISTS counts (
+    tool TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rule_id TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (tool, path, rule_id)
+);
+"""
+
+FileCounts = Dict[str, Dict[str, int]]
+
+# A file modified this close to the time it was indexed may change again
+# without changing its mtime, its stamp is not trusted.
+RACY_NS = 2 * 10**9
+
+
+def file_digest(file_path: str) -> str:
+    """Compute the content hash of a file.
+
+    Args:
+        file_path: The path to the file.
+
+    Returns:
+        The blake2b hex digest of the file or an empty string if the file
+        cannot be read.
+    """
+    try:
+        return hashlib.blake2b(
+            Path(file_path).read_bytes(),
+            digest_size=16,
+        ).hexdigest()
+    except OSError:
+        return ''
+
+
+def file_stamp(file_path: str) -> Tuple[int, int]:
+    """Read the modification time and the size of a file.
+
+    Args:
+        file_path: The path to the file.
+
+    Returns:
+        The modification time in nanoseconds and the size of the file or
+        `(-1, -1)` if the file cannot be read.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return -1, -1
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _index_row(tool: str, file_path: str, now: int) -> Tuple[Any, ...]:
+    mtime_ns, size = file_stamp(file_path)
+    if now - mtime_ns < RACY_NS:
+        mtime_ns = -1
+    return tool, file_path, file_digest(file_path), mtime_ns, size
+
+
+def file_rule_counts(reports: List[FileReport]) -> FileCounts:
+    """Count the violations of each rule in each of the reports.
+
+    Args:
+        reports: A list of `FileReport` instances.
+
+    Returns:
+        A map of file paths to a map of rule ids to number of violations.
+    """
+    counts: FileCounts = {}
+    for rpt in reports:
+        violations = rpt.violations
+        if isinstance(violations, ViolationView):
+            table = violations.table
+            rule_ids = Counter(table.rules[row] for row in violations.rows)
+            file_counts = {
+                table.rule_ids[rule]: total
+                for rule, total in rule_ids.items()
+            }
+        else:
+            file_counts = dict(Counter(v.rule_id for v in violations))
+        counts[rpt.file_path] = file_counts
+    return counts
+
+
+class BaselineIndex:
+    """Per file violation counts persisted in a SQLite database.
+
+    The index stores the content hash, modification time and size of each
+    file along with the number of violations of each rule. A single
+    database may hold the index of several tools.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """Initialize the index.
+
+        Args:
+            connection: An open connection to the database.
+        """
+        self.connection = connection
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'BaselineIndex':
+        """Use the index as a context manager.
+
+        Returns:
+            The index.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Close the index.
+
+        Args:
+            exc_type: The type of the exception raised in the block.
+            exc_value: The exception raised in the block.
+            traceback: The traceback of the exception.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def file_counts(self, tool: str, skip: Collection[str]) -> FileCounts:
+        """Read the cached counts of the files that have not changed.
+
+        Args:
+            tool: The name of the compiler/linter.
+            skip: The files whose cached counts should be ignored.
+
+        Returns:
+            A map of file paths to a map of rule ids to number of violations.
+        """
+        rows = self.connection.execute(
+            'SELECT path, rule_id, total FROM counts WHERE tool = ?',
+            (tool,),
+        )
+        counts: FileCounts = {}
+        for file_path, rule_id, total in rows:
+            if file_path not in skip:
+                counts.setdefault(file_path, {})[rule_id] = total
+        return counts
+
+    def stale_files(self, tool: str) -> List[str]:
+        """Find the indexed files whose contents no longer match the index.
+
+        Only the files whose modification time or size differ from the
+        index are hashed.
+
+        Args:
+            tool: The name of the compiler/linter.
+
+        Returns:
+            The paths of the files that changed since they were indexed.
+        """
+        rows = self.connection.execute(
+            'SELECT path, digest, mtime_ns, size FROM files'
+            ' WHERE tool = ? ORDER BY path',
+            (tool,),
+        )
+        return [
+            file_path
+            for file_path, digest, mtime_ns, size in rows
+            if file_stamp(file_path) != (mtime_ns, size)
+            and file_digest(file_path) != digest
+        ]
+
+    def update(
+        self,
+        tool: str,
+        counts: FileCounts,
+        files: Iterable[str] | None = None,
+    ) -> None:
+        """Store the counts of the files that were evaluated.
+
+        Args:
+            tool: The name of the compiler/linter.
+            counts: The fresh counts of the files with violations.
+            files: The files that were evaluated. Files without violations
+                are stored with no counts. If `None`, the index of the tool
+                is rebuilt from `counts`.
+        """
+        paths: Set[str] = set(counts)
+        now = time.time_ns()
+        with self.connection:
+            if files is None:
+                self._delete(tool, None)
+            else:
+                paths.update(files)
+                self._delete(tool, paths)
+            self.connection.executemany(
+                'INSERT INTO files VALUES (?, ?, ?, ?, ?)',
+                [_index_row(tool, path, now) for path in sorted(paths)],
+            )
+            self.connection.executemany(
+                'INSERT INTO counts VALUES (?, ?, ?, ?)',
+                [
+                    (tool, file_path, rule_id, total)
+                    for file_path, rules in counts.items()
+                    for rule_id, total in rules.items()
+                ],
+            )
+
+    def _delete(self, tool: str, paths: Set[str] | None) -> None:
+        for table in ('files', 'counts'):
+            query = f'DELETE FROM {table} WHERE tool = ?'  # noqa: S608
+            if paths is None:
+                self.connection.execute(query, (tool,))
+            else:
+                self.connection.executemany(
+                    f'{query} AND path = ?',
+                    [(tool, path) for path in paths],
+                )
+
+
+@dataclass
+class Baseline:
+    """A baseline index along with the files evaluated by the tool."""
+
+    index: BaselineIndex
+    tool: str
+
+    # The files given to the compiler/linter, `None` if the whole project
+    # was evaluated.
+    changed_files: Optional[List[str]] = None
+
+    def sync(self, fresh: FileCounts) -> Res[FileCounts]:
+        """Exchange the fresh counts for the cached counts.
+
+        The evaluated files are the changed files along with any file with
+        violations. Their counts are replaced in the index.
+
+        Without changed files the index is rebuilt from the files with
+        violations, the clean files are not indexed and their changes go
+        unnoticed until they are listed.
+
+        The indexed files are hashed to find the ones that changed without
+        being listed. Deleted files are dropped from the index, the counts
+        of the other ones cannot be trusted and an issue is returned.
+
+        Args:
+            fresh: The counts of the evaluated files.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the cached counts of the files
+            that were not evaluated.
+        """
+        if self.changed_files is None:
+            self.index.update(self.tool, fresh)
+            return Good({})
+        evaluated = set(self.changed_files).union(fresh)
+        stale = [
+            file_path
+            for file_path in self.index.stale_files(self.tool)
+            if file_path not in evaluated
+        ]
+        unlisted = [path for path in stale if Path(path).exists()]
+        if unlisted:
+            return issue('files changed since they were indexed', context={
+                'files': unlisted,
+                'suggestion': 'evaluate them and add them to --changed-files',
+            })
+        evaluated.update(stale)
+        cached = self.index.file_counts(self.tool, evaluated)
+        self.index.update(self.tool, fresh, evaluated)
+        return Good(cached)
+
+
+def open_baseline(db_path: str) -> Res[BaselineIndex]:
+    """Open or create a baseline index.
+
+    Args:
+        db_path: The path to the SQLite database.
+
+    Returns:
+        A `OneOf` containing an `Issue` or the `BaselineIndex`.
+    """
+    try:
+        return Good(BaselineIndex(sqlite3.connect(db_path)))
+    except sqlite3.Error as ex:
+        return issue(
+            'failed to open the baseline index',
+            context={'db_path': db_path},
+            cause=ex,
+        )
+
+
+def merge_counts(
+    fresh: FileCounts,
+    cached: FileCounts,
+) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Combine the fresh counts with the cached counts.
+
+    Args:
+        fresh: The counts of the files that were evaluated.
+        cached: The counts of the files that were not evaluated.
+
+    Returns:
+        The total number of violations per rule and per file.
+    """
+    rule_totals: Dict[str, int] = {}
+    file_totals: Dict[str, int] = {}
+    for counts in (cached, fresh):
+        for file_path, rules in counts.items():
+            file_totals[file_path] = sum(rules.values())
+            for rule_id, total in rules.items():
+                rule_totals[rule_id] = rule_totals.get(rule_id, 0) + total
+    return rule_totals, file_totals
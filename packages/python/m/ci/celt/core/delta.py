@@ -0,0 +1,127 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .types import ExitCode, FileReport, ProjectStatus, RuleInfo, Violation
+
+# Locations embedded in the messages, i.e. "defined at line 12".
+LOCATION_REGEX = re.compile(r'\b(lines?|col(?:umn)?)\s+\d+', re.IGNORECASE)
+SPACES_REGEX = re.compile(r'\s+')
+
+ViolationKey = Tuple[str, str, str]
+
+
+def normalize_message(message: str) -> str:
+    """Remove the parts of a message that change when lines are shifted.
+
+    Args:
+        message: The message of a violation.
+
+    Returns:
+        The message without locations and with collapsed whitespace.
+    """
+    no_locations = LOCATION_REGEX.sub(r'\1 #', message)
+    return SPACES_REGEX.sub(' ', no_locations).strip()
+
+
+def violation_key(violation: Violation) -> ViolationKey:
+    """Compute the key used to match violations between two payloads.
+
+    The key does not include the line or column so that a violation is
+    still matched after code is added or removed above it.
+
+    Args:
+        violation: A violation.
+
+    Returns:
+        The file path, rule id and normalized message of the violation.
+    """
+    return (
+        violation.file_path,
+        violation.rule_id,
+        normalize_message(violation.message),
+    )
+
+
+def _all_violations(reports: Iterable[FileReport]) -> Iterable[Violation]:
+    for rpt in reports:
+        yield from rpt.violations
+
+
+def new_violations(
+    base: Iterable[FileReport],
+    head: Iterable[FileReport],
+) -> List[Violation]:
+    """Find the violations in `head` that are not present in `base`.
+
+    Violations with the same key are first matched by line. The ones left
+    are then matched in order regardless of their line. Both payloads are
+    traversed once.
+
+    Args:
+        base: The reports of the base payload.
+        head: The reports of the head payload.
+
+    Returns:
+        The violations introduced in `head`.
+    """
+    base_keys: Counter[ViolationKey] = Counter()
+    base_lines: Counter[Tuple[ViolationKey, int]] = Counter()
+    for violation in _all_violations(base):
+        key = violation_key(violation)
+        base_keys[key] += 1
+        base_lines[key, violation.line] += 1
+
+    unmatched: List[Tuple[ViolationKey, Violation]] = []
+    for violation in _all_violations(head):
+        key = violation_key(violation)
+        if base_lines[key, violation.line] > 0:
+            base_lines[key, violation.line] -= 1
+            base_keys[key] -= 1
+        else:
+            unmatched.append((key, violation))
+
+    introduced: List[Violation] = []
+    for key, violation in unmatched:
+        if base_keys[key] > 0:
+            base_keys[key] -= 1
+        else:
+            introduced.append(violation)
+    return introduced
+
+
+def get_delta_status(
+    payload: str,
+    violations: Sequence[Violation],
+    ignored_rules: Dict[str, str],
+) -> ProjectStatus:
+    """Create a project status with the violations that were introduced.
+
+    There are no allowances in a delta, any violation of a rule that is
+    not ignored is an error.
+
+    Args:
+        payload: The head payload from the compiler/linter.
+        violations: The violations introduced in the head payload.
+        ignored_rules: A dictionary specifying the rules to ignore.
+
+    Returns:
+        A ProjectStatus object.
+    """
+    rules_dict: Dict[str, List[Violation]] = {}
+    files: Dict[str, List[Violation]] = {}
+    for violation in violations:
+        rules_dict.setdefault(violation.rule_id, []).append(violation)
+        files.setdefault(violation.file_path, []).append(violation)
+    rules = {
+        rule_id: RuleInfo(
+            rule_id,
+            rule_violations,
+            len(rule_violations),
+            ignored=bool(ignored_rules.get(rule_id)),
+        )
+        for rule_id, rule_violations in rules_dict.items()
+    }
+    failed = any(not rule.ignored for rule in rules.values())
+    status = ExitCode.error if failed else ExitCode.ok
+    return ProjectStatus(status, payload, rules, dict(files))
@@ -0,0 +1,135 @@
+import json
+from typing import IO, Any, Dict, Iterable, Iterator
+
+from m.log.ci_tools.providers.github import _gh_format  # noqa: WPS450
+from m.log.ci_tools.types import Message
+
+from .types import ProjectStatus, RuleInfo, Violation
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+# Github only displays the first 10 error annotations of each step.
+GITHUB_ANNOTATION_LIMIT = 10
+
+
+def _exceeded(rule: RuleInfo) -> bool:
+    return not rule.ignored and rule.found > rule.allowed
+
+
+def _sarif_result(rule: RuleInfo, violation: Violation) -> Dict[str, Any]:
+    region: Dict[str, int] = {}
+    if violation.line > 0:
+        region['startLine'] = violation.line
+    if violation.column > 0:
+        region['startColumn'] = violation.column
+    location: Dict[str, Any] = {
+        'artifactLocation': {'uri': violation.file_path},
+    }
+    if region:
+        location['region'] = region
+    return {
+        'ruleId': rule.rule_id,
+        'level': 'error' if _exceeded(rule) else 'warning',
+        'message': {'text': violation.message},
+        'locations': [{'physicalLocation': location}],
+    }
+
+
+def sarif_chunks(name: str, project: ProjectStatus) -> Iterator[str]:
+    """Generate a SARIF 2.1.0 log of the project violations.
+
+    The log is generated in chunks, one per violation, so that it can be
+    written without building the whole document in memory. Violations of
+    rules exceeding their allowance are reported as errors and the rest as
+    warnings. Ignored rules are not reported.
+
+    Args:
+        name: The name of the compiler/linter.
+        project: The project status.
+
+    Yields:
+        Pieces of the SARIF json document.
+    """
+    rules = [rule for rule in project.rules.values() if not rule.ignored]
+    driver = {
+        'name': name,
+        'rules': [{'id': rule.rule_id} for rule in rules],
+    }
+    yield (
+        f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", "runs": '
+        f'[{{"tool": {{"driver": {json.dumps(driver)}}}, "results": ['
+    )
+    separator = ''
+    for rule in rules:
+        for violation in rule.violations:
+            yield separator
+            yield json.dumps(_sarif_result(rule, violation))
+            separator = ', '
+    yield ']}]}\n'
+
+
+def _escape_data(text: str) -> str:
+    return (
+        text
+        .replace('%', '%25')
+        .replace('\r', '%0D')
+        .replace('\n', '%0A')
+    )
+
+
+def _escape_property(text: str) -> str:
+    return _escape_data(text).replace(':', '%3A').replace(',', '%2C')
+
+
+def _annotation(rule: RuleInfo, violation: Violation) -> str:
+    msg = Message(
+        msg=violation.message,
+        file=_escape_property(violation.file_path),
+        line=str(violation.line) if violation.line > 0 else None,
+        col=str(violation.column) if violation.column > 0 else None,
+    )
+    message = _escape_data(f'{rule.rule_id}: {violation.message}')
+    return _gh_format('error', msg, message, '')
+
+
+def github_annotations(
+    project: ProjectStatus,
+    limit: int = GITHUB_ANNOTATION_LIMIT,
+) -> Iterator[str]:
+    """Generate Github workflow commands to annotate the violations.
+
+    Only the violations of rules exceeding their allowance are annotated.
+    Github drops the annotations over its limit so we stop generating them
+    and add a notice with the number of violations that were left out.
+
+    Args:
+        project: The project status.
+        limit: The maximum number of annotations, -1 for no limit.
+
+    Yields:
+        One workflow command per line.
+    """
+    emitted = 0
+    skipped = 0
+    for rule in project.rules.values():
+        if not _exceeded(rule):
+            continue
+        for violation in rule.violations:
+            if emitted == limit:
+                skipped += 1
+                continue
+            emitted += 1
+            yield f'{_annotation(rule, violation)}\n'
+    if skipped:
+        yield f'::notice::{skipped} more violations were not annotated\n'
+
+
+def write_chunks(chunks: Iterable[str], stream: IO[str]) -> None:
+    """Write the chunks of a generated output to a stream.
+
+    Args:
+        chunks: The pieces of the output.
+        stream: A text stream.
+    """
+    for chunk in chunks:
+        stream.write(chunk)
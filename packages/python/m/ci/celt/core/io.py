@@ -1,23 +1,58 @@
-from functools import cmp_to_key
-from typing import Any, Callable, List, Tuple
+import heapq
+from typing import Any, Callable, Dict, List, Tuple
 
 from m.color import color
 
 from .types import Configuration, ExitCode, ProjectStatus, RuleInfo
 
 
-def _compare_rules(rule_a: RuleInfo, rule_b: RuleInfo) -> int:
-    diff = rule_a.found - rule_b.found or rule_a.allowed - rule_b.allowed
-    if not diff:
-        return 1 if rule_a.rule_id < rule_b.rule_id else -1
-    return diff
+def _rule_key(rule: RuleInfo) -> Tuple[int, int, str]:
+    return -rule.found, -rule.allowed, rule.rule_id
 
 
-def _compare_rule_items(
-    rule_a: Tuple[str, RuleInfo],
-    rule_b: Tuple[str, RuleInfo],
-) -> int:
-    return _compare_rules(rule_a[1], rule_b[1])
+def sort_rules(rules: Dict[str, RuleInfo]) -> List[RuleInfo]:
+    """Sort the rules by number of violations found and allowed.
+
+    Rules with the same number of violations found and allowed are sorted
+    in reverse alphabetical order.
+
+    Args:
+        rules: A map of rule ids to `RuleInfo` instances.
+
+    Returns:
+        The rules, the ones with the most violations last.
+    """
+    return sorted(rules.values(), key=_rule_key, reverse=True)
+
+
+def top_files(
+    file_totals: Dict[str, int],
+    max_files: int,
+) -> List[Tuple[str, int]]:
+    """Select the files with the most violations.
+
+    Only the selected files are sorted. Files with the same number of
+    violations keep the order in which they were found.
+
+    Args:
+        file_totals: A map of file paths to the number of violations.
+        max_files: The number of files to select, -1 for all.
+
+    Returns:
+        The selected files and their totals, the file with the most
+        violations last.
+    """
+    items = enumerate(file_totals.items())
+    if -1 < max_files < len(file_totals):
+        selected = heapq.nlargest(
+            max_files,
+            items,
+            key=lambda item: (item[1][1], item[0]),
+        )
+        selected.reverse()
+    else:
+        selected = sorted(items, key=lambda item: item[1][1])
+    return [file_item for _, file_item in selected]
 
 
 def _align(token: Any, alignment: str) -> Callable[[int], str]:
@@ -55,8 +90,8 @@ def rule_info_str(
         buffer.append(f'  {file_loc} - {msg}')
         if rest and config.full_message:
             buffer.extend([f'    {x}' for x in rest])
-    if -1 < config.max_lines < len(rule.violations):
-        remaining = len(rule.violations) - config.max_lines
+    remaining = rule.found - len(violations)
+    if remaining > 0:
         buffer.append(f'  ... and {remaining} more')
     buffer.append('')
     return '\n'.join(buffer)
@@ -99,7 +134,7 @@ def project_status_str(
         The string version of the project status.
     """
     keys = project.rules.keys()
-    rules = sorted(project.rules.values(), key=cmp_to_key(_compare_rules))
+    rules = sort_rules(project.rules)
 
     if project.status == ExitCode.ok:
         buffer = [
@@ -127,11 +162,13 @@ def project_status_str(
     ]
 
     buffer.append(color('{bold}FILES:'))
-    by_file = sorted(project.files.items(), key=lambda t: len(t[1]))
+    by_file = top_files(project.file_totals, celt_config.max_files)
+    remaining_files = len(project.file_totals) - len(by_file)
+    if remaining_files > 0:
+        buffer.append(color(f'  {{gray}}... and {remaining_files} more'))
     buffer.extend([
         color(f'  {{gray}}{file_name}:{{end}} found {total}')
-        for file_name, violations in by_file
-        for total in (len(violations), )
+        for file_name, total in by_file
     ])
     buffer.append('')
 
@@ -143,22 +180,14 @@ def project_status_str(
     c3_w = max([c3_w, len('allowed')])
     widths = [c1_w, c2_w, c3_w]
 
-    key_rule = sorted(
-        project.rules.items(),
-        key=cmp_to_key(_compare_rule_items),
-    )
     buffer.append(format_row(['RULES', 'FOUND', 'ALLOWED'], widths, 'lll'))
     buffer.extend([
-        (
-            color(
-                '{gray}',
-                format_row([rule_id, rule.found, rule.allowed], widths, 'lrr'),
-            )
-            if rule.found == rule.allowed
-            else format_row([rule_id, rule.found, rule.allowed], widths, 'lrr')
-        )
-        for rule_id, rule in key_rule
+        color('{gray}', row) if rule.found == rule.allowed else row
+        for rule in rules
         if not rule.ignored
+        for row in (
+            format_row([rule.rule_id, rule.found, rule.allowed], widths, 'lrr'),
+        )
     ])
     buffer.append('')
     return '\n'.join(buffer)
@@ -185,22 +214,19 @@ def project_stats_json(
         f'  "allowed{cap_name}Rules": {{',
     ]
 
-    key_rule = sorted(
-        [
-            x
-            for x in project.rules.items()
-            if x[1].found > 0 and not x[1].ignored
-        ],
-        key=cmp_to_key(_compare_rule_items),
-    )
+    key_rule = [
+        rule
+        for rule in sort_rules(project.rules)
+        if rule.found > 0 and not rule.ignored
+    ]
 
     if key_rule:
         buffer.extend([
-            f'    "{rule_id}": {rule.found},'
-            for rule_id, rule in key_rule[:-1]
+            f'    "{rule.rule_id}": {rule.found},'
+            for rule in key_rule[:-1]
         ])
-        rule_id, rule = key_rule[-1]
-        buffer.append(f'    "{rule_id}": {rule.found}')
+        rule = key_rule[-1]
+        buffer.append(f'    "{rule.rule_id}": {rule.found}')
 
     buffer.extend([
         '  }',
@@ -1,16 +1,31 @@
 import re
-from typing import Any, Dict, List, Optional, Tuple
-
-from ....core import Good, Res, issue, one_of
+from collections.abc import Mapping, Sequence
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from ....core import Bad, Good, Res, issue, one_of
+from .baseline import (
+    Baseline,
+    FileCounts,
+    file_rule_counts,
+    merge_counts,
+    open_baseline,
+)
+from .delta import get_delta_status, new_violations
+from .formats import GITHUB_ANNOTATION_LIMIT, github_annotations, sarif_chunks
 from .io import project_stats_json, project_status_str
+from .stream import ViolationCollector
+from .tokenizer import PathReplacer, path_replacer, replace_paths
 from .types import (
     Configuration,
     ExitCode,
     FileReport,
     ProjectStatus,
     RuleInfo,
+    StreamTransform,
     Transform,
     Violation,
+    ViolationTable,
+    ViolationView,
 )
 
 
@@ -32,21 +47,10 @@ def replace_filenames(
         A `OneOf` containing an Issue or the `payload` with all file path
         replaced according to the file_prefix.
     """
-    if not file_prefix:
-        return Good(payload)
-    try:
-        old, prefix = file_prefix.split(':')
-    except ValueError as ex:
-        return issue('file_prefix param missing `:`', cause=ex)
-    return Good(re.sub(
-        fr'({old})(.*?)\.([a-z]+)',
-        lambda x: [
-            # Not sure how fix this mypy issue
-            f'{prefix}{filename}.{ext}'  # type: ignore
-            for _, filename, ext in (x.groups(),)
-        ][0],
-        payload,
-    ))
+    return one_of(lambda: [
+        replacer.sub(payload) if replacer else payload
+        for replacer in path_replacer(file_prefix)
+    ])
 
 
 def filter_reports(
@@ -72,15 +76,32 @@ def filter_reports(
     ]
 
 
-def to_rules_dict(reports: List[FileReport]) -> Dict[str, List[Violation]]:
+def to_rules_dict(
+    reports: List[FileReport],
+) -> Mapping[str, Sequence[Violation]]:
     """Convert a list of `FileReport` to a map of rules to `Violation`.
 
+    When the reports are views of the same `ViolationTable` the rules map to
+    views of that table, no `Violation` instances are created.
+
     Args:
         reports: A list of `FileReport` instances.
 
     Returns:
-        A dictionary mapping rules to a list of `Violation`.
+        A dictionary mapping rules to a sequence of `Violation`.
     """
+    views = [
+        rpt.violations
+        for rpt in reports
+        if isinstance(rpt.violations, ViolationView)
+    ]
+    tables = {id(view.table) for view in views}
+    if reports and len(views) == len(reports) and len(tables) == 1:
+        return views[0].table.by_rule(
+            row
+            for view in views
+            for row in view.rows
+        )
     rules: Dict[str, List[Violation]] = {}
     for report in reports:
         for violation in report.violations:
@@ -91,10 +112,11 @@ def to_rules_dict(reports: List[FileReport]) -> Dict[str, List[Violation]]:
 
 
 def _process_rules_dict(
-    rules_dict: Dict[str, List[Violation]],
+    rules_dict: Mapping[str, Sequence[Violation]],
     allowed_rules: Dict[str, int],
     ignored_rules: Dict[str, str],
     rules: Dict[str, RuleInfo],
+    rule_totals: Optional[Dict[str, int]] = None,
 ) -> Tuple[bool, bool]:
     """Populate the `rules` dictionary.
 
@@ -105,15 +127,18 @@ def _process_rules_dict(
         allowed_rules: A dictionary specifying the allowed violations.
         ignored_rules: A dictionary specified the rules to ignore.
         rules: An empty dictionary created in `get_project_status`.
+        rule_totals: Optional map of rule ids to the number of violations
+            found, for when `rules_dict` does not hold every violation.
 
     Returns:
         The preliminary values for failed and needs_readjustment.
     """
     failed = False
     needs_readjustment = False
+    totals = rule_totals or {}
 
     for rule_id, violations in rules_dict.items():
-        total_violations = len(violations)
+        total_violations = totals.get(rule_id, len(violations))
         allowed = allowed_rules.get(rule_id, 0)
         ignored = bool(ignored_rules.get(rule_id))
         if not ignored:
@@ -134,7 +159,7 @@ def _process_rules_dict(
 def get_project_status(
     payload: str,
     reports: List[FileReport],
-    rules_dict: Dict[str, List[Violation]],
+    rules_dict: Mapping[str, Sequence[Violation]],
     allowed_rules: Dict[str, int],
     ignored_rules: Dict[str, str],
 ) -> ProjectStatus:
@@ -151,7 +176,7 @@ def get_project_status(
         A ProjectStatus object.
     """
     rules: Dict[str, RuleInfo] = {}
-    files: Dict[str, List[Violation]] = {
+    files: Dict[str, Sequence[Violation]] = {
         x.file_path: x.violations
         for x in reports
     }
@@ -159,19 +184,84 @@ def get_project_status(
     failed, needs_readjustment = _process_rules_dict(
         rules_dict, allowed_rules, ignored_rules, rules,
     )
+    status = _exit_code(rules, allowed_rules, failed, needs_readjustment)
+    return ProjectStatus(status, payload, rules, files)
+
+
+def _exit_code(
+    rules: Dict[str, RuleInfo],
+    allowed_rules: Dict[str, int],
+    failed: bool,
+    needs_readjustment: bool,
+) -> ExitCode:
+    """Add the allowed rules that were not found and compute the exit code.
 
+    Args:
+        rules: The dictionary populated by `_process_rules_dict`.
+        allowed_rules: A dictionary specifying the allowed violations.
+        failed: True if a rule has more violations than allowed.
+        needs_readjustment: True if a rule has less violations than allowed.
+
+    Returns:
+        The exit code for the project.
+    """
     for rule_id, allowed in allowed_rules.items():
         if rule_id not in rules:
             rules[rule_id] = RuleInfo(rule_id, [], 0, allowed, ignored=False)
             if allowed > 0:
                 needs_readjustment = True
 
-    status = ExitCode.ok
     if failed:
-        status = ExitCode.error
-    elif needs_readjustment:
-        status = ExitCode.needs_readjustment
-    return ProjectStatus(status, payload, rules, files)
+        return ExitCode.error
+    if needs_readjustment:
+        return ExitCode.needs_readjustment
+    return ExitCode.ok
+
+
+def get_stream_status(
+    collector: ViolationCollector,
+    allowed_rules: Dict[str, int],
+    ignored_rules: Dict[str, str],
+) -> ProjectStatus:
+    """Analyze the violations gathered from a stream.
+
+    Unlike `get_project_status`, the project status does not keep the
+    payload nor every violation per file, only the ones the collector kept
+    for display.
+
+    Args:
+        collector: The collector populated by `process_stream`.
+        allowed_rules: A dictionary specifying the allowed violations.
+        ignored_rules: A dictionary specifying the rules to ignore.
+
+    Returns:
+        A ProjectStatus object.
+    """
+    rules: Dict[str, RuleInfo] = {}
+    failed, needs_readjustment = _process_rules_dict(
+        collector.rules_dict,
+        allowed_rules,
+        ignored_rules,
+        rules,
+        collector.rule_totals,
+    )
+    status = _exit_code(rules, allowed_rules, failed, needs_readjustment)
+    return ProjectStatus(status, '', rules, {}, collector.file_totals)
+
+
+def _read_reports(
+    raw_payload: str,
+    transform: Transform,
+    celt_config: Configuration,
+) -> Res[List[FileReport]]:
+    return one_of(lambda: [
+        filtered
+        for replacer in path_replacer(celt_config.file_prefix)
+        for reports in transform(raw_payload)
+        for tabled in (ViolationTable.from_reports(reports).file_reports(),)
+        for replaced in (replace_paths(tabled, replacer),)
+        for filtered in (filter_reports(replaced, celt_config.file_regex),)
+    ])
 
 
 def process(
@@ -195,18 +285,197 @@ def process(
     """
     return one_of(lambda: [
         project_status
-        for payload in replace_filenames(raw_payload, celt_config.file_prefix)
-        for reports in transform(payload)
-        for filtered in (filter_reports(reports, celt_config.file_regex),)
+        for filtered in _read_reports(raw_payload, transform, celt_config)
         for rules_dict in (to_rules_dict(filtered),)
         for project_status in (
             get_project_status(
-                payload, filtered, rules_dict, allowed_rules, ignored_rules,
+                raw_payload,
+                filtered,
+                rules_dict,
+                allowed_rules,
+                ignored_rules,
+            ),
+        )
+    ])
+
+
+def process_delta(
+    raw_payload: str,
+    base_payload: str,
+    transform: Transform,
+    ignored_rules: Dict[str, str],
+    celt_config: Configuration,
+) -> Res[ProjectStatus]:
+    """Process the output of a compiler/linter against a base output.
+
+    Only the violations introduced in `raw_payload` are reported. The
+    allowances are not used.
+
+    Args:
+        raw_payload: The payload from the compiler/linter.
+        base_payload: The payload obtained from the base revision.
+        transform: Function to generate a list of `FileReport` objects.
+        ignored_rules: A dictionary specifying the rules to ignore.
+        celt_config: The post processor configuration.
+
+    Returns:
+        A `OneOf` containing an `Issue` or a `ProjectStatus` object.
+    """
+    return one_of(lambda: [
+        get_delta_status(
+            raw_payload,
+            new_violations(base, head),
+            ignored_rules,
+        )
+        for base in _read_reports(base_payload, transform, celt_config)
+        for head in _read_reports(raw_payload, transform, celt_config)
+    ])
+
+
+def get_incremental_status(  # noqa: WPS211 - need the cached counts
+    payload: str,
+    reports: List[FileReport],
+    fresh: FileCounts,
+    cached: FileCounts,
+    allowed_rules: Dict[str, int],
+    ignored_rules: Dict[str, str],
+) -> ProjectStatus:
+    """Analyze the fresh reports along with the cached counts.
+
+    Only the fresh violations are displayed but the allowances are checked
+    against the violations of the whole project.
+
+    Args:
+        payload: The original payload from the compiler/linter.
+        reports: List of file reports of the evaluated files.
+        fresh: The counts of the evaluated files.
+        cached: The counts of the files that were not evaluated.
+        allowed_rules: A dictionary specifying the allowed violations.
+        ignored_rules: A dictionary specifying the rules to ignore.
+
+    Returns:
+        A ProjectStatus object.
+    """
+    rule_totals, file_totals = merge_counts(fresh, cached)
+    rules_dict = dict(to_rules_dict(reports))
+    for rule_id in rule_totals:
+        rules_dict.setdefault(rule_id, [])
+    rules: Dict[str, RuleInfo] = {}
+    failed, needs_readjustment = _process_rules_dict(
+        rules_dict, allowed_rules, ignored_rules, rules, rule_totals,
+    )
+    status = _exit_code(rules, allowed_rules, failed, needs_readjustment)
+    files: Dict[str, Sequence[Violation]] = {
+        x.file_path: x.violations
+        for x in reports
+    }
+    return ProjectStatus(status, payload, rules, files, file_totals)
+
+
+def process_incremental(  # noqa: WPS211 - baseline arguments
+    raw_payload: str,
+    transform: Transform,
+    allowed_rules: Dict[str, int],
+    ignored_rules: Dict[str, str],
+    celt_config: Configuration,
+    baseline: Baseline,
+) -> Res[ProjectStatus]:
+    """Process the output of a compiler/linter run on the changed files.
+
+    The counts of the files that were not evaluated are read from the
+    baseline index. The index is then updated with the fresh counts. Files
+    that changed since they were indexed must be among the evaluated files.
+
+    Args:
+        raw_payload: The payload from the compiler/linter.
+        transform: Function to generate a list of `FileReport` objects.
+        allowed_rules: A dictionary specifying the allowed violations.
+        ignored_rules: A dictionary specifying the rules to ignore.
+        celt_config: The post processor configuration.
+        baseline: The index to use and the files that were evaluated.
+
+    Returns:
+        A `OneOf` containing an `Issue` or a `ProjectStatus` object.
+    """
+    return one_of(lambda: [
+        project_status
+        for filtered in _read_reports(raw_payload, transform, celt_config)
+        for fresh in (file_rule_counts(filtered),)
+        for cached in baseline.sync(fresh)
+        for project_status in (
+            get_incremental_status(
+                raw_payload,
+                filtered,
+                fresh,
+                cached,
+                allowed_rules,
+                ignored_rules,
             ),
         )
     ])
 
 
+def _collect(
+    stream: IO[str],
+    transform: StreamTransform,
+    celt_config: Configuration,
+    replacer: Optional[PathReplacer],
+    keep_all: bool,
+) -> Res[ViolationCollector]:
+    max_lines = -1 if keep_all else celt_config.max_lines
+    collector = ViolationCollector(max_lines)
+    file_regex = celt_config.file_regex
+    regex = re.compile(file_regex) if file_regex else None
+    try:
+        for violation in transform(stream):
+            if replacer:
+                violation.file_path = replacer.path(violation.file_path)
+                violation.message = replacer.message(violation.message)
+            if not regex or regex.match(violation.file_path):
+                collector.add(violation)
+    except Exception as ex:
+        return issue('failed to process the payload stream', cause=ex)
+    return Good(collector)
+
+
+def process_stream(
+    stream: IO[str],
+    transform: StreamTransform,
+    allowed_rules: Dict[str, int],
+    ignored_rules: Dict[str, str],
+    celt_config: Configuration,
+    keep_all: bool = False,
+) -> Res[ProjectStatus]:
+    """Process the output of a compiler/linter as it is being read.
+
+    The memory used is bounded by the number of violations kept for display
+    (see `Configuration.max_lines`) instead of the size of the payload.
+
+    Args:
+        stream: A text stream with the output of the compiler/linter.
+        transform: Function to generate the `Violation` objects.
+        allowed_rules: A dictionary specifying the allowed violations.
+        ignored_rules: A dictionary specifying the rules to ignore.
+        celt_config: The post processor configuration.
+        keep_all: Keep every violation, needed by the SARIF and Github
+            outputs.
+
+    Returns:
+        A `OneOf` containing an `Issue` or a `ProjectStatus` object.
+    """
+    return one_of(lambda: [
+        get_stream_status(collector, allowed_rules, ignored_rules)
+        for replacer in path_replacer(celt_config.file_prefix)
+        for collector in _collect(
+            stream,
+            transform,
+            celt_config,
+            replacer,
+            keep_all,
+        )
+    ])
+
+
 class PostProcessor:
     """A post processor to handle a compiler/linter ouput."""
 
@@ -215,6 +484,7 @@ class PostProcessor:
         name: str,
         celt_config: Configuration,
         transform: Transform,
+        stream_transform: Optional[StreamTransform] = None,
     ):
         """Instantiate a `PostProcessor`.
 
@@ -222,10 +492,24 @@ class PostProcessor:
             name: The name of the compiler/linter.
             celt_config: The post processor configuration.
             transform: Function to generate a list of `FileReport` objects.
+            stream_transform: Function to generate `Violation` objects from
+                a text stream.
         """
         self.name = name
         self.celt_config = celt_config
         self.transform = transform
+        self.stream_transform = stream_transform
+
+    def _rule_config(
+        self,
+        config: Dict[str, Any],
+    ) -> Tuple[Dict[str, int], Dict[str, str]]:
+        cap_name = self.name.capitalize()
+        allowed_rules = config.get(f'allowed{cap_name}Rules', {})
+        if self.celt_config.ignore_error_allowance:
+            allowed_rules = {}
+        ignored_rules = config.get(f'ignored{cap_name}Rules', {})
+        return allowed_rules, ignored_rules
 
     def run(
         self,
@@ -241,11 +525,7 @@ class PostProcessor:
         Returns:
             A `OneOf` containing an `Issue` or the `ProjectStatus`.
         """
-        cap_name = self.name.capitalize()
-        allowed_rules = config.get(f'allowed{cap_name}Rules', {})
-        if self.celt_config.ignore_error_allowance:
-            allowed_rules = {}
-        ignored_rules = config.get(f'ignored{cap_name}Rules', {})
+        allowed_rules, ignored_rules = self._rule_config(config)
         return process(
             payload,
             self.transform,
@@ -254,6 +534,117 @@ class PostProcessor:
             self.celt_config,
         )
 
+    def run_incremental(
+        self,
+        payload: str,
+        config: Dict[str, Any],
+        baseline: Baseline,
+    ) -> Res[ProjectStatus]:
+        """Run the processor on the output of the changed files.
+
+        Args:
+            payload: The payload from the compiler/linter.
+            config: A dictionary with rule allowance/ignores.
+            baseline: The index with the counts of the rest of the files.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the `ProjectStatus`.
+        """
+        allowed_rules, ignored_rules = self._rule_config(config)
+        return process_incremental(
+            payload,
+            self.transform,
+            allowed_rules,
+            ignored_rules,
+            self.celt_config,
+            baseline,
+        )
+
+    def run_baseline(
+        self,
+        payload: str,
+        config: Dict[str, Any],
+        db_path: str,
+        changed_files: Optional[List[str]] = None,
+    ) -> Res[ProjectStatus]:
+        """Run `run_incremental` with the baseline index stored in a file.
+
+        The index is closed once the payload is processed.
+
+        Args:
+            payload: The payload from the compiler/linter.
+            config: A dictionary with rule allowance/ignores.
+            db_path: The path to the SQLite database of the index.
+            changed_files: The files given to the compiler/linter, `None` if
+                the whole project was evaluated.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the `ProjectStatus`.
+        """
+        index_either = open_baseline(db_path)
+        if isinstance(index_either, Bad):
+            return Bad(index_either.value)
+        with index_either.value as index:
+            return self.run_incremental(
+                payload,
+                config,
+                Baseline(index, self.name, changed_files),
+            )
+
+    def run_delta(
+        self,
+        payload: str,
+        base_payload: str,
+        config: Dict[str, Any],
+    ) -> Res[ProjectStatus]:
+        """Run the processor to find the violations added to a base payload.
+
+        Args:
+            payload: The payload from the compiler/linter.
+            base_payload: The payload obtained from the base revision.
+            config: A dictionary with rule allowance/ignores.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the `ProjectStatus`.
+        """
+        _, ignored_rules = self._rule_config(config)
+        return process_delta(
+            payload,
+            base_payload,
+            self.transform,
+            ignored_rules,
+            self.celt_config,
+        )
+
+    def run_stream(
+        self,
+        stream: IO[str],
+        config: Dict[str, Any],
+        keep_all: bool = False,
+    ) -> Res[ProjectStatus]:
+        """Run the processor while reading the payload from a stream.
+
+        Args:
+            stream: A text stream with the output of the compiler/linter.
+            config: A dictionary with rule allowance/ignores.
+            keep_all: Keep every violation instead of the ones displayed,
+                needed by `to_sarif` and `to_annotations`.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the `ProjectStatus`.
+        """
+        if not self.stream_transform:
+            return issue(f'{self.name} does not support streaming')
+        allowed_rules, ignored_rules = self._rule_config(config)
+        return process_stream(
+            stream,
+            self.stream_transform,
+            allowed_rules,
+            ignored_rules,
+            self.celt_config,
+            keep_all,
+        )
+
     def to_str(self, project: ProjectStatus) -> str:
         """Stringify a `ProjectStatus`.
 
@@ -278,3 +669,30 @@ class PostProcessor:
             The string version of the project status.
         """
         return project_stats_json(self.name, project)
+
+    def to_sarif(self, project: ProjectStatus) -> Iterator[str]:
+        """Generate the SARIF log of a `ProjectStatus`.
+
+        Args:
+            project: The `ProjectStatus` obtained by running the `run` method.
+
+        Returns:
+            An iterator over the pieces of the SARIF json document.
+        """
+        return sarif_chunks(self.name, project)
+
+    def to_annotations(
+        self,
+        project: ProjectStatus,
+        limit: int = GITHUB_ANNOTATION_LIMIT,
+    ) -> Iterator[str]:
+        """Generate the Github annotations of a `ProjectStatus`.
+
+        Args:
+            project: The `ProjectStatus` obtained by running the `run` method.
+            limit: The maximum number of annotations, -1 for no limit.
+
+        Returns:
+            An iterator over the Github workflow commands.
+        """
+        return github_annotations(project, limit)
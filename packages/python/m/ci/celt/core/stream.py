@@ -0,0 +1,84 @@
+import sys
+from contextlib import contextmanager
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from typing import IO, Dict, Iterator, List
+
+from .types import Violation
+
+CHUNK_SIZE = 65536
+
+
+def read_chunks(stream: IO[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Read a text stream in chunks of a fixed size.
+
+    Useful for payloads that are not line oriented, such as a json report
+    written in a single line.
+
+    Args:
+        stream: The text stream.
+        size: The number of characters to read at a time.
+
+    Returns:
+        An iterator over the chunks.
+    """
+    return iter(partial(stream.read, size), '')
+
+
+@contextmanager
+def open_payload(payload: str) -> Iterator[IO[str]]:
+    """Open a payload provided to the cli as a text stream.
+
+    The payload follows the same convention as the `validate_payload`
+    validator: `@-` (stdin), `@filename` (file) or a plain string.
+
+    Args:
+        payload: The payload specification.
+
+    Yields:
+        A text stream with the contents of the payload.
+    """
+    if payload.startswith(r'\@'):
+        yield StringIO(payload[1:])
+    elif payload == '@-':
+        yield sys.stdin
+    elif payload.startswith('@'):
+        with Path.open(Path(payload[1:]), encoding='UTF-8') as fp:
+            yield fp
+    else:
+        yield StringIO(payload)
+
+
+class ViolationCollector:
+    """Accumulate violations as they arrive from a stream.
+
+    Only the first `max_lines` violations of each rule are kept since those
+    are the only ones displayed in the report. The rest are only counted.
+    """
+
+    def __init__(self, max_lines: int):
+        """Initialize the collector.
+
+        Args:
+            max_lines: Number of violations to keep per rule, -1 for all.
+        """
+        self.max_lines = max_lines
+        self.rules_dict: Dict[str, List[Violation]] = {}
+        self.rule_totals: Dict[str, int] = {}
+        self.file_totals: Dict[str, int] = {}
+
+    def add(self, violation: Violation) -> None:
+        """Count a violation and keep it if it may be displayed.
+
+        Args:
+            violation: The violation to add.
+        """
+        rule_id = violation.rule_id
+        file_path = violation.file_path
+        total = self.rule_totals.get(rule_id, 0)
+        self.rule_totals[rule_id] = total + 1
+        self.file_totals[file_path] = self.file_totals.get(file_path, 0) + 1
+        kept = self.rules_dict.setdefault(rule_id, [])
+        if self.max_lines < 0 or total < self.max_lines:
+            kept.append(violation)
@@ -0,0 +1,180 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Match, Optional
+
+from ....core import Good, Res, issue
+from .types import FileReport, Violation, ViolationTable
+
+
+class PathReplacer:
+    """Replace the prefix of file names.
+
+    The regex is compiled once. Since linters report the same files over and
+    over again, rewritten file paths are cached.
+    """
+
+    def __init__(self, old: str, prefix: str):
+        """Initialize the replacer.
+
+        Args:
+            old: A `|` separated list of prefixes to replace.
+            prefix: The new prefix.
+        """
+        self.regex = re.compile(fr'({old})(.*?)\.([a-z]+)')
+        self.prefix = prefix
+        self.cache: Dict[str, str] = {}
+
+    def _replace(self, match: Match[str]) -> str:
+        return f'{self.prefix}{match[2]}.{match[3]}'
+
+    def sub(self, text: str) -> str:
+        """Replace the prefix of every file name found in the text.
+
+        Args:
+            text: The text to process.
+
+        Returns:
+            The text with the file names replaced.
+        """
+        return self.regex.sub(self._replace, text)
+
+    def path(self, file_path: str) -> str:
+        """Replace the prefix of a file path.
+
+        Args:
+            file_path: The file path to process.
+
+        Returns:
+            The file path with the new prefix.
+        """
+        new_path = self.cache.get(file_path)
+        if new_path is None:
+            new_path = self.sub(file_path)
+            self.cache[file_path] = new_path
+        return new_path
+
+    def message(self, msg: str) -> str:
+        """Replace the prefix of the file names in a message.
+
+        Args:
+            msg: A violation message.
+
+        Returns:
+            The message with the file names replaced.
+        """
+        if self.regex.search(msg):
+            return self.sub(msg)
+        return msg
+
+
+def path_replacer(file_prefix: Optional[str]) -> Res[Optional[PathReplacer]]:
+    """Create a `PathReplacer` from the `file_prefix` option.
+
+    Args:
+        file_prefix: A string of the form `[old]:[new]`. The old prefix can be
+            a `|` separated list of strings.
+
+    Returns:
+        A `OneOf` containing an `Issue` or an optional `PathReplacer`.
+    """
+    if not file_prefix:
+        return Good(None)
+    try:
+        old, prefix = file_prefix.split(':')
+    except ValueError as ex:
+        return issue('file_prefix param missing `:`', cause=ex)
+    return Good(PathReplacer(old, prefix))
+
+
+class LineTokenizer:
+    """Extract violations from line oriented compiler/linter outputs.
+
+    The pattern is compiled once and must define exactly five groups: the
+    file, line, column, rule and message. The message group should not match
+    line endings, for instance `([^\\r\\n]*)`. A payload is scanned in a
+    single pass with `findall` instead of splitting it into lines and
+    matching each one of them.
+    """
+
+    def __init__(self, pattern: str):
+        """Compile the pattern.
+
+        Args:
+            pattern: A regex matching a single line of the output.
+        """
+        self.line_regex = re.compile(pattern)
+        self.regex = re.compile(f'^{pattern}', re.MULTILINE)
+
+    def tokenize(self, payload: str) -> ViolationTable:
+        """Extract the violations from a payload.
+
+        Args:
+            payload: The output of the compiler/linter.
+
+        Returns:
+            A `ViolationTable` with the violations found in the payload.
+        """
+        rule_index: Dict[str, int] = {}
+        file_index: Dict[str, int] = {}
+        rules: List[int] = []
+        files: List[int] = []
+        lines: List[int] = []
+        columns: List[int] = []
+        messages: List[bytes] = []
+        for file_path, line, column, rule_id, message in (
+            self.regex.findall(payload)
+        ):
+            rules.append(rule_index.setdefault(rule_id, len(rule_index)))
+            files.append(file_index.setdefault(file_path, len(file_index)))
+            lines.append(int(line))
+            columns.append(int(column))
+            messages.append(message.encode())
+        return ViolationTable.from_columns(
+            rule_index, file_index, rules, files, lines, columns, messages,
+        )
+
+    def tokenize_lines(self, lines: Iterable[str]) -> Iterator[Violation]:
+        """Extract the violations from an iterable of lines.
+
+        Args:
+            lines: The lines from the output of the compiler/linter.
+
+        Yields:
+            The violations found in the lines.
+        """
+        line_match = self.line_regex.match
+        for line in lines:
+            match = line_match(line)
+            if match:
+                file_path, row, column, rule_id, message = match.groups()
+                yield Violation(
+                    rule_id,
+                    message,
+                    int(row),
+                    int(column),
+                    file_path,
+                )
+
+
+def replace_paths(
+    reports: List[FileReport],
+    replacer: Optional[PathReplacer],
+) -> List[FileReport]:
+    """Replace the prefix of the file paths in a list of reports.
+
+    Reports whose paths end up being the same are merged. Only the interned
+    file paths of the `ViolationTable` are rewritten, messages are rewritten
+    when a violation is read from the table.
+
+    Args:
+        reports: A list of `FileReport` instances.
+        replacer: An optional `PathReplacer`.
+
+    Returns:
+        The list of reports with the new file paths.
+    """
+    if not replacer:
+        return reports
+    table = ViolationTable.from_reports(reports)
+    table.rename_files(replacer.path)
+    table.message_hook = replacer.message
+    return table.file_reports()
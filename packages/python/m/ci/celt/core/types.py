@@ -1,6 +1,21 @@
 import enum
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional
+from itertools import accumulate
+from typing import (
+    IO,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    overload,
+)
 
 from ....core import Issue, OneOf
 
@@ -13,7 +28,7 @@ class ExitCode(enum.Enum):
     needs_readjustment = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class Violation:
     """An error/warning/message provided by a compiler or linter."""
 
@@ -24,12 +39,365 @@ class Violation:
     file_path: str
 
 
+class ViolationTable:
+    """Columnar storage for violations.
+
+    Rule ids and file paths are interned, line and column numbers are stored
+    in `array('I')` columns and the messages are utf-8 encoded in a single
+    buffer. `Violation` instances are only created when a row is accessed,
+    usually to display it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.rule_ids: List[str] = []
+        self.file_paths: List[str] = []
+        self.rules = array('I')
+        self.files = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.offsets = array('Q', [0])
+        self.buffer = bytearray()
+        self.message_hook: Optional[Callable[[str], str]] = None
+        self._rule_index: Dict[str, int] = {}
+        self._file_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of rows.
+
+        Returns:
+            The number of violations in the table.
+        """
+        return len(self.rules)
+
+    def append(  # noqa: WPS211 - one argument per column
+        self,
+        rule_id: str,
+        message: str,
+        line: int,
+        column: int,
+        file_path: str,
+    ) -> None:
+        """Add a row to the table.
+
+        Args:
+            rule_id: The rule that was violated.
+            message: The message provided by the compiler/linter.
+            line: The line number, `None` is stored as 0.
+            column: The column number, `None` is stored as 0.
+            file_path: The file where the violation was found.
+        """
+        rule = self._rule_index.get(rule_id)
+        if rule is None:
+            rule = len(self.rule_ids)
+            self.rule_ids.append(rule_id)
+            self._rule_index[rule_id] = rule
+        file_index = self._file_index.get(file_path)
+        if file_index is None:
+            file_index = len(self.file_paths)
+            self.file_paths.append(file_path)
+            self._file_index[file_path] = file_index
+        self.rules.append(rule)
+        self.files.append(file_index)
+        self.lines.append(line or 0)
+        self.columns.append(column or 0)
+        self.buffer += message.encode()
+        self.offsets.append(len(self.buffer))
+
+    def add(self, violation: Violation) -> None:
+        """Add a `Violation` to the table.
+
+        Args:
+            violation: The violation to store.
+        """
+        self.append(
+            violation.rule_id,
+            violation.message,
+            violation.line,
+            violation.column,
+            violation.file_path,
+        )
+
+    def message(self, row: int) -> str:
+        """Decode the message of a row.
+
+        Args:
+            row: The row index.
+
+        Returns:
+            The message, transformed by `message_hook` if set.
+        """
+        msg = self.buffer[self.offsets[row]:self.offsets[row + 1]].decode()
+        return self.message_hook(msg) if self.message_hook else msg
+
+    def violation(self, row: int) -> Violation:
+        """Create a `Violation` instance from a row.
+
+        Args:
+            row: The row index.
+
+        Returns:
+            The violation stored in the row.
+        """
+        return Violation(
+            self.rule_ids[self.rules[row]],
+            self.message(row),
+            self.lines[row],
+            self.columns[row],
+            self.file_paths[self.files[row]],
+        )
+
+    def view(self, rows: Optional[array] = None) -> 'ViolationView':
+        """Create a view over some of the rows of the table.
+
+        Args:
+            rows: An `array('I')` of row indices, defaults to every row.
+
+        Returns:
+            A `ViolationView` instance.
+        """
+        if rows is None:
+            rows = array('I', range(len(self)))
+        return ViolationView(self, rows)
+
+    def by_rule(self, rows: Iterable[int]) -> Dict[str, 'ViolationView']:
+        """Group rows by rule id.
+
+        Args:
+            rows: The row indices to group.
+
+        Returns:
+            A dictionary mapping rule ids to views in order of appearance.
+        """
+        return self._group(self.rules, self.rule_ids, rows)
+
+    def by_file(self, rows: Iterable[int]) -> Dict[str, 'ViolationView']:
+        """Group rows by file path.
+
+        Args:
+            rows: The row indices to group.
+
+        Returns:
+            A dictionary mapping file paths to views in order of appearance.
+        """
+        return self._group(self.files, self.file_paths, rows)
+
+    def file_reports(self) -> List['FileReport']:
+        """Create a `FileReport` for each file in the table.
+
+        Returns:
+            A list of `FileReport` instances backed by views of the table.
+        """
+        return [
+            FileReport(file_path, violations)
+            for file_path, violations in self.by_file(range(len(self))).items()
+        ]
+
+    def rename_files(self, rename: Callable[[str], str]) -> None:
+        """Rename the file paths, merging the ones that end up being equal.
+
+        Args:
+            rename: Function to compute the new file path.
+        """
+        file_paths: List[str] = []
+        file_index: Dict[str, int] = {}
+        remap = array('I')
+        for file_path in self.file_paths:
+            new_path = rename(file_path)
+            index = file_index.get(new_path)
+            if index is None:
+                index = len(file_paths)
+                file_paths.append(new_path)
+                file_index[new_path] = index
+            remap.append(index)
+        if len(file_paths) < len(self.file_paths):
+            self.files = array('I', [remap[index] for index in self.files])
+        self.file_paths = file_paths
+        self._file_index = file_index
+
+    @classmethod
+    def from_columns(  # noqa: WPS211 - one argument per column
+        cls,
+        rule_index: Dict[str, int],
+        file_index: Dict[str, int],
+        rules: List[int],
+        files: List[int],
+        lines: List[int],
+        columns: List[int],
+        messages: List[bytes],
+    ) -> 'ViolationTable':
+        """Create a table from its columns.
+
+        Args:
+            rule_index: Map of rule ids to their index in `rules`.
+            file_index: Map of file paths to their index in `files`.
+            rules: The rule index of each row.
+            files: The file index of each row.
+            lines: The line of each row.
+            columns: The column of each row.
+            messages: The utf-8 encoded message of each row.
+
+        Returns:
+            A new `ViolationTable`.
+        """
+        table = cls()
+        table.rule_ids = list(rule_index)
+        table.file_paths = list(file_index)
+        table._rule_index = rule_index
+        table._file_index = file_index
+        table.rules = array('I', rules)
+        table.files = array('I', files)
+        table.lines = array('I', lines)
+        table.columns = array('I', columns)
+        table.offsets = array('Q', accumulate(map(len, messages), initial=0))
+        table.buffer = bytearray(b''.join(messages))
+        return table
+
+    @classmethod
+    def from_violations(
+        cls,
+        violations: Iterable[Violation],
+    ) -> 'ViolationTable':
+        """Create a table from `Violation` instances.
+
+        Args:
+            violations: The violations to store.
+
+        Returns:
+            A new `ViolationTable`.
+        """
+        table = cls()
+        for violation in violations:
+            table.add(violation)
+        return table
+
+    @classmethod
+    def from_reports(cls, reports: List['FileReport']) -> 'ViolationTable':
+        """Obtain the table holding every violation in the reports.
+
+        If the reports are views covering a whole table then that table is
+        returned, otherwise a new table is created.
+
+        Args:
+            reports: A list of `FileReport` instances.
+
+        Returns:
+            A `ViolationTable`.
+        """
+        tables = {
+            id(rpt.violations.table): rpt.violations.table
+            for rpt in reports
+            if isinstance(rpt.violations, ViolationView)
+        }
+        if len(tables) == 1:
+            table = next(iter(tables.values()))
+            total = sum(len(rpt.violations) for rpt in reports)
+            views_only = all(
+                isinstance(rpt.violations, ViolationView) for rpt in reports
+            )
+            if views_only and total == len(table):
+                return table
+        return cls.from_violations(
+            violation
+            for rpt in reports
+            for violation in rpt.violations
+        )
+
+    def _group(
+        self,
+        column: array,
+        names: List[str],
+        rows: Iterable[int],
+    ) -> Dict[str, 'ViolationView']:
+        buckets: DefaultDict[int, List[int]] = defaultdict(list)
+        for row in rows:
+            buckets[column[row]].append(row)
+        return {
+            names[key]: ViolationView(self, array('I', bucket))
+            for key, bucket in buckets.items()
+        }
+
+
+class ViolationView(Sequence):
+    """A read only sequence of `Violation` instances stored in a table."""
+
+    def __init__(self, table: ViolationTable, rows: array):
+        """Initialize the view.
+
+        Args:
+            table: The table holding the violations.
+            rows: An `array('I')` with the row indices.
+        """
+        self.table = table
+        self.rows = rows
+
+    def __len__(self) -> int:
+        """Return the number of violations in the view.
+
+        Returns:
+            The number of rows.
+        """
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> Violation:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> 'ViolationView':
+        ...  # pragma: no cover
+
+    def __getitem__(self, index: Any) -> Any:
+        """Access a violation or a slice of the view.
+
+        Args:
+            index: An integer or a slice.
+
+        Returns:
+            A `Violation` or a `ViolationView` in the case of a slice.
+        """
+        if isinstance(index, slice):
+            return ViolationView(self.table, self.rows[index])
+        return self.table.violation(self.rows[index])
+
+    def __iter__(self) -> Iterator[Violation]:
+        """Create the `Violation` instances as they are needed.
+
+        Yields:
+            The violations in the view.
+        """
+        violation = self.table.violation
+        for row in self.rows:
+            yield violation(row)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the violations with another sequence.
+
+        Args:
+            other: Another sequence of violations.
+
+        Returns:
+            True if both sequences have the same violations.
+        """
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        """Represent the view as a list.
+
+        Returns:
+            The representation of the violations in the view.
+        """
+        return f'ViolationView({list(self)!r})'
+
+
 @dataclass
 class FileReport:
     """Collection of violations triggered in a single file."""
 
     file_path: str
-    violations: List[Violation]
+    violations: Sequence[Violation]
 
 
 @dataclass
@@ -37,7 +405,7 @@ class RuleInfo:
     """Stats on a rule."""
 
     rule_id: str
-    violations: List[Violation]
+    violations: Sequence[Violation]
     found: int
     allowed: int = 0
     ignored: bool = False
@@ -50,13 +418,19 @@ class ProjectStatus:
     status: ExitCode
     payload: str
     rules: Dict[str, RuleInfo]
-    files: Dict[str, List[Violation]]
+    files: Dict[str, Sequence[Violation]]
+    file_totals: Dict[str, int] = field(default_factory=dict)
     total_found: int = field(init=False)
     total_allowed: int = field(init=False)
     error_msg: str = field(init=False)
 
     def __post_init__(self):
         """Compute the rest of non initialized variables."""
+        if not self.file_totals:
+            self.file_totals = {  # noqa: WPS601
+                file_path: len(violations)
+                for file_path, violations in self.files.items()
+            }
         rules = self.rules.values()
         total_found = sum((s.found for s in rules if not s.ignored))
         total_allowed = sum((s.allowed for s in rules if not s.ignored))
@@ -87,6 +461,11 @@ class Configuration:
     ignore_error_allowance: bool = False
     file_regex: Optional[str] = None
     file_prefix: Optional[str] = None
+    max_files: int = -1
 
 
 Transform = Callable[[str], OneOf[Issue, List[FileReport]]]
+
+# Reads the compiler/linter output from a text stream and generates the
+# violations as they are found. Errors are raised as exceptions.
+StreamTransform = Callable[[IO[str]], Iterator[Violation]]
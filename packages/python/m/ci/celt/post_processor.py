@@ -1,9 +1,69 @@
-from typing import Dict
+import importlib
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict
 
-from ...core import Good, Res, issue
+from ...core import Good, Res, issue, one_of
 from .core.process import PostProcessor
-from .core.types import Configuration, Transform
-from .post_processors import eslint, pycodestyle, pylint, ruff, typescript
+from .core.types import Configuration
+
+# Entry point group used by other packages to register post processors.
+# The entry point should load a module or an object with a `read_payload`
+# function and optionally a `read_stream` function. For instance, in the
+# `pyproject.toml` file of a package providing a mypy post processor:
+#
+#   [project.entry-points."m.celt_processors"]
+#   mypy = "celt_mypy.processor"
+ENTRY_POINT_GROUP = 'm.celt_processors'
+
+# The post processors included in `m`. They are only imported when used.
+BUILTIN_PROCESSORS: Dict[str, str] = {
+    'eslint': 'm.ci.celt.post_processors.eslint',
+    'pycodestyle': 'm.ci.celt.post_processors.pycodestyle',
+    'flake8': 'm.ci.celt.post_processors.pycodestyle',
+    'pylint': 'm.ci.celt.post_processors.pylint',
+    'typescript': 'm.ci.celt.post_processors.typescript',
+    'ruff': 'm.ci.celt.post_processors.ruff',
+}
+
+
+def available_post_processors() -> Dict[str, str]:
+    """List the post processors that may be used.
+
+    Only the package metadata is read, none of the post processors are
+    imported. Builtin post processors take precedence over the ones
+    registered in the `m.celt_processors` entry point group.
+
+    Returns:
+        A map of post processor names to the module or object that
+        provides them.
+    """
+    registered = {
+        entry.name: entry.value
+        for entry in entry_points(group=ENTRY_POINT_GROUP)
+    }
+    return {**registered, **BUILTIN_PROCESSORS}
+
+
+def _load_processor(name: str) -> Res[Any]:
+    load: Callable[[], Any]
+    if name in BUILTIN_PROCESSORS:
+        load = partial(importlib.import_module, BUILTIN_PROCESSORS[name])
+    else:
+        entries = entry_points(group=ENTRY_POINT_GROUP, name=name)
+        if not entries:
+            return issue(f'{name} is not a supported post processor')
+        load = next(iter(entries)).load
+    try:
+        processor = load()
+    except Exception as ex:
+        return issue(f'unable to load the {name} post processor', cause=ex)
+    if not callable(getattr(processor, 'read_payload', None)):
+        return issue(
+            f'{name} post processor does not define read_payload',
+            context={'processor': str(processor)},
+        )
+    return Good(processor)
 
 
 def get_post_processor(
@@ -12,6 +72,8 @@ def get_post_processor(
 ) -> Res[PostProcessor]:
     """Find an available post processor based on the key provided.
 
+    Only the module of the requested post processor is imported.
+
     Args:
         name: name of the post processor
         celt_config: The configuration to use
@@ -19,15 +81,12 @@ def get_post_processor(
     Returns:
         A `OneOf` containing an `Issue` or a post processor function.
     """
-    mapping: Dict[str, Transform] = {
-        'eslint': eslint.read_payload,
-        'pycodestyle': pycodestyle.read_payload,
-        'flake8': pycodestyle.read_payload,
-        'pylint': pylint.read_payload,
-        'typescript': typescript.read_payload,
-        'ruff': ruff.read_payload,
-    }
-    if name not in mapping:
-        return issue(f'{name} is not a supported post processor')
-
-    return Good(PostProcessor(name, celt_config, mapping[name]))
+    return one_of(lambda: [
+        PostProcessor(
+            name,
+            celt_config,
+            processor.read_payload,
+            getattr(processor, 'read_stream', None),
+        )
+        for processor in _load_processor(name)
+    ])
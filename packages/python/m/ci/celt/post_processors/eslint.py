@@ -1,12 +1,53 @@
-from typing import List
+from typing import IO, Iterator, List, Optional, cast
+
+from typing_extensions import NotRequired, TypedDict
 
 from ....core import Issue, OneOf, json, one_of
-from ..core.types import FileReport, Violation
+from ..core.stream import read_chunks
+from ..core.types import FileReport, Violation, ViolationTable
+
+# The fields of the eslint json report used by celt. The typed decode of the
+# benchmarks (`parse_json_model(List[EslintFile], payload)`) skips the rest.
+EslintMessage = TypedDict(
+    'EslintMessage',
+    {
+        'ruleId': NotRequired[Optional[str]],
+        'message': str,
+        'line': NotRequired[int],
+        'column': NotRequired[int],
+    },
+)
+
+EslintFile = TypedDict(
+    'EslintFile',
+    {
+        'filePath': str,
+        'messages': List[EslintMessage],
+    },
+)
+
+
+def _to_reports(eslint_files: List[EslintFile]) -> List[FileReport]:
+    table = ViolationTable()
+    append = table.append
+    for eslint_file in eslint_files:
+        file_path = eslint_file['filePath']
+        for msg in eslint_file['messages']:
+            append(
+                msg.get('ruleId') or '',
+                msg['message'],
+                msg.get('line', 0),
+                msg.get('column', 0),
+                file_path,
+            )
+    return table.file_reports()
 
 
 def read_payload(payload: str) -> OneOf[Issue, List[FileReport]]:
     """Transform an eslint payload to a list of `FileReport` instances.
 
+    The payload is decoded with the fastest json backend available.
+
     Args:
         payload: The raw payload from eslint.
 
@@ -14,21 +55,31 @@ def read_payload(payload: str) -> OneOf[Issue, List[FileReport]]:
         A `OneOf` containing an `Issue` or a list of `FileReport` instances.
     """
     return one_of(lambda: [
-        [
-            FileReport(
-                file_path=error['filePath'],
-                violations=[
-                    Violation(
-                        msg['ruleId'],
-                        msg['message'],
-                        msg['line'],
-                        msg['column'],
-                        error['filePath'],
-                    )
-                    for msg in error['messages']
-                ],
-            )
-            for error in json_payload
-        ]
+        _to_reports(eslint_files)
         for json_payload in json.parse_json(payload)
+        for eslint_files in (cast(List[EslintFile], json_payload),)
     ])
+
+
+def read_stream(stream: IO[str]) -> Iterator[Violation]:
+    """Read the violations from an eslint stream.
+
+    The json array is parsed incrementally, only one file entry is kept in
+    memory at a time.
+
+    Args:
+        stream: A text stream with the output of `eslint -f json`.
+
+    Yields:
+        The violations reported by eslint.
+    """
+    for error in json.iter_json_array(read_chunks(stream)):
+        file_path = error['filePath']
+        for msg in error['messages']:
+            yield Violation(
+                msg.get('ruleId') or '',
+                msg['message'],
+                msg.get('line', 0),
+                msg.get('column', 0),
+                file_path,
+            )
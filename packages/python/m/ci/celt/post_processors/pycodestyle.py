@@ -1,9 +1,14 @@
-import re
-from typing import Dict, List
+from typing import IO, Iterator, List
 
 from ....core import Good, Issue, OneOf
+from ..core.tokenizer import LineTokenizer
 from ..core.types import FileReport, Violation
 
+# The file path may contain `:`, the lazy group stops at the first location.
+TOKENIZER = LineTokenizer(
+    r'([^:\n]*(?::[^:\n]*)*?):(\d+):(\d+): (\w+) ([^\r\n]*)',
+)
+
 
 def read_payload(payload: str) -> OneOf[Issue, List[FileReport]]:
     """Transform a pycodestyle payload to a list of `FileReport` instances.
@@ -17,23 +22,16 @@ def read_payload(payload: str) -> OneOf[Issue, List[FileReport]]:
     Returns:
         A `OneOf` containing an `Issue` or a list of `FileReport` instances.
     """
-    regex = r'(.*):(\d+):(\d+): (\w+) (.*)'
-    report: Dict[str, List[Violation]] = {}
-    for line in payload.splitlines():
-        match = re.match(regex, line)
-        if match:
-            group = match.groups()
-            violation = Violation(
-                file_path=group[0],
-                line=int(group[1]),
-                column=int(group[2]),
-                rule_id=group[3],
-                message=group[4],
-            )
-            if violation.file_path not in report:
-                report[violation.file_path] = []
-            report[violation.file_path].append(violation)
-    return Good([
-        FileReport(file_path=name, violations=violations)
-        for name, violations in report.items()
-    ])
+    return Good(TOKENIZER.tokenize(payload).file_reports())
+
+
+def read_stream(stream: IO[str]) -> Iterator[Violation]:
+    """Read the violations from a pycodestyle stream one line at a time.
+
+    Args:
+        stream: A text stream with the output of pycodestyle.
+
+    Returns:
+        An iterator over the violations.
+    """
+    return TOKENIZER.tokenize_lines(stream)
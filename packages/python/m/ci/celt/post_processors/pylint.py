@@ -1,35 +1,71 @@
-from typing import Any, Dict, List, cast
+from typing import IO, Any, Iterator, List, cast
 
-from ....core import Good, Issue, OneOf, json
-from ..core.types import FileReport, Violation
+from typing_extensions import TypedDict
+
+from ....core import Issue, OneOf, json, one_of
+from ..core.stream import read_chunks
+from ..core.types import FileReport, Violation, ViolationTable
+
+
+class PylintMessage(TypedDict):
+    """The fields of a pylint json message used by celt."""
+
+    symbol: str
+    message: str
+    line: int
+    column: int
+    path: str
+
+
+def _to_violation(v_item: Any) -> Violation:
+    return Violation(
+        rule_id=v_item['symbol'],
+        message=v_item['message'],
+        line=int(v_item['line']),
+        column=int(v_item['column']),
+        file_path=v_item['path'],
+    )
+
+
+def _to_reports(messages: List[PylintMessage]) -> List[FileReport]:
+    table = ViolationTable()
+    append = table.append
+    for msg in messages:
+        append(
+            msg['symbol'],
+            msg['message'],
+            int(msg['line']),
+            int(msg['column']),
+            msg['path'],
+        )
+    return table.file_reports()
 
 
 def read_payload(payload: str) -> OneOf[Issue, List[FileReport]]:
     """Transform a pylint payload to a list of `FileReport` instances.
 
+    The payload is decoded with the fastest json backend available.
+
     Args:
         payload: The raw payload from pylint.
 
     Returns:
         A `OneOf` containing an `Issue` or a list of `FileReport` instances.
     """
-    res = json.parse_json(payload)
-    if res.is_bad:
-        return res
-    violations = cast(List[Any], res.value)
-    report: Dict[str, List[Violation]] = {}
-    for v_item in violations:
-        violation = Violation(
-            rule_id=v_item['symbol'],
-            message=v_item['message'],
-            line=int(v_item['line']),
-            column=int(v_item['column']),
-            file_path=v_item['path'],
-        )
-        if violation.file_path not in report:
-            report[violation.file_path] = []
-        report[violation.file_path].append(violation)
-    return Good([
-        FileReport(file_path=name, violations=violations)
-        for name, violations in report.items()
+    return one_of(lambda: [
+        _to_reports(messages)
+        for json_payload in json.parse_json(payload)
+        for messages in (cast(List[PylintMessage], json_payload),)
     ])
+
+
+def read_stream(stream: IO[str]) -> Iterator[Violation]:
+    """Read the violations from a pylint stream.
+
+    Args:
+        stream: A text stream with the output of `pylint -f json`.
+
+    Returns:
+        An iterator over the violations.
+    """
+    return map(_to_violation, json.iter_json_array(read_chunks(stream)))
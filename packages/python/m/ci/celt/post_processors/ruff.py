@@ -1,7 +1,11 @@
+from collections.abc import Iterator
+from typing import IO
+
 from m.core import Good, Res, hone, json, one_of
-from m.pydantic import parse_model
+from m.pydantic import parse_json_model
 from pydantic import BaseModel
 
+from ..core.stream import read_chunks
 from ..core.types import FileReport, Violation
 
 
@@ -24,16 +28,20 @@ class RuffViolation(BaseModel):
 Report = dict[str, list[Violation]]
 
 
+def _to_violation(v_item: RuffViolation) -> Violation:
+    return Violation(
+        rule_id=v_item.code,
+        message=v_item.message,
+        line=v_item.location.row,
+        column=v_item.location.column,
+        file_path=v_item.filename,
+    )
+
+
 def _index_violations(violations: list[RuffViolation]) -> Res[Report]:
     report: Report = {}
     for v_item in violations:
-        violation = Violation(
-            rule_id=v_item.code,
-            message=v_item.message,
-            line=v_item.location.row,
-            column=v_item.location.column,
-            file_path=v_item.filename,
-        )
+        violation = _to_violation(v_item)
         if violation.file_path not in report:
             report[violation.file_path] = []
         report[violation.file_path].append(violation)
@@ -55,7 +63,19 @@ def read_payload(payload: str) -> Res[list[FileReport]]:
             FileReport(file_path=name, violations=violations)
             for name, violations in report.items()
         ]
-        for json_payload in json.parse_json(payload)
-        for violations in parse_model(list[RuffViolation], json_payload)
+        for violations in parse_json_model(list[RuffViolation], payload)
         for report in _index_violations(violations)
     ]).flat_map_bad(hone('invalid_ruff_output_payload', context))
+
+
+def read_stream(stream: IO[str]) -> Iterator[Violation]:
+    """Read the violations from a ruff stream.
+
+    Args:
+        stream: A text stream with the output of `ruff check --format json`.
+
+    Yields:
+        The violations reported by ruff.
+    """
+    for json_item in json.iter_json_array(read_chunks(stream)):
+        yield _to_violation(RuffViolation.model_validate(json_item))
@@ -1,8 +1,15 @@
-import re
+from collections.abc import Iterator
+from typing import IO
 
+from m.ci.celt.core.tokenizer import LineTokenizer
 from m.ci.celt.core.types import FileReport, Violation
 from m.core import Good, Issue, OneOf
 
+# Lines starting with a space continue the message of the previous error.
+TOKENIZER = LineTokenizer(
+    r'(?! )([^(\n]*(?:\([^(\n]*)*?)\((\d+),(\d+)\): error (\w+): ([^\r\n]*)',
+)
+
 
 def read_payload(payload: str) -> OneOf[Issue, list[FileReport]]:
     """Transform a typescript payload to a list of `FileReport` instances.
@@ -13,25 +20,16 @@ def read_payload(payload: str) -> OneOf[Issue, list[FileReport]]:
     Returns:
         A `OneOf` containing an `Issue` or a list of `FileReport` instances.
     """
-    regex = r'(.*)\((\d+),(\d+)\): error (\w+): (.*)'
-    report: dict[str, list[Violation]] = {}
-    for line in payload.splitlines():
-        if line.startswith(' '):
-            continue
-        match = re.match(regex, line)
-        if match:
-            group = match.groups()
-            violation = Violation(
-                file_path=group[0],
-                line=int(group[1]),
-                column=int(group[2]),
-                rule_id=group[3],
-                message=group[4],
-            )
-            if violation.file_path not in report:
-                report[violation.file_path] = []
-            report[violation.file_path].append(violation)
-    return Good([
-        FileReport(file_path=name, violations=violations)
-        for name, violations in report.items()
-    ])
+    return Good(TOKENIZER.tokenize(payload).file_reports())
+
+
+def read_stream(stream: IO[str]) -> Iterator[Violation]:
+    """Read the violations from a typescript stream one line at a time.
+
+    Args:
+        stream: The output of typescript when using the `--pretty false` option.
+
+    Returns:
+        An iterator over the violations.
+    """
+    return TOKENIZER.tokenize_lines(stream)
@@ -16,6 +16,9 @@ from ..github.ci import (
 )
 from .config import Config
 
+# Github lists at most 3000 files of a pull request.
+PR_FILE_LIMIT = 3000
+
 
 def get_release_prefix(config: Config) -> str | None:
     """Find out the release prefix.
@@ -271,7 +274,7 @@ def get_git_env(config: Config, env_vars: EnvVars) -> Res[GitEnv]:
             sha=env_vars.git_sha,
         ),
         pr_number=pr_number,
-        file_count=100,
+        file_count=PR_FILE_LIMIT,
         include_release=True,
     )
     if isinstance(git_env_box, Bad):
@@ -285,7 +288,7 @@ def get_git_env(config: Config, env_vars: EnvVars) -> Res[GitEnv]:
 
         # If this is a huge PR we'll bypass it, the file may not be present in
         # the list of files.
-        if not can_bypass and pr.file_count < 100:
+        if not can_bypass and len(pr.files) >= pr.file_count:
             return issue('missing CHANGELOG.md in PR', context={'pr': pr.model_dump()})
 
     git_env.sha = res.commit.sha
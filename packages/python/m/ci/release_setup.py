@@ -3,7 +3,7 @@ from datetime import datetime
 
 from m.ci.config import Config, get_m_filename, read_config
 from m.core import Good, Res, issue, one_of, rw
-from m.git import get_first_commit_sha
+from m.git import GitSession, get_first_commit_sha
 from m.github.ci import compare_sha_url
 from m.log import Logger
 
@@ -160,6 +160,8 @@ def release_setup(
     config_inst: Config | None,
     new_ver: str,
     changelog: str = 'CHANGELOG.md',
+    *,
+    session: GitSession | None = None,
 ) -> Res[None]:
     """Modify all the necessary files to create a release.
 
@@ -170,6 +172,7 @@ def release_setup(
         config_inst: If provided it skips reading the configuration.
         new_ver: The new version to write in the m configuration.
         changelog: The name of the changelog file (defaults to CHANGELOG.md)
+        session: The git session of the release.
 
     Returns:
         None if successful, otherwise an issue.
@@ -177,7 +180,7 @@ def release_setup(
     return one_of(lambda: [
         None
         for config in _read_config(m_dir, config_inst)
-        for first_sha in get_first_commit_sha()
+        for first_sha in get_first_commit_sha(session=session)
         for _ in update_version(m_dir, new_ver)
         for _ in update_changelog_file(
             config.owner,
@@ -11,40 +11,37 @@ from .release_utils import YES_NO, is_yes
 logger = Logger('m.ci.start_release')
 
 
-def assert_git_status(status: str, description: str) -> Res[bool]:
+def assert_git_status(
+    git_status: git.GitStatus,
+    session: git.GitSession | None = None,
+) -> Res[bool]:
     """Assert that the current branch is in a clean state.
 
     This action may stash some changes. This happens when the developer works
     on a hotfix and starts making changes directly in the branch.
 
     Args:
-        status: short key describing the status
-        description: The text used to determine the status
+        git_status: The status of the repository.
+        session: The git session of the release.
 
     Returns:
         An issue explaining why we cannot complete the release setup. If
         successful it will return a boolean value. A true value means that
         the process stashed changes and they will need to be popped.
     """
-    if status == 'clean':
-        logger.info('branch is in a clean state')
-        return Good(False)
-    if status in {'ahead', 'behind'}:
+    if git_status.ahead or git_status.behind:
         return issue(
             'branch is not in sync with the remote branch',
             context={
-                'git_status': description,
+                'git_status': git_status.description,
                 'suggestion': 'try running `git pull` and/or `git push`',
             },
         )
-    can_stash = {
-        'Untracked files',
-        'Changes to be committed',
-        'Changed but not updated',
-        'Changes not staged',
-    }
-    if description in can_stash:
-        logger.warning(f'git status: {description}')
+    if not git_status.has_changes:
+        logger.info('branch is in a clean state')
+        return Good(False)
+    if not git_status.conflicted:
+        logger.warning(f'git status: {git_status.description}')
         response = io.prompt_choices(
             'would you like to stash the changes and continue?',
             YES_NO,
@@ -53,14 +50,14 @@ def assert_git_status(status: str, description: str) -> Res[bool]:
         if is_yes(response):
             return one_of(lambda: [
                 True
-                for cmd_out in git.stash()
+                for cmd_out in git.stash(session=session)
                 for _ in logger.info('ran `git stash`', {'git': cmd_out})
             ]).flat_map_bad(hone('git stash failure'))
     return issue(
         'releases can only be done in a clean git state',
         context={
-            'git_status': status,
-            'description': description,
+            'git_status': git_status.label(),
+            'description': git_status.description,
         },
     )
 
@@ -117,7 +114,11 @@ def verify_release(
     return Good(None)
 
 
-def after_checkout(branch_checkout: str, stashed: bool) -> Res[None]:
+def after_checkout(
+    branch_checkout: str,
+    stashed: bool,
+    session: git.GitSession | None = None,
+) -> Res[None]:
     """Notify the user that the branch has switched.
 
     Optionally if there are stashed changes they will be popped.
@@ -125,6 +126,7 @@ def after_checkout(branch_checkout: str, stashed: bool) -> Res[None]:
     Args:
         branch_checkout: output from git checkout.
         stashed: If True, it will run git stash pop.
+        session: The git session of the release.
 
     Returns:
         A OneOf with None. There should be no issues. A warning may show up.
@@ -133,7 +135,7 @@ def after_checkout(branch_checkout: str, stashed: bool) -> Res[None]:
         'git': f'{branch_checkout}\n',
     })
     if stashed:
-        pop_result = git.stash_pop()
+        pop_result = git.stash_pop(session=session)
         if isinstance(pop_result, Bad):
             logger.warning('`git stash pop` issue', pop_result.value)
         else:
@@ -155,6 +157,9 @@ def _get_commits(gh_ver: str) -> Res[list[str] | None]:
 def start_release(gh_token: str, hotfix: bool = False) -> Res[None]:
     """Start the release process.
 
+    The git queries share a session: the branch is read from the status and
+    the first commit sha is resolved once.
+
     Args:
         gh_token: The GITHUB_TOKEN to use to make api calls to Github.
         hotfix: Set to true to start a hotfix.
@@ -162,19 +167,31 @@ def start_release(gh_token: str, hotfix: bool = False) -> Res[None]:
     Returns:
         None if successful, otherwise an issue.
     """
+    with git.GitSession() as session:
+        return _start_release(gh_token, hotfix, session)
+
+
+def _start_release(
+    gh_token: str,
+    hotfix: bool,
+    session: git.GitSession,
+) -> Res[None]:
     release_type = 'hotfix' if hotfix else 'release'
     return one_of(lambda: [
         None
-        for config in assert_branch(release_type, 'm')
-        for status, description in git.get_status()
-        for stashed_changes in assert_git_status(status, description)
+        for git_status in git.get_status(session=session)
+        for config in assert_branch(release_type, 'm', session=session)
+        for stashed_changes in assert_git_status(git_status, session)
         for gh_ver in get_latest_release(gh_token, config.owner, config.repo)
         for commits in _get_commits(gh_ver)
         for _ in verify_release(commits, hotfix=hotfix)
         for new_ver in io.prompt_next_version(gh_ver, release_type)
-        for branch_checkout in git.checkout_branch(f'{release_type}/{new_ver}')
-        for _ in after_checkout(branch_checkout, stashed_changes)
-        for _ in release_setup('m', config, new_ver)
+        for branch_checkout in git.checkout_branch(
+            f'{release_type}/{new_ver}',
+            session=session,
+        )
+        for _ in after_checkout(branch_checkout, stashed_changes, session)
+        for _ in release_setup('m', config, new_ver, session=session)
         for _ in logger.info('next steps', context={
             'instructions': [
                 'verify that CHANGELOG.md contains a list of all changes',
@@ -28,6 +28,7 @@ from .validators import (
     validate_file_exists,
     validate_json_payload,
     validate_payload,
+    validate_payload_source,
 )
 
 # using as barrel file to export convenience functions
@@ -46,6 +47,7 @@ __all__ = (  # noqa: WPS410
     'add_arg',
     'validate_json_payload',
     'validate_payload',
+    'validate_payload_source',
     'validate_file_exists',
     'run_main',
     'exec_cli',
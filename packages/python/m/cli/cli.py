@@ -131,6 +131,10 @@ def exec_cli(cli_commands: CliCommands) -> None:
             Issue('unknown cli run function exception', cause=ex),
         )
         exit_code = 5
+    http = sys.modules.get('m.core.http')
+    if http:
+        # Only close the pooled connections if a command made requests.
+        http.close_all()
     sys.exit(exit_code)
 
 
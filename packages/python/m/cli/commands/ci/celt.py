@@ -1,9 +1,13 @@
 import sys
 from typing import Any, cast
 
-from m.cli import Arg, BaseModel, command
-from m.cli.validators import validate_json_payload, validate_payload
-from m.core import Bad, one_of
+from m.cli import Arg, ArgProxy, BaseModel, command
+from m.cli.validators import (
+    validate_json_payload,
+    validate_payload,
+    validate_payload_source,
+)
+from m.core import Bad, Good, Res, issue, one_of
 
 
 class Arguments(BaseModel):
@@ -83,6 +87,102 @@ class Arguments(BaseModel):
     ```bash
     m ci celt -t ruff -c @config.json < <(ruff check --format json [dir])
     ```
+
+    ### Other tools
+
+    Other packages may provide post processors by registering a module with
+    a `read_payload` function in the `m.celt_processors` entry point group.
+
+    ```toml
+    [project.entry-points."m.celt_processors"]
+    mypy = "celt_mypy.processor"
+    ```
+
+    ## Streaming
+
+    Use the `--stream` flag to process the payload as it is being read
+    instead of loading it in memory. Line oriented outputs are read one line
+    at a time and json outputs are parsed incrementally. Only the violations
+    that may be displayed (see `--max-lines`) are kept in memory.
+
+    ```bash
+    m ci celt -t eslint -c @config.json --stream < <(eslint -f json [dir])
+    ```
+
+    ## Batch
+
+    Use the `--batch` option to process the outputs of several tools in a
+    single run. Each entry is processed in its own worker process and the
+    exit code is the most severe exit code of all the entries.
+
+    ```yaml
+    tools:
+      - tool: eslint
+        payload: eslint.json
+        config: allowed_errors.json
+      - tool: flake8
+        payload: flake8.txt
+        filePrefix: /workspaces/m/:
+    ```
+
+    ```bash
+    m ci celt --batch manifest.yaml
+    ```
+
+    Entries without a `config` use the one provided with `--config`. The
+    payload and the options `--tool`, `--stream`, `--base`, `--baseline`,
+    `--changed-files`, `--format` and `--output` cannot be combined with
+    `--batch`.
+
+    ## Baseline
+
+    Use the `--baseline` option to keep a SQLite index with the content hash
+    and the number of violations of each rule for every file. When the
+    compiler/linter only evaluates the files that changed, provide them with
+    `--changed-files` (one path per line). The violations of the rest of the
+    files are read from the index so that the allowances are still checked
+    for the whole project. The index is updated on every run and it is
+    rebuilt when `--changed-files` is not provided. A file that changed
+    since it was indexed but is missing from `--changed-files` makes the
+    run fail since its cached counts can no longer be trusted.
+
+    A rebuild only indexes the files with violations since the output of
+    the compiler/linter does not list the clean files. A clean file that
+    later gains violations is only counted when it is listed in
+    `--changed-files`. To index the clean files as well, provide every
+    file evaluated by the full run with `--changed-files`.
+
+    ```bash
+    m ci celt -t flake8 -c @config.json --baseline celt.db
+    m ci celt -t flake8 -c @config.json --baseline celt.db \\
+      --changed-files @changed.txt < <(flake8 $(cat changed.txt))
+    ```
+
+    ## Delta
+
+    Use the `--base` option to provide the output of the compiler/linter on
+    the base revision of a pull request. Only the violations introduced by
+    the payload are reported and any of them is an error, the allowances
+    are not used. Violations are matched by file, rule and message so that
+    moving code up or down does not report them again.
+
+    ```bash
+    m ci celt -t eslint -c @config.json --base @base.json @head.json
+    ```
+
+    ## Output formats
+
+    The report is always displayed in stderr. Use `--format sarif` to also
+    write a SARIF 2.1.0 log or `--format github` to write Github workflow
+    commands that annotate the violations of the rules that exceeded their
+    allowance. Github only shows a limited number of annotations per step,
+    use `--annotation-limit` to change how many are written. The output is
+    written to stdout unless `--output` is provided.
+
+    ```bash
+    m ci celt -t eslint -c @config.json --format sarif --output celt.sarif
+    m ci celt -t eslint -c @config.json --format github < eslint.json
+    ```
     """
 
     payload: str = Arg(
@@ -93,13 +193,12 @@ class Arguments(BaseModel):
 
             Summary: `@-` (stdin), `@filename` (file), `string`.
         """,
-        validator=validate_payload,
+        validator=validate_payload_source,
         positional=True,
     )
 
-    tool: str = Arg(
+    tool: str | None = Arg(
         help='name of a supported compiler/linter',
-        required=True,
         aliases=['t', 'tool'],
     )
 
@@ -116,6 +215,11 @@ class Arguments(BaseModel):
         help='max number of error lines to print, use -1 for all',
     )
 
+    max_files: int = Arg(
+        default=-1,
+        help='max number of files to list, the ones with the most errors',
+    )
+
     file_regex: str | None = Arg(
         aliases=['r', 'file_regex'],
         help='regex expression to filter files',
@@ -144,21 +248,120 @@ class Arguments(BaseModel):
         help='display the full error message',
     )
 
+    stream: bool = Arg(
+        default=False,
+        help='process the payload while reading it',
+    )
+
+    baseline: str | None = Arg(
+        help='path to the baseline index of per file violation counts',
+    )
+
+    changed_files: str | None = Arg(
+        help="""\
+            Files evaluated by the compiler/linter, one per line. Used with
+            `--baseline`. Summary: `@filename` (file), `string`.
+        """,
+        validator=validate_payload,
+    )
+
+    base: str | None = Arg(
+        help="""\
+            Output of the compiler/linter on the base revision, only the new
+            violations are reported. Summary: `@filename` (file), `string`.
+        """,
+        validator=validate_payload_source,
+    )
+
+    output_format: str = ArgProxy(
+        '--format',
+        dest='output_format',
+        default='text',
+        choices=['text', 'sarif', 'github'],
+        help='additional output to write: sarif log or github annotations',
+    )
+
+    output: str | None = Arg(
+        help='file to write the sarif log or annotations, defaults to stdout',
+    )
+
+    annotation_limit: int = Arg(
+        default=10,
+        help='max number of github annotations, use -1 for all',
+    )
+
+    batch: str | None = Arg(
+        help='json/yaml manifest with the outputs of several tools',
+    )
+
     traceback: bool = Arg(
         default=False,
         help='display the exception traceback if available',
     )
 
 
+def _used_options(options: list[tuple[str, Any]]) -> list[str]:
+    return [name for name, value in options if value]
+
+
+def _check_batch_options(arg: Arguments) -> Res[None]:
+    ignored = _used_options([
+        ('payload', arg.payload != '@-'),
+        ('--tool', arg.tool),
+        ('--stream', arg.stream),
+        ('--base', arg.base),
+        ('--baseline', arg.baseline),
+        ('--changed-files', arg.changed_files),
+        ('--format', arg.output_format != 'text'),
+        ('--output', arg.output),
+    ])
+    if ignored:
+        return issue('options not supported with --batch', context={
+            'options': ignored,
+        })
+    return Good(None)
+
+
+def _check_options(arg: Arguments) -> Res[None]:
+    """Make sure that no option is dropped silently.
+
+    Args:
+        arg: The command line arguments.
+
+    Returns:
+        An issue listing the options that cannot be used together.
+    """
+    if arg.batch:
+        return _check_batch_options(arg)
+    modes = _used_options([
+        ('--stream', arg.stream),
+        ('--base', arg.base),
+        ('--baseline', arg.baseline),
+    ])
+    if len(modes) > 1:
+        return issue('conflicting options', context={
+            'options': modes,
+            'suggestion': 'use only one of --stream, --base or --baseline',
+        })
+    if arg.changed_files and not arg.baseline:
+        return issue('--changed-files requires --baseline')
+    if arg.output and arg.output_format == 'text':
+        return issue('--output requires --format sarif or --format github')
+    return Good(None)
+
+
 @command(
     help='process the output of compiler/linter',
     model=Arguments,
 )
 def run(arg: Arguments):
+    from m.ci.celt.batch import combined_status, load_manifest, run_batch
+    from m.ci.celt.core.formats import write_chunks
     from m.ci.celt.core.process import PostProcessor
+    from m.ci.celt.core.stream import open_payload
     from m.ci.celt.core.types import Configuration
     from m.ci.celt.post_processor import get_post_processor
-    from m.core.issue import Issue
+    from m.core.issue import Issue, remove_traceback
     from m.log import Logger
 
     logger = Logger('m.cli.celt')
@@ -168,13 +371,83 @@ def run(arg: Arguments):
         arg.ignore_error_allowance,
         arg.file_regex,
         arg.file_prefix,
+        arg.max_files,
     )
-    tool_either = get_post_processor(arg.tool, config)
-    either = one_of(lambda: [
-        project
-        for tool in tool_either
-        for project in tool.run(arg.payload, arg.config)
-    ])
+    options_either = _check_options(arg)
+    if isinstance(options_either, Bad):
+        logger.error_block('celt failure', options_either.value)
+        return 1
+    if arg.batch:
+        manifest_either = load_manifest(arg.batch)
+        if isinstance(manifest_either, Bad):
+            Issue.show_traceback = arg.traceback
+            logger.error_block('celt failure', manifest_either.value)
+            return 1
+        results = run_batch(
+            manifest_either.value.tools,
+            config,
+            arg.config,
+            arg.stats_only,
+        )
+        for res in results:
+            header = f'== {res.tool}: {res.payload}'
+            print(header, file=sys.stderr)  # noqa: WPS421
+            if res.issue:
+                if not arg.traceback:
+                    remove_traceback(res.issue)
+                logger.error_block(f'celt failure: {res.tool}', res.issue)
+            else:
+                print(res.output, file=sys.stderr)  # noqa: WPS421
+            if res.error_msg:
+                logger.error(res.error_msg)
+        return combined_status(results).value
+    tool_either = (
+        get_post_processor(arg.tool, config)
+        if arg.tool
+        else issue('missing tool, use --tool or --batch')
+    )
+    if arg.stream:
+        with open_payload(arg.payload) as stream:
+            either = one_of(lambda: [
+                project
+                for tool in tool_either
+                for project in tool.run_stream(
+                    stream,
+                    arg.config,
+                    keep_all=arg.output_format != 'text',
+                )
+            ])
+    elif arg.base:
+        payload = validate_payload(arg.payload)
+        base_payload = validate_payload(arg.base)
+        either = one_of(lambda: [
+            project
+            for tool in tool_either
+            for project in tool.run_delta(payload, base_payload, arg.config)
+        ])
+    elif arg.baseline:
+        baseline_path = arg.baseline
+        payload = validate_payload(arg.payload)
+        changed_files = (
+            arg.changed_files.splitlines() if arg.changed_files else None
+        )
+        either = one_of(lambda: [
+            project
+            for tool in tool_either
+            for project in tool.run_baseline(
+                payload,
+                arg.config,
+                baseline_path,
+                changed_files,
+            )
+        ])
+    else:
+        payload = validate_payload(arg.payload)
+        either = one_of(lambda: [
+            project
+            for tool in tool_either
+            for project in tool.run(payload, arg.config)
+        ])
     if isinstance(either, Bad):
         Issue.show_traceback = arg.traceback
         logger.error_block('celt failure', either.value)
@@ -189,6 +462,17 @@ def run(arg: Arguments):
         else tool.to_str(project)
     )
     print(output, file=sys.stderr)  # noqa: WPS421
+    if arg.output_format != 'text':
+        chunks = (
+            tool.to_sarif(project)
+            if arg.output_format == 'sarif'
+            else tool.to_annotations(project, arg.annotation_limit)
+        )
+        if arg.output:
+            with open(arg.output, 'w', encoding='utf-8') as out_stream:
+                write_chunks(chunks, out_stream)
+        else:
+            write_chunks(chunks, sys.stdout)
     if project.error_msg:
         logger.error(project.error_msg)
     return project.status.value
@@ -1,21 +1,48 @@
-from m.cli import BaseModel, command
+from m.cli import Arg, BaseModel, command, run_main
 
 
 class Arguments(BaseModel):
     """Command line prompter.
 
     The goal is to display useful git information in the shell prompt.
+
+    With `--daemon` the git status of each repository is kept in memory
+    and answered over a unix socket until the repository changes. The
+    prompt asks the daemon when it is running.
     """
 
+    daemon: bool = Arg(
+        default=False,
+        help='serve the prompts from memory until interrupted',
+    )
+    socket: str | None = Arg(
+        default=None,
+        help='daemon socket, see $MDC_PROMPTER_SOCKET and $XDG_RUNTIME_DIR',
+    )
+    debounce: float = Arg(
+        default=0.1,
+        help='seconds without file changes before refreshing a git status',
+    )
+
 
 @command(
     help='print out a shell prompt with git info',
     model=Arguments,
 )
-def run() -> int:
+def run(arg: Arguments) -> int:
     import sys
 
-    from m.devcontainer.prompter import prompter
+    from m.devcontainer.prompter_daemon import (
+        daemon_prompter,
+        default_socket_path,
+        run_daemon,
+    )
 
-    sys.stdout.write(prompter())
+    socket_path = arg.socket or default_socket_path()
+    if arg.daemon:
+        return run_main(
+            lambda: run_daemon(socket_path, arg.debounce),
+            result_handler=lambda _: None,
+        )
+    sys.stdout.write(daemon_prompter(socket_path))
     return 0
@@ -11,17 +11,17 @@ class Arguments(BaseModel):
 
     statuses::
 
-        unknown
+        stash
         untracked
-        clean
+        diverged
         ahead
         behind
         staged
         dirty
-        diverged
-        ?
+        clean
 
-    If you want to check for stashed changes, use the `--check-stashed` flag.
+    The first status in the list that applies is displayed. If you want to
+    check for stashed changes, use the `--check-stashed` flag.
     """
 
     check_stashed: bool = Arg(
@@ -30,10 +30,6 @@ class Arguments(BaseModel):
     )
 
 
-def _get_status(status_desc: tuple[str, str]) -> str:
-    return status_desc[0]
-
-
 @command(
     help='display the current git status',
     model=Arguments,
@@ -42,6 +38,8 @@ def run(arg: Arguments):
     from m import git
 
     return run_main(
-        lambda: git.get_status(check_stash=arg.check_stashed).map(_get_status),
+        lambda: git.get_status().map(
+            lambda status: status.label(check_stash=arg.check_stashed),
+        ),
         print,
     )
@@ -1,5 +1,19 @@
-from m.cli import Arg, ArgProxy, BaseModel, command, run_main
+from typing import Any
+
+from m.cli import (
+    Arg,
+    ArgProxy,
+    BaseModel,
+    command,
+    run_main,
+    validate_json_payload,
+)
+from m.core import Good, Res, issue
 from m.core.io import env
+from m.github.api import GithubShaStatus
+
+STATES = ('error', 'failure', 'pending', 'success')
+STATUS_FIELDS = frozenset(('sha', 'context', 'state', 'description', 'url'))
 
 
 class Arguments(BaseModel):
@@ -17,6 +31,13 @@ class Arguments(BaseModel):
             --state pending \
             --description 'running checks'
 
+    Several statuses may be created at once with `--batch`. It takes a json
+    or yaml list of objects with the `context`, `state`, `description` and
+    optional `url` and `sha` fields. The `sha` defaults to the value of the
+    `--sha` option::
+
+        $ m github status --repo pysync --sha [sha] --batch @statuses.json
+
     The `owner` option defaults to the value of the environment variable
     `GITHUB_REPOSITORY_OWNER`.
     """
@@ -29,27 +50,89 @@ class Arguments(BaseModel):
         help='repo name',
         required=True,
     )
-    sha: str = Arg(
+    sha: str | None = Arg(
         help='commit sha',
-        required=True,
     )
-    context: str = Arg(
+    context: str | None = Arg(
         help='unique identifier for the status (a name?)',
-        required=True,
     )
-    state: str = ArgProxy(
+    state: str | None = ArgProxy(
         '--state',
-        required=True,
-        choices=['error', 'failure', 'pending', 'success'],
+        choices=list(STATES),
         help='the state of the status',
     )
-    description: str = Arg(
+    description: str | None = Arg(
         help='a short description of the status',
-        required=True,
     )
     url: str | None = Arg(
         help='URL to associate with this status',
     )
+    batch: Any = Arg(
+        help='list of statuses: @- (stdin), @filename (file), string',
+        validator=validate_json_payload,
+    )
+
+
+def _status_problems(status_info: Any) -> list[str]:
+    if not isinstance(status_info, dict):
+        return ['not an object']
+    problems = [
+        f'unknown field "{field}"'
+        for field in sorted(set(status_info) - STATUS_FIELDS)
+    ]
+    for field in ('sha', 'context'):
+        field_value = status_info.get(field)
+        if not field_value or not isinstance(field_value, str):
+            problems.append(f'missing {field}')
+    if status_info.get('state') not in STATES:
+        problems.append(f'state should be one of {", ".join(STATES)}')
+    if not isinstance(status_info.get('description'), str):
+        problems.append('missing description')
+    url = status_info.get('url')
+    if url is not None and not isinstance(url, str):
+        problems.append('url should be a string')
+    return problems
+
+
+def _batch_statuses(arg: Arguments) -> Res[list[GithubShaStatus]]:
+    if not isinstance(arg.batch, list):
+        return issue('the batch should be a list of statuses')
+    entries = [
+        {'sha': arg.sha, **status_info}
+        if isinstance(status_info, dict)
+        else status_info
+        for status_info in arg.batch
+    ]
+    invalid = [
+        {'index': index, 'status': entry, 'problems': problems}
+        for index, entry in enumerate(entries)
+        for problems in (_status_problems(entry),)
+        if problems
+    ]
+    if invalid:
+        return issue('invalid statuses in batch', context={
+            'invalid': invalid,
+        })
+    return Good([GithubShaStatus(**entry) for entry in entries])
+
+
+def _single_status(arg: Arguments) -> Res[GithubShaStatus]:
+    required = {
+        '--sha': arg.sha,
+        '--context': arg.context,
+        '--state': arg.state,
+        '--description': arg.description,
+    }
+    missing = [name for name, arg_value in required.items() if not arg_value]
+    if missing:
+        return issue('missing arguments', context={'missing': missing})
+    return Good(GithubShaStatus(
+        sha=arg.sha or '',
+        context=arg.context or '',
+        state=arg.state or '',
+        description=arg.description or '',
+        url=arg.url,
+    ))
 
 
 @command(
@@ -57,18 +140,26 @@ class Arguments(BaseModel):
     model=Arguments,
 )
 def run(arg: Arguments, arg_ns) -> int:
-    from m.github.api import GithubShaStatus, commit_status
-    return run_main(
-        lambda: commit_status(
+    from m.core import one_of
+    from m.github.api import commit_status, commit_statuses
+    if arg.batch is not None:
+        return run_main(lambda: one_of(lambda: [
+            responses
+            for statuses in _batch_statuses(arg)
+            for responses in commit_statuses(
+                arg_ns.token,
+                arg.owner,
+                arg.repo,
+                statuses,
+            )
+        ]))
+    return run_main(lambda: one_of(lambda: [
+        response
+        for sha_info in _single_status(arg)
+        for response in commit_status(
             arg_ns.token,
             arg.owner,
             arg.repo,
-            GithubShaStatus(
-                sha=arg.sha,
-                context=arg.context,
-                state=arg.state,
-                description=arg.description,
-                url=arg.url,
-            ),
-        ),
-    )
+            sha_info,
+        )
+    ]))
@@ -83,6 +83,31 @@ def validate_payload(file_path: str) -> str:
     return file_path
 
 
+def validate_payload_source(file_path: str) -> str:
+    """Return the payload specification without reading it.
+
+    Same as [validate_payload][m.cli.validators.validate_payload] but it only
+    checks that the file exists. Commands may then read the payload at their
+    own pace, for instance as a stream.
+
+    Args:
+        file_path: A string with the payload. If it starts with `@` then the
+            name of a valid file from where the payload will be read.
+
+    Raises:
+        ArgumentTypeError: If the file_path is meant to be a valid path and it
+            does not exist.
+
+    Returns:
+        The unmodified `file_path`.
+    """
+    if file_path.startswith('@') and file_path != '@-':
+        filename = file_path[1:]
+        if not Path.exists(Path(filename)):
+            raise ArgumentTypeError(f'file "{filename}" does not exist')
+    return file_path
+
+
 def validate_non_empty_str(arg_value: str) -> str:
     """Return the value as long as its not empty.
 
@@ -0,0 +1,289 @@
+import asyncio
+import json as builtin_json
+import ssl
+from contextlib import suppress
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from . import Issue, issue, one_of
+from .fp import Good, OneOf
+from .http import HttpMethod
+from .json import parse_json
+
+# Seconds allowed to connect and to read each part of a response.
+REQUEST_TIMEOUT = 60
+
+
+@dataclass
+class AsyncResponse:
+    """Result object for fetch_response_async."""
+
+    status: int
+    headers: Dict[str, str]
+    body: str
+
+
+@dataclass
+class FetchRequest:
+    """The arguments of a `fetch_json_async` call."""
+
+    url: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    method: HttpMethod = HttpMethod.get
+    body_json: Any = None
+
+
+def _request_bytes(
+    method: HttpMethod,
+    host: str,
+    path: str,
+    headers: Mapping[str, str],
+    body: Optional[str],
+) -> bytes:
+    body_bytes = body.encode() if body else b''
+    all_headers = {
+        'host': host,
+        'user-agent': 'm',
+        **headers,
+        'connection': 'close',
+    }
+    if body_bytes:
+        all_headers['content-length'] = str(len(body_bytes))
+    lines = [f'{method} {path or "/"} HTTP/1.1']
+    lines.extend(f'{name}: {value}' for name, value in all_headers.items())
+    head = '\r\n'.join(lines)
+    return f'{head}\r\n\r\n'.encode() + body_bytes
+
+
+async def _read_head(
+    reader: asyncio.StreamReader,
+) -> Tuple[int, Dict[str, str]]:
+    status_line = await reader.readline()
+    parts = status_line.decode('latin-1').split(' ', 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise ValueError(f'invalid status line: {status_line!r}')
+    headers: Dict[str, str] = {}
+    while True:  # noqa: WPS457 - reading until the empty line
+        line = (await reader.readline()).decode('latin-1').strip()
+        if not line:
+            break
+        name, _, header_value = line.partition(':')
+        headers[name.strip().lower()] = header_value.strip()
+    return int(parts[1]), headers
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: List[bytes] = []
+    while True:  # noqa: WPS457 - reading until the last chunk
+        size_line = await reader.readline()
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if not size:
+            # the last chunk may be followed by trailers
+            trailer = await reader.readline()
+            while trailer.strip():
+                trailer = await reader.readline()
+            return b''.join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    headers: Mapping[str, str],
+) -> bytes:
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        return await _read_chunked(reader)
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+
+def _port(protocol: str, port: Optional[int]) -> int:
+    if port:
+        return port
+    return 443 if protocol == 'https' else 80
+
+
+async def fetch_response_async(  # noqa: WPS211, WPS231 - as fetch_response
+    url: str,
+    headers: Mapping[str, str],
+    method: HttpMethod = HttpMethod.get,
+    body: Optional[str] = None,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> OneOf[Issue, AsyncResponse]:
+    """Send an http(s) request with asyncio streams.
+
+    A new connection is opened for each request. A server that stalls while
+    connecting, sending the status and headers or sending the body makes
+    the request fail after `timeout` seconds.
+
+    Args:
+        url:
+            The url to request.
+        headers:
+            The headers for the request. By default it sets the `user-agent`
+            to "m".
+        method:
+            The request method type. Defaults to `GET`.
+        body:
+            The body of the request.
+        ssl_context:
+            Context for https requests. Uses the default context if not
+            provided.
+        timeout:
+            Seconds allowed for each step of the request.
+
+    Returns:
+        A `OneOf` containing the response from the server or an Issue.
+    """
+    parts = urlparse(url)
+    protocol, hostname = parts.scheme, parts.netloc
+    path = f'{parts.path}?{parts.query}' if parts.query else parts.path
+    ctxt: dict[str, str] = {'url': f'{hostname}{path}', 'method': f'{method}'}
+    tls: Optional[ssl.SSLContext] = None
+    if protocol == 'https':
+        tls = ssl_context or ssl.create_default_context()
+    # See the next link for explanation disabling WPS440:
+    #  https://github.com/wemake-services/wemake-python-styleguide/issues/1416
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                parts.hostname,
+                _port(protocol, parts.port),
+                ssl=tls,
+            ),
+            timeout,
+        )
+    except Exception as ex:
+        return issue(f'{protocol} request failure', cause=ex, context=ctxt)
+    try:
+        try:
+            writer.write(_request_bytes(method, hostname, path, headers, body))
+            await asyncio.wait_for(writer.drain(), timeout)
+        except Exception as ex:  # noqa: WPS440
+            return issue(f'{protocol} request failure', cause=ex, context=ctxt)
+        try:
+            code, res_headers = await asyncio.wait_for(
+                _read_head(reader),
+                timeout,
+            )
+        except Exception as ex:  # noqa: WPS440
+            return issue(
+                f'{protocol} response failure',
+                cause=ex,
+                context=ctxt,
+            )
+        try:
+            res_body = (await asyncio.wait_for(
+                _read_body(reader, res_headers),
+                timeout,
+            )).decode()
+        except Exception as ex:  # noqa: WPS440
+            return issue(f'{protocol} read failure', cause=ex, context=ctxt)
+    finally:
+        writer.close()
+        # the connection is done, failures while closing it do not matter
+        with suppress(OSError, asyncio.TimeoutError):
+            await asyncio.wait_for(writer.wait_closed(), timeout)
+    if HTTPStatus.OK <= code < HTTPStatus.MULTIPLE_CHOICES:
+        return Good(AsyncResponse(code, res_headers, res_body))
+    return issue(
+        f'{protocol} request failure ({code})',
+        context={
+            'body': body,
+            'code': code,
+            'res_body': res_body,
+            **ctxt,
+        },
+    )
+
+
+async def fetch_json_async(
+    request: FetchRequest,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> OneOf[Issue, Any]:
+    """Specialized asyncio fetch to deal with json data.
+
+    Args:
+        request: The url, headers, method and data to send.
+        ssl_context: Context for https requests.
+        timeout: Seconds allowed for each step of the request.
+
+    Returns:
+        A `OneOf` containing a json parsed response from the server or an
+        Issue.
+    """
+    body_json = request.body_json
+    body = builtin_json.dumps(body_json) if body_json else None
+    fetch_headers = {
+        'accept': 'application/json',
+        'content-type': 'application/json',
+        **request.headers,
+    }
+    res = await fetch_response_async(
+        request.url,
+        fetch_headers,
+        request.method,
+        body,
+        ssl_context,
+        timeout,
+    )
+    return one_of(lambda: [
+        response
+        for fetched in res
+        for response in parse_json(fetched.body)
+    ])
+
+
+async def fetch_json_all(
+    requests: Iterable[FetchRequest],
+    concurrency: int = 4,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> List[OneOf[Issue, Any]]:
+    """Run several `fetch_json_async` requests.
+
+    Args:
+        requests: The requests to make.
+        concurrency: Max number of requests in flight.
+        ssl_context: Context for https requests.
+        timeout: Seconds allowed for each step of a request.
+
+    Returns:
+        The results of the requests in the same order as the requests.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _fetch(request: FetchRequest) -> OneOf[Issue, Any]:
+        async with semaphore:
+            return await fetch_json_async(request, ssl_context, timeout)
+
+    return list(await asyncio.gather(*[
+        _fetch(request) for request in requests
+    ]))
+
+
+def fetch_json_many(
+    requests: Iterable[FetchRequest],
+    concurrency: int = 4,
+    ssl_context: Optional[ssl.SSLContext] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> List[OneOf[Issue, Any]]:
+    """Run several json requests concurrently from synchronous code.
+
+    Args:
+        requests: The requests to make.
+        concurrency: Max number of requests in flight.
+        ssl_context: Context for https requests.
+        timeout: Seconds allowed for each step of a request.
+
+    Returns:
+        The results of the requests in the same order as the requests.
+    """
+    return asyncio.run(
+        fetch_json_all(requests, concurrency, ssl_context, timeout),
+    )
@@ -1,15 +1,31 @@
+import codecs
 import json as builtin_json
 import os
+import ssl
+import threading
+import time
+import zlib
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from http import HTTPStatus
 from http import client as httplib
-from typing import Any, Mapping, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 from urllib.parse import urlparse
 
 from . import Issue, issue, one_of
-from .fp import Good, OneOf
-from .json import parse_json
+from .fp import Bad, Good, OneOf
+from .http_cache import CacheEntry, ResponseCache, cache_key, response_cache
+from .json import iter_json_array, parse_json
 
 
 class HttpMethod(str, Enum):  # noqa: WPS600
@@ -35,24 +51,340 @@ class HttpMethod(str, Enum):  # noqa: WPS600
 class FetchedResponse:
     """Result object for fetch_response."""
 
-    response: httplib.HTTPResponse
+    # `None` if the body was served from the cache without a request.
+    response: Optional[httplib.HTTPResponse]
     body: str
 
 
-def _get_connection(protocol: str, hostname: str) -> httplib.HTTPConnection:
-    if protocol == 'https':
+# Errors raised when the server closed an idle keep-alive connection. A TLS
+# connection closed without a close_notify alert raises `SSLEOFError`.
+STALE_ERRORS = (ConnectionError, httplib.BadStatusLine, ssl.SSLEOFError)
+
+PoolKey = Tuple[str, str]
+
+# method, path, body and headers of a request
+RequestArgs = Tuple[str, str, Optional[str], Mapping[str, str]]
+
+# Called with every response received by `fetch_response`.
+ResponseHook = Callable[[httplib.HTTPResponse], None]
+
+# Bytes read from a response at a time.
+CHUNK_SIZE = 65536
+
+# Let zlib detect the gzip or zlib header of the compressed body.
+ZLIB_AUTO_HEADER = 32 + zlib.MAX_WBITS
+
+
+class ConnectionPool:
+    """Keep-alive connections grouped by protocol and host.
+
+    Connections are returned to the pool once their response has been read
+    and reused by the next request to the same host. Connections that have
+    been idle for longer than `idle_timeout` seconds are closed instead of
+    reused.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4,
+        idle_timeout: float = 30,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            max_size: Max number of idle connections kept per host.
+            idle_timeout: Seconds an idle connection may be reused.
+            ssl_context: Context for the https connections. Uses the
+                default context if not provided.
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        # Total number of connections created by the pool.
+        self.created = 0
+        self._idle: Dict[PoolKey, List[Tuple[float, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def connect(self, protocol: str, hostname: str) -> httplib.HTTPConnection:
+        """Create a new connection.
+
+        Args:
+            protocol: Either `http` or `https`.
+            hostname: The host and optional port.
+
+        Returns:
+            An http connection, the socket is opened on the first request.
+        """
+        with self._lock:
+            self.created += 1
+        if protocol != 'https':
+            return httplib.HTTPConnection(hostname)
+        if self.ssl_context:
+            return httplib.HTTPSConnection(hostname, context=self.ssl_context)
         return httplib.HTTPSConnection(hostname)  # noqa: S309
-    return httplib.HTTPConnection(hostname)
+
+    def acquire(
+        self,
+        protocol: str,
+        hostname: str,
+    ) -> Tuple[httplib.HTTPConnection, bool]:
+        """Take an idle connection to the host or create a new one.
+
+        Args:
+            protocol: Either `http` or `https`.
+            hostname: The host and optional port.
+
+        Returns:
+            The connection and `True` if it was reused.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get((protocol, hostname), [])
+            while idle:
+                last_used, connection = idle.pop()
+                if now - last_used < self.idle_timeout:
+                    return connection, True
+                connection.close()
+        return self.connect(protocol, hostname), False
+
+    def release(
+        self,
+        protocol: str,
+        hostname: str,
+        connection: httplib.HTTPConnection,
+    ) -> None:
+        """Return a connection to the pool.
+
+        The connection is closed if the pool of the host is full.
+
+        Args:
+            protocol: Either `http` or `https`.
+            hostname: The host and optional port.
+            connection: A connection whose response has been read.
+        """
+        with self._lock:
+            idle = self._idle.setdefault((protocol, hostname), [])
+            if len(idle) < self.max_size:
+                idle.append((time.monotonic(), connection))
+                return
+        connection.close()
+
+    def close_all(self) -> None:
+        """Close all the idle connections."""
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for idle in pools:
+            for _, connection in idle:
+                connection.close()
+
+
+# Pool used by `fetch_response`.
+connection_pool = ConnectionPool()
+
+
+def close_all() -> None:
+    """Close the idle connections of the pool used by `fetch_response`."""
+    connection_pool.close_all()
+
+
+def _get_response(
+    connection: httplib.HTTPConnection,
+    protocol: str,
+    request_args: RequestArgs,
+    ctxt: Mapping[str, str],
+) -> OneOf[Issue, httplib.HTTPResponse]:
+    # See the next link for explanation disabling WPS440:
+    #  https://github.com/wemake-services/wemake-python-styleguide/issues/1416
+    try:
+        connection.request(*request_args)
+    except Exception as ex:
+        return issue(f'{protocol} request failure', cause=ex, context=ctxt)
+    try:
+        return Good(connection.getresponse())
+    except Exception as ex:  # noqa: WPS440
+        return issue(f'{protocol} response failure', cause=ex, context=ctxt)
+
+
+def _is_stale(res: OneOf[Issue, Any]) -> bool:
+    return isinstance(res, Bad) and isinstance(res.value.cause, STALE_ERRORS)
+
+
+def _inflate(
+    decompressor: Any,
+    raw_chunks: Iterator[bytes],
+    size: int,
+) -> Iterator[bytes]:
+    for raw in raw_chunks:
+        # Limit the size of the decompressed output to `size` bytes.
+        pending = raw
+        while pending:
+            yield decompressor.decompress(pending, size)
+            pending = decompressor.unconsumed_tail
+    yield decompressor.flush()
+
+
+def decoded_chunks(
+    res: httplib.HTTPResponse,
+    size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Read, decompress and decode the body of a response in chunks.
+
+    Bodies with a `gzip` or `deflate` content encoding are decompressed
+    incrementally so that only a chunk of the compressed data and a chunk
+    of the decompressed data are in memory at a time.
+
+    Args:
+        res: A response whose body has not been read.
+        size: The number of bytes to read and decompress at a time.
+
+    Yields:
+        Pieces of the decoded body.
+    """
+    raw_chunks = iter(partial(res.read, size), b'')
+    encoding = (res.getheader('content-encoding') or '').lower()
+    if encoding in {'gzip', 'deflate'}:
+        decompressor = zlib.decompressobj(ZLIB_AUTO_HEADER)
+        raw_chunks = _inflate(decompressor, raw_chunks, size)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for data in raw_chunks:
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def _open(
+    protocol: str,
+    hostname: str,
+    request_args: RequestArgs,
+    ctxt: Mapping[str, str],
+    idempotent: bool,
+) -> OneOf[Issue, Tuple[httplib.HTTPConnection, httplib.HTTPResponse]]:
+    connection, reused = connection_pool.acquire(protocol, hostname)
+    res_either = _get_response(connection, protocol, request_args, ctxt)
+    # The server may have processed the request before dropping the
+    # connection, only the requests without side effects are sent again.
+    if reused and idempotent and _is_stale(res_either):
+        # The server closed the idle connection, retry with a new one.
+        connection.close()
+        connection = connection_pool.connect(protocol, hostname)
+        res_either = _get_response(connection, protocol, request_args, ctxt)
+    if isinstance(res_either, Bad):
+        connection.close()
+        return Bad(res_either.value)
+    return Good((connection, res_either.value))
+
+
+def _finish(
+    protocol: str,
+    hostname: str,
+    connection: httplib.HTTPConnection,
+    res: httplib.HTTPResponse,
+) -> None:
+    if res.will_close:
+        connection.close()
+    else:
+        connection_pool.release(protocol, hostname, connection)
+
+
+def _send(
+    protocol: str,
+    hostname: str,
+    request_args: RequestArgs,
+    ctxt: Mapping[str, str],
+    idempotent: bool,
+) -> OneOf[Issue, Tuple[httplib.HTTPResponse, str]]:
+    opened = _open(protocol, hostname, request_args, ctxt, idempotent)
+    if isinstance(opened, Bad):
+        return Bad(opened.value)
+    connection, res = opened.value
+    try:
+        res_body = ''.join(decoded_chunks(res))
+    except Exception as ex:
+        connection.close()
+        return issue(f'{protocol} read failure', cause=ex, context=ctxt)
+    _finish(protocol, hostname, connection, res)
+    return Good((res, res_body))
+
+
+def _store(
+    cache: ResponseCache,
+    key: str,
+    res: httplib.HTTPResponse,
+    res_body: str,
+) -> None:
+    etag = res.getheader('etag')
+    last_modified = res.getheader('last-modified')
+    if etag or last_modified or cache.max_age > 0:
+        cache.put(key, CacheEntry(res_body, etag, last_modified))
+
+
+def _request_headers(
+    headers: Mapping[str, str],
+    body: Optional[str],
+) -> dict[str, str]:
+    fetch_headers = {
+        'user-agent': 'm',
+        'accept-encoding': 'gzip, deflate',
+        **headers,
+    }
+    if body:
+        fetch_headers['content-length'] = str(len(body))
+    return fetch_headers
+
+
+def _context(
+    hostname: str,
+    path: str,
+    method: HttpMethod,
+    body: Optional[str],
+) -> dict[str, str]:
+    ctxt = {'url': f'{hostname}{path}', 'method': f'{method}'}
+    if body and 'DEBUG_HTTP_INCLUDE_BODY' in os.environ:
+        ctxt['body'] = body
+    return ctxt
+
+
+def _status_issue(
+    protocol: str,
+    code: int,
+    body: Optional[str],
+    res_body: str,
+    ctxt: Mapping[str, str],
+) -> OneOf[Issue, Any]:
+    return issue(
+        f'{protocol} request failure ({code})',
+        context={
+            'body': body,
+            'code': code,
+            'res_body': res_body,
+            **ctxt,
+        },
+    )
 
 
-def fetch_response(
+def fetch_response(  # noqa: WPS231 - network, cache and status handling
     url: str,
     headers: Mapping[str, str],
     method: HttpMethod = HttpMethod.get,
     body: Optional[str] = None,
+    cacheable: Optional[bool] = None,
+    on_response: Optional[ResponseHook] = None,
 ) -> OneOf[Issue, FetchedResponse]:
     """Send an http(s) request.
 
+    When the `M_HTTP_CACHE_DIR` environment variable is set the responses
+    to cacheable requests are stored in that directory along with their
+    `ETag` and `Last-Modified` headers. The next identical request is sent
+    with the `If-None-Match` and `If-Modified-Since` headers and the
+    stored body is used if the server replies with `304 Not Modified`.
+    Entries younger than `M_HTTP_CACHE_MAX_AGE` seconds are used without
+    contacting the server.
+
     Args:
         url:
             The url to request.
@@ -63,6 +395,15 @@ def fetch_response(
             The request method type. Defaults to `GET`.
         body:
             The body of the request.
+        cacheable:
+            Whether the response may be cached. Defaults to `True` only for
+            `GET` requests. Set it for other requests that only read data,
+            like graphql queries. Only `GET` and cacheable requests are sent
+            again when a reused connection turns out to be closed.
+        on_response:
+            Function called with every response received from the server,
+            including error responses. It may be used to inspect headers
+            such as rate limits.
 
     Returns:
         A `OneOf` containing the response object from the server or an Issue.
@@ -70,42 +411,40 @@ def fetch_response(
     parts = urlparse(url)
     protocol, hostname, path = [parts.scheme, parts.netloc, parts.path]
     path = f'{path}?{parts.query}' if parts.query else path
-    fetch_headers = {'user-agent': 'm', **headers}
-    ctxt: dict[str, str] = {'url': f'{hostname}{path}', 'method': f'{method}'}
-    if body:
-        fetch_headers['content-length'] = str(len(body))
-        if 'DEBUG_HTTP_INCLUDE_BODY' in os.environ:
-            ctxt['body'] = body
-    connection = _get_connection(protocol, hostname)
-    # See the next link for explanation disabling WPS440:
-    #  https://github.com/wemake-services/wemake-python-styleguide/issues/1416
-    try:
-        connection.request(f'{method}', path, body, fetch_headers)
-    except Exception as ex:
-        return issue(f'{protocol} request failure', cause=ex, context=ctxt)
-    try:
-        res = connection.getresponse()
-    except Exception as ex:  # noqa: WPS440
-        return issue(f'{protocol} response failure', cause=ex, context=ctxt)
-    try:
-        res_body = res.read().decode()
-    except Exception as ex:  # noqa: WPS440
-        return issue(f'{protocol} read failure', cause=ex, context=ctxt)
+    fetch_headers = _request_headers(headers, body)
+    ctxt = _context(hostname, path, method, body)
+    use_cache = method == HttpMethod.get if cacheable is None else cacheable
+    cache = response_cache() if use_cache else None
+    key = ''
+    entry = None
+    if cache:
+        key = cache_key(f'{method}', url, body, fetch_headers)
+        entry = cache.get(key)
+        if entry and cache.is_fresh(entry):
+            return Good(FetchedResponse(response=None, body=entry.body))
+    request_headers = dict(fetch_headers)
+    if entry:
+        request_headers.update(entry.validators())
+    request_args = (f'{method}', path, body, request_headers)
+    idempotent = method == HttpMethod.get or use_cache
+    sent = _send(protocol, hostname, request_args, ctxt, idempotent)
+    if isinstance(sent, Bad):
+        return Bad(sent.value)
+    res, res_body = sent.value
+    if on_response:
+        on_response(res)
     code = res.getcode()
+    if cache and entry and code == HTTPStatus.NOT_MODIFIED:
+        cache.put(key, entry)
+        return Good(FetchedResponse(response=res, body=entry.body))
     if HTTPStatus.OK <= code < HTTPStatus.MULTIPLE_CHOICES:
+        if cache:
+            _store(cache, key, res, res_body)
         return Good(FetchedResponse(
             response=res,
             body=res_body,
         ))
-    return issue(
-        f'{protocol} request failure ({code})',
-        context={
-            'body': body,
-            'code': code,
-            'res_body': res_body,
-            **ctxt,
-        },
-    )
+    return _status_issue(protocol, code, body, res_body, ctxt)
 
 
 def fetch(
@@ -113,6 +452,8 @@ def fetch(
     headers: Mapping[str, str],
     method: HttpMethod = HttpMethod.get,
     body: Optional[str] = None,
+    cacheable: Optional[bool] = None,
+    on_response: Optional[ResponseHook] = None,
 ) -> OneOf[Issue, str]:
     """Send an http(s) request.
 
@@ -126,13 +467,24 @@ def fetch(
             The request method type. Defaults to `GET`.
         body:
             The body of the request.
+        cacheable:
+            Whether the response may be cached, see `fetch_response`.
+        on_response:
+            Function called with every response, see `fetch_response`.
 
     Returns:
         A `OneOf` containing the raw response from the server or an Issue.
     """
     return one_of(lambda: [
         fetch_res.body
-        for fetch_res in fetch_response(url, headers, method, body)
+        for fetch_res in fetch_response(
+            url,
+            headers,
+            method,
+            body,
+            cacheable,
+            on_response=on_response,
+        )
     ])
 
 
@@ -141,6 +493,8 @@ def fetch_json(
     headers: Mapping[str, str],
     method: HttpMethod = HttpMethod.get,
     body_json: Any = None,
+    cacheable: Optional[bool] = None,
+    on_response: Optional[ResponseHook] = None,
 ) -> OneOf[Issue, Any]:
     """Specialized fetch to deal with json data.
 
@@ -154,6 +508,10 @@ def fetch_json(
             The request method type. Defaults to `GET`.
         body_json:
             The data to send to the server (python object).
+        cacheable:
+            Whether the response may be cached, see `fetch_response`.
+        on_response:
+            Function called with every response, see `fetch_response`.
 
     Returns:
         A `OneOf` containing a json parsed response from the server or an
@@ -167,6 +525,120 @@ def fetch_json(
     }
     return one_of(lambda: [
         response
-        for payload in fetch(url, fetch_headers, method, body)
+        for payload in fetch(
+            url,
+            fetch_headers,
+            method,
+            body,
+            cacheable,
+            on_response=on_response,
+        )
         for response in parse_json(payload)
     ])
+
+
+def _stream_body(
+    protocol: str,
+    hostname: str,
+    connection: httplib.HTTPConnection,
+    res: httplib.HTTPResponse,
+) -> Iterator[str]:
+    finished = False
+    try:
+        yield from decoded_chunks(res)
+        finished = True
+    finally:
+        if finished:
+            _finish(protocol, hostname, connection, res)
+        else:
+            # The body was not fully read, the connection cannot be reused.
+            connection.close()
+
+
+def fetch_stream(
+    url: str,
+    headers: Mapping[str, str],
+    method: HttpMethod = HttpMethod.get,
+    body: Optional[str] = None,
+) -> OneOf[Issue, Iterator[str]]:
+    """Send an http(s) request and read the response body as it arrives.
+
+    Unlike `fetch` the body is never held in memory as a single string.
+    The responses are not cached.
+
+    Args:
+        url:
+            The url to request.
+        headers:
+            The headers for the request. By default it sets the `user-agent`
+            to "m".
+        method:
+            The request method type. Defaults to `GET`.
+        body:
+            The body of the request.
+
+    Returns:
+        A `OneOf` containing an iterator over the decoded pieces of the body
+        or an Issue. Errors while reading the body are raised by the
+        iterator.
+    """
+    parts = urlparse(url)
+    protocol, hostname, path = [parts.scheme, parts.netloc, parts.path]
+    path = f'{path}?{parts.query}' if parts.query else path
+    ctxt = _context(hostname, path, method, body)
+    request_args = (f'{method}', path, body, _request_headers(headers, body))
+    idempotent = method == HttpMethod.get
+    opened = _open(protocol, hostname, request_args, ctxt, idempotent)
+    if isinstance(opened, Bad):
+        return Bad(opened.value)
+    connection, res = opened.value
+    code = res.getcode()
+    if HTTPStatus.OK <= code < HTTPStatus.MULTIPLE_CHOICES:
+        return Good(_stream_body(protocol, hostname, connection, res))
+    try:
+        res_body = ''.join(decoded_chunks(res))
+    except Exception as ex:
+        res_body = f'unable to read the response body: {ex}'
+    finally:
+        connection.close()
+    return _status_issue(protocol, code, body, res_body, ctxt)
+
+
+def fetch_json_stream(
+    url: str,
+    headers: Mapping[str, str],
+    method: HttpMethod = HttpMethod.get,
+    body_json: Any = None,
+) -> OneOf[Issue, Iterator[Any]]:
+    """Specialized `fetch_stream` for responses with a json array.
+
+    The items of the array are decoded as soon as their text arrives so
+    that neither the raw body nor the whole decoded array are kept in
+    memory.
+
+    Args:
+        url:
+            The url to request.
+        headers:
+            Additional headers for the request. By default it will add
+            proper accept and content-type headers for json requests.
+        method:
+            The request method type. Defaults to `GET`.
+        body_json:
+            The data to send to the server (python object).
+
+    Returns:
+        A `OneOf` containing an iterator over the items of the array or an
+        Issue. Invalid json is reported by the iterator with a
+        `json.JSONDecodeError`.
+    """
+    body = builtin_json.dumps(body_json) if body_json else None
+    fetch_headers = {
+        'accept': 'application/json',
+        'content-type': 'application/json',
+        **headers,
+    }
+    return one_of(lambda: [
+        iter_json_array(chunks)
+        for chunks in fetch_stream(url, fetch_headers, method, body)
+    ])
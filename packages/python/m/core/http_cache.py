@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Mapping, Optional
+
+# Directory where the responses are stored, the cache is disabled if the
+# variable is not set.
+CACHE_DIR_ENV = 'M_HTTP_CACHE_DIR'
+
+# Seconds during which an entry is served without contacting the server.
+# Defaults to 0, every entry is revalidated.
+CACHE_MAX_AGE_ENV = 'M_HTTP_CACHE_MAX_AGE'
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+@dataclass
+class CacheEntry:
+    """A response stored in the cache."""
+
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0
+
+    def validators(self) -> dict[str, str]:
+        """Create the headers of a conditional request.
+
+        Returns:
+            The `if-none-match` and `if-modified-since` headers.
+        """
+        headers = {}
+        if self.etag:
+            headers['if-none-match'] = self.etag
+        if self.last_modified:
+            headers['if-modified-since'] = self.last_modified
+        return headers
+
+
+def cache_key(
+    method: str,
+    url: str,
+    body: Optional[str],
+    headers: Mapping[str, str],
+) -> str:
+    """Compute the key of a request.
+
+    The authorization header is part of the key so that responses are not
+    shared between tokens with different access.
+
+    Args:
+        method: The request method.
+        url: The url of the request.
+        body: The body of the request.
+        headers: The headers of the request.
+
+    Returns:
+        A hex digest identifying the request.
+    """
+    body_hash = hashlib.sha256((body or '').encode()).hexdigest()
+    auth = {
+        name.lower(): header_value
+        for name, header_value in headers.items()
+    }.get('authorization', '')
+    auth_hash = hashlib.sha256(auth.encode()).hexdigest()
+    key = '\n'.join([method, url, body_hash, auth_hash])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Responses stored as json files in a directory.
+
+    The modification time of the files is updated every time an entry is
+    used so that the least recently used entries are evicted first once
+    the directory holds more than `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = 0,
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: The directory to store the responses.
+            max_bytes: Max size of the stored responses.
+            max_age: Seconds during which an entry is fresh.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Read an entry and mark it as recently used.
+
+        Args:
+            key: The key of the request.
+
+        Returns:
+            The entry or `None` if it is not in the cache.
+        """
+        entry_path = self.directory / f'{key}.json'
+        try:
+            entry = CacheEntry(**json.loads(entry_path.read_text()))
+            os.utime(entry_path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Determine if an entry may be used without revalidation.
+
+        Args:
+            entry: An entry from the cache.
+
+        Returns:
+            True if the entry was stored less than `max_age` seconds ago.
+        """
+        return time.time() - entry.stored_at < self.max_age
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry and evict the least recently used ones.
+
+        The entry is written to a temporary file first so that concurrent
+        jobs sharing the directory never read partial entries.
+
+        Args:
+            key: The key of the request.
+            entry: The entry to store.
+        """
+        entry.stored_at = time.time()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(asdict(entry), tmp_file)
+            os.replace(tmp_path, self.directory / f'{key}.json')
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries over the size limit."""
+        entries = []
+        for entry_path in self.directory.glob('*.json'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                return
+            entry_path.unlink(missing_ok=True)
+            total -= size
+
+
+def response_cache() -> Optional[ResponseCache]:
+    """Create the cache configured with the environment variables.
+
+    Returns:
+        A `ResponseCache` or `None` if `M_HTTP_CACHE_DIR` is not set.
+    """
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    try:
+        max_age = float(os.environ.get(CACHE_MAX_AGE_ENV, 0))
+    except ValueError:
+        max_age = 0
+    return ResponseCache(directory, max_age=max_age)
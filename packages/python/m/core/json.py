@@ -1,6 +1,10 @@
+import importlib
 import json
-from collections.abc import Mapping
+import os
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import suppress
+from dataclasses import dataclass
+from functools import cache
 from typing import Any
 from typing import Mapping as Map
 from typing import Union
@@ -11,6 +15,82 @@ from .issue import Issue
 from .one_of import hone, issue, one_of
 
 
+@dataclass(frozen=True)
+class JsonBackend:
+    """A json decoder."""
+
+    name: str
+    loads: Callable[[str | bytes], Any]
+
+
+def _load_backends() -> dict[str, JsonBackend]:
+    backends = {'json': JsonBackend('json', json.loads)}
+    with suppress(ImportError):
+        msgspec = importlib.import_module('msgspec.json')
+        backends['msgspec'] = JsonBackend('msgspec', msgspec.decode)
+    with suppress(ImportError):
+        orjson = importlib.import_module('orjson')
+        backends['orjson'] = JsonBackend('orjson', orjson.loads)
+    return backends
+
+
+@cache
+def json_backends() -> dict[str, JsonBackend]:
+    """List the available json decoders.
+
+    The standard library decoder is always available. `orjson` and
+    `msgspec` are used if they are installed.
+
+    Returns:
+        A dictionary mapping the name of the decoders to a `JsonBackend`.
+    """
+    return _load_backends()
+
+
+def get_backend(name: str | None = None) -> JsonBackend:
+    """Select a json decoder.
+
+    The decoder may be chosen with the `M_JSON_BACKEND` environment
+    variable. By default the fastest available decoder is used.
+
+    Args:
+        name: The name of the decoder, overrides `M_JSON_BACKEND`.
+
+    Returns:
+        The selected `JsonBackend`, the standard library decoder if the
+        requested decoder is not available.
+    """
+    backends = json_backends()
+    preferred = name or os.environ.get('M_JSON_BACKEND')
+    if preferred:
+        return backends.get(preferred, backends['json'])
+    for backend_name in ('orjson', 'msgspec'):
+        if backend_name in backends:
+            return backends[backend_name]
+    return backends['json']
+
+
+def loads(json_data: str | bytes) -> Any:
+    """Decode json data with the selected backend.
+
+    The backends differ in what they accept, `orjson` for instance rejects
+    `NaN` and integers that do not fit in 64 bits. Data rejected by the
+    backend is decoded again with the standard library so that the results
+    and error messages do not depend on the backend.
+
+    Args:
+        json_data: The json document.
+
+    Returns:
+        The decoded data.
+    """
+    backend = get_backend()
+    if backend.name != 'json':
+        with suppress(Exception):
+            return backend.loads(json_data)
+    return json.loads(json_data)
+
+
 def read_json(
     filename: str | None,
     error_if_empty: bool = False,
@@ -48,11 +128,133 @@ def parse_json(
     """
     empty = '' if error_if_empty else 'null'
     try:
-        return Good(json.loads(json_str or empty))
+        return Good(loads(json_str or empty))
     except Exception as ex:
         return issue('failed to parse the json data', cause=ex)
 
 
+def _skip_ws(buffer: str, index: int) -> int:
+    while index < len(buffer) and buffer[index] in ' \t\n\r':
+        index += 1
+    return index
+
+
+class _ChunkReader:
+    """Keep a rolling buffer over an iterable of string chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.buffer = ''
+        self.index = 0
+        self.done = False
+
+    def more(self, min_size: int = 1) -> bool:
+        """Append chunks until at least `min_size` characters are added.
+
+        Args:
+            min_size: The minimum number of characters to read.
+
+        Returns:
+            False if the chunks were exhausted before reading anything.
+        """
+        self.buffer = self.buffer[self.index:]
+        self.index = 0
+        pieces = [self.buffer]
+        added = 0
+        for chunk in self.chunks:
+            pieces.append(chunk)
+            added += len(chunk)
+            if added >= min_size:
+                break
+        else:
+            self.done = True
+        self.buffer = ''.join(pieces)
+        return added > 0
+
+    def peek(self) -> str:
+        """Return the next non whitespace character.
+
+        Returns:
+            The next character or an empty string if there is no more data.
+        """
+        self.index = _skip_ws(self.buffer, self.index)
+        while self.index >= len(self.buffer):
+            if self.done or not self.more():
+                return ''
+            self.index = _skip_ws(self.buffer, self.index)
+        return self.buffer[self.index]
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """Parse the items of a json array as the data arrives.
+
+    The chunks may split the json text at any position. Only the item being
+    decoded is kept in memory, making it possible to process arrays that
+    are much larger than the available memory as long as each of its items
+    is reasonably sized. An empty stream is treated as an empty array.
+
+    Args:
+        chunks: An iterable of strings, for instance a file or the output of
+            `iter(partial(stream.read, size), '')`.
+
+    Yields:
+        The items of the array.
+
+    Raises:
+        json.JSONDecodeError: If the data is not a valid json array.
+    """
+    decoder = json.JSONDecoder()
+    reader = _ChunkReader(chunks)
+    token = reader.peek()
+    if not token:
+        return
+    if token != '[':
+        raise json.JSONDecodeError(
+            'Expecting \'[\'',
+            reader.buffer,
+            reader.index,
+        )
+    reader.index += 1
+    expect_item = True
+    while True:  # noqa: WPS457 - the loop ends when the array is closed
+        token = reader.peek()
+        if token == ']':
+            return
+        if token and not expect_item:
+            if token != ',':
+                raise json.JSONDecodeError(
+                    'Expecting \',\' delimiter',
+                    reader.buffer,
+                    reader.index,
+                )
+            reader.index += 1
+            token = reader.peek()
+        if not token:
+            raise json.JSONDecodeError(
+                'Unterminated array',
+                reader.buffer,
+                reader.index,
+            )
+        try:
+            item, end = decoder.raw_decode(reader.buffer, reader.index)
+        except json.JSONDecodeError:
+            end = -1
+        # The item may be incomplete (or touching the end of the buffer in
+        # the case of numbers). Keep reading, doubling the buffer each time
+        # so that large items are not decoded over and over again.
+        while (end < 0 or end == len(reader.buffer)) and not reader.done:
+            reader.more(len(reader.buffer) - reader.index)
+            try:
+                item, end = decoder.raw_decode(reader.buffer, reader.index)
+            except json.JSONDecodeError:
+                end = -1
+        if end < 0:
+            item, end = decoder.raw_decode(reader.buffer, reader.index)
+        reader.index = end
+        expect_item = False
+        yield item
+
+
 def get(dict_inst: Any, key_str: str) -> OneOf[Issue, Any]:
     """Return the value based on the `key_str` specified.
 
@@ -1,10 +1,23 @@
+import asyncio
 import shlex
 import subprocess as sub  # noqa: S404
-from subprocess import STDOUT, CalledProcessError  # noqa: S404
+from subprocess import (  # noqa: S404
+    DEVNULL,
+    PIPE,
+    STDOUT,
+    CalledProcessError,
+)
+from tempfile import TemporaryFile
+from typing import Callable, Iterable, Iterator, TypeVar
 
 from . import Issue, issue
 from .fp import Good, OneOf
 
+T = TypeVar('T')  # noqa: WPS111
+
+# Seconds given to each command run by `eval_cmds_concurrently`.
+CMD_TIMEOUT = 120
+
 
 def eval_cmd(cmd: str) -> OneOf[Issue, str]:
     """Evaluate a bash command and return its output.
@@ -27,6 +40,160 @@ def eval_cmd(cmd: str) -> OneOf[Issue, str]:
     return Good(out.strip())
 
 
+def eval_cmd_lines(
+    cmd: str,
+    consume: Callable[[Iterator[str]], T],
+) -> OneOf[Issue, T]:
+    """Evaluate a command and consume its output one line at a time.
+
+    Unlike `eval_cmd` the output is never held in memory, `consume` reads
+    the lines, without their line endings, while the command writes them.
+    The error output is kept apart in a temporary file and reported if the
+    command fails.
+
+    Args:
+        cmd: The shell command to evaluate.
+        consume: Function reading the lines of the output.
+
+    Returns:
+        The value returned by `consume` (or an Issue if the command failed).
+    """
+    command = shlex.split(cmd)
+    # a pipe would fill up and block the command while `consume` waits for
+    # more lines, the error output goes to a file instead
+    with TemporaryFile('w+', encoding='utf-8', errors='replace') as err_file:
+        try:
+            proc = sub.Popen(  # noqa: S603
+                command,
+                stdout=PIPE,
+                stderr=err_file,
+                encoding='utf-8',
+                errors='replace',
+            )
+        except OSError as ex:
+            return issue(
+                'unable to run command',
+                cause=ex,
+                context={'cmd': cmd},
+            )
+        with proc:
+            lines = proc.stdout or iter(())
+            consumed = consume(line.rstrip('\n') for line in lines)
+            # the lines left by `consume` are read so that the command ends
+            for _ in lines:
+                pass  # noqa: WPS420 - draining the pipe
+        err_file.seek(0)
+        err_output = err_file.read()
+    if proc.returncode:
+        return issue(
+            'command returned a non zero exit code',
+            context={'cmd': cmd, 'output': err_output},
+        )
+    return Good(consumed)
+
+
+async def eval_cmd_async(
+    cmd: str,
+    timeout: float = CMD_TIMEOUT,
+) -> OneOf[Issue, str]:
+    """Evaluate a command without blocking the event loop.
+
+    The standard and error outputs are captured separately. The command is
+    killed if it runs for longer than `timeout`.
+
+    Args:
+        cmd: The shell command to evaluate.
+        timeout: Seconds allowed for the command.
+
+    Returns:
+        The stripped standard output (or an Issue if the command failed).
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *shlex.split(cmd),
+            stdin=DEVNULL,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+    except OSError as ex:
+        return issue('unable to run command', cause=ex, context={'cmd': cmd})
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return issue('command timed out', context={
+            'cmd': cmd,
+            'timeout': timeout,
+        })
+    if proc.returncode:
+        return issue('command returned a non zero exit code', context={
+            'cmd': cmd,
+            'output': err.decode(errors='replace'),
+            'stdout': out.decode(errors='replace'),
+        })
+    return Good(out.decode(errors='replace').strip())
+
+
+async def eval_cmds_async(
+    cmds: Iterable[str],
+    limit: int = 4,
+    timeout: float = CMD_TIMEOUT,
+) -> list[OneOf[Issue, str]]:
+    """Run several `eval_cmd_async` commands.
+
+    Args:
+        cmds: The shell commands to evaluate.
+        limit: Max number of commands running at the same time.
+        timeout: Seconds allowed for each command.
+
+    Returns:
+        The results of the commands in the same order as the commands.
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _eval(cmd: str) -> OneOf[Issue, str]:
+        async with semaphore:
+            return await eval_cmd_async(cmd, timeout)
+
+    return list(await asyncio.gather(*[_eval(cmd) for cmd in cmds]))
+
+
+def eval_cmds_concurrently(
+    cmds: Iterable[str],
+    limit: int = 4,
+    timeout: float = CMD_TIMEOUT,
+) -> list[OneOf[Issue, str]]:
+    """Evaluate independent commands concurrently from synchronous code.
+
+    Only commands that do not depend on each other should be grouped, they
+    may run in any order.
+
+    The commands run in a new event loop. Coroutines cannot block the loop
+    they run in, they should await `eval_cmds_async` instead. Every command
+    is reported as an issue when called from a running loop.
+
+    Args:
+        cmds: The shell commands to evaluate.
+        limit: Max number of commands running at the same time.
+        timeout: Seconds allowed for each command.
+
+    Returns:
+        The results of the commands in the same order as the commands.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(eval_cmds_async(cmds, limit, timeout))
+    return [
+        issue('event loop already running', context={
+            'cmd': cmd,
+            'suggestion': 'await eval_cmds_async instead',
+        })
+        for cmd in cmds
+    ]
+
+
 def exec_pnpm(pnpm_args: list[str]) -> OneOf[Issue, None]:
     """Execute pnpm with the given arguments.
 
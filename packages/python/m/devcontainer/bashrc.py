@@ -1,14 +1,45 @@
 from textwrap import dedent
 
+# Asks `m devcontainer prompter --daemon` for the prompt through a fifo
+# when the daemon is running, otherwise runs `m devcontainer prompter`.
+# The reply fifo is created for each prompt so that a late reply is never
+# read by the next one, and removed once read. The request fifo is opened
+# for reading and writing so that it never blocks, even when the daemon
+# stopped reading it.
+_indented_prompter_snippet = """\
+    function prompter() {
+        local run_dir="${XDG_RUNTIME_DIR:-/tmp}"
+        local sock="${MDC_PROMPTER_SOCKET:-$run_dir/m-prompter-$UID.sock}"
+        local pid fd ps1
+        if [ -p "$sock.fifo" ] \\
+            && read -r pid 2>/dev/null < "$sock.pid" \\
+            && kill -0 "$pid" 2>/dev/null \\
+            && mkfifo -m 600 "$sock.$$" 2>/dev/null; then
+            exec {fd}<>"$sock.$$"
+            printf '%s\\t%s\\n' "$sock.$$" "$PWD" 1<>"$sock.fifo"
+            IFS= read -r -t 1 ps1 <&"$fd"
+            exec {fd}<&-
+            rm -f "$sock.$$"
+            if [ -n "$ps1" ]; then
+                export PS1="$ps1"
+                return
+            fi
+        fi
+        export PS1="$(m devcontainer prompter)"
+    }
+    export PROMPT_COMMAND=prompter
+    if [ "${MDC_PROMPTER_DAEMON:-false}" == 'true' ]; then
+        (m devcontainer prompter --daemon > /dev/null 2>&1 &)
+    fi
+"""
+
 _indented_snippet = """\
 if [ "${CI:-false}" == 'false' ]; then
     alias pnpm="m devcontainer pnpm"
     alias np="m devcontainer pnpm"
     alias cd='HOME=$MDC_WORKSPACE cd'
 
-    function prompter() { export PS1="$(m devcontainer prompter)"; }
-    export PROMPT_COMMAND=prompter
-fi
+""" + _indented_prompter_snippet + """fi
 
 export VIRTUAL_ENV="$MDC_VENV_WORKSPACE"
 if [ ! -d "$VIRTUAL_ENV" ]; then
@@ -24,9 +55,7 @@ if [ "${CI:-false}" == 'false' ]; then
     alias np="m devcontainer pnpm"
     alias cd='HOME=$MDC_WORKSPACE cd'
 
-    function prompter() { export PS1="$(m devcontainer prompter)"; }
-    export PROMPT_COMMAND=prompter
-fi
+""" + _indented_prompter_snippet + """fi
 
 export VIRTUAL_ENV="$MDC_UV_WORKSPACE"
 export UV_PROJECT_ENVIRONMENT="$VIRTUAL_ENV"
@@ -42,9 +71,7 @@ _indented_devex_snippet = """\
     alias np="m devcontainer pnpm"
     alias cd='HOME=$MDC_WORKSPACE cd'
 
-    function prompter() { export PS1="$(m devcontainer prompter)"; }
-    export PROMPT_COMMAND=prompter
-"""
+""" + _indented_prompter_snippet + """"""
 
 _indented_venv_snippet = """\
     export VIRTUAL_ENV="$MDC_VENV_WORKSPACE"
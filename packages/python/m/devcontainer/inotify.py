@@ -0,0 +1,154 @@
+"""Minimal bindings to the Linux inotify API.
+
+Only the calls needed to watch directories are provided. The library is
+loaded with `ctypes` so that no extra dependency is required.
+"""
+import ctypes
+import ctypes.util
+import os
+import struct
+from dataclasses import dataclass
+
+from m.core import Good, Issue, OneOf, issue
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+# The event queue overflowed, events were lost. Sent with the watch -1.
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Events that may change the output of `git status`.
+CHANGE_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+
+# struct inotify_event: wd, mask, cookie and the length of the name
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class InotifyEvent:
+    """A file system event."""
+
+    wd: int
+    mask: int
+    name: str
+
+
+def _parse_events(buffer: bytes) -> list[InotifyEvent]:
+    events = []
+    offset = 0
+    while offset < len(buffer):
+        wd, mask, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+        offset += _EVENT_HEADER.size
+        raw_name = buffer[offset:offset + name_len]
+        offset += name_len
+        name = raw_name.rstrip(b'\0').decode(errors='surrogateescape')
+        events.append(InotifyEvent(wd=wd, mask=mask, name=name))
+    return events
+
+
+class Inotify:
+    """An inotify instance.
+
+    usage::
+
+        inotify = Inotify.create().value
+        wd = inotify.add_watch('/some/dir', CHANGE_MASK).value
+        select.select([inotify], [], [])
+        events = inotify.read_events()
+    """
+
+    def __init__(self, libc: ctypes.CDLL, fd: int):
+        """Wrap an inotify file descriptor, use `Inotify.create` instead.
+
+        Args:
+            libc: The C library providing the inotify functions.
+            fd: The inotify file descriptor.
+        """
+        self._libc = libc
+        self._fd = fd
+
+    @classmethod
+    def create(cls) -> OneOf[Issue, 'Inotify']:
+        """Create a non blocking inotify instance.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the inotify instance.
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            return issue('inotify is not available')
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            return issue('inotify_init1 failure', cause=OSError(
+                errno,
+                os.strerror(errno),
+            ))
+        return Good(cls(libc, fd))
+
+    def fileno(self) -> int:
+        """Provide the file descriptor so that the instance can be selected.
+
+        Returns:
+            The inotify file descriptor.
+        """
+        return self._fd
+
+    def add_watch(self, path: str, mask: int) -> OneOf[Issue, int]:
+        """Watch a file or directory.
+
+        Args:
+            path: The path to watch.
+            mask: The events to report.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the watch descriptor.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            return issue(
+                'inotify_add_watch failure',
+                cause=OSError(errno, os.strerror(errno)),
+                context={'path': path},
+            )
+        return Good(wd)
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching, the kernel reports `IN_IGNORED` for the watch.
+
+        Args:
+            wd: The watch descriptor.
+        """
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self) -> list[InotifyEvent]:
+        """Read the queued events without blocking.
+
+        Returns:
+            The events, empty if none are queued.
+        """
+        try:
+            buffer = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+        return _parse_events(buffer)
+
+    def close(self) -> None:
+        """Close the inotify file descriptor along with its watches."""
+        os.close(self._fd)
@@ -4,7 +4,7 @@ from pathlib import Path
 from types import MappingProxyType
 
 from m.color.colors import color
-from m.core import Bad, subprocess
+from m.core import Res
 
 from m import git
 
@@ -40,12 +40,51 @@ STATUS_COLORS = MappingProxyType({
 })
 
 
-def _branch_display(current_branch: str) -> str:
-    # if the branch is HEAD, display the commit hash instead
-    if current_branch == 'HEAD':
-        short_res = subprocess.eval_cmd('git rev-parse --short HEAD')
-        return short_res.get_or_else(current_branch)
-    return current_branch
+def find_repo_root(cwd: Path) -> Path | None:
+    """Find the root of the repository containing a directory.
+
+    `.git` is a directory in a repository and a file in a worktree, git is
+    not called.
+
+    Args:
+        cwd: A directory, it does not need to exist.
+
+    Returns:
+        The closest directory containing `.git` or `None`.
+    """
+    for folder in (cwd, *cwd.parents):
+        if (folder / '.git').exists():
+            return folder
+    return None
+
+
+def prompt_status(git_status: git.GitStatus) -> tuple[str, str]:
+    """Obtain the information displayed in the prompt.
+
+    Detached heads are displayed with the abbreviated commit sha.
+
+    Args:
+        git_status: The status of the repository.
+
+    Returns:
+        The branch to display and a key of `STATUS_SYMBOLS`.
+    """
+    branch = git_status.branch
+    if branch == '(detached)':
+        branch = git_status.oid[:7] or 'HEAD'
+    return branch, git_status.label(check_stash=True)
+
+
+def read_status(repo_root: Path) -> Res[tuple[str, str]]:
+    """Run `git status` once in a repository.
+
+    Args:
+        repo_root: The root of the repository.
+
+    Returns:
+        A `OneOf` containing an `Issue` or the branch and status to display.
+    """
+    return git.get_status(str(repo_root)).map(prompt_status)
 
 
 def _branch_sec(branch: str, status: str) -> str:
@@ -55,11 +94,10 @@ def _branch_sec(branch: str, status: str) -> str:
     return COL(r'\[{gray}\][', branch_info, r'\[{gray}\]]')
 
 
-def _repo_info() -> tuple[str, str]:
-    repo_path = git.get_repo_path().get_or_else('[UNKNOWN_REPO_PATH]')
-    cwd = str(Path.cwd())
+def _repo_info(repo_root: Path, cwd: Path) -> tuple[str, str]:
+    repo_path = str(repo_root)
     repo = repo_path.split('/')[-1]
-    rel_path = cwd.replace(repo_path, '^', 1)
+    rel_path = str(cwd).replace(repo_path, '^', 1)
     return repo, rel_path
 
 
@@ -74,28 +112,56 @@ def _container_info() -> str:
     return name
 
 
-def _git_prompter(current_branch: str) -> str:
-    branch = _branch_display(current_branch)
-    status_res = git.get_status(check_stash=True)
-    status, _ = status_res.get_or_else((UNKNOWN, UNKNOWN))
+def _git_prompter(branch: str, status: str, repo_info: tuple[str, str]) -> str:
     status_color = STATUS_COLORS.get(status, UNKNOWN_COLOR)
     arrow = ''.join([r'\[', status_color, r'\]', '\u279C'])
     container_sec = COL(r'\[{green}\]', _container_info(), r'\[{white}\]:')
     branch_sec = _branch_sec(branch, status)
-    repo, rel_path = _repo_info()
+    repo, rel_path = repo_info
     repo_sec = COL(r'\[{blue}\]', repo)
     relpath_sec = COL(r'\[{gray}\]', rel_path)
     end = COL(r'\[{white}\]$')
     return f'{arrow} {container_sec}{repo_sec} {branch_sec} {relpath_sec}{end} '
 
 
+def plain_prompt() -> str:
+    """Prompt displayed outside of a git repository.
+
+    Returns:
+        The working directory prompt.
+    """
+    return COL(r'\[{orange}\]\w\[{end}\]$ ')
+
+
+def git_prompt(cwd: Path, repo_root: Path, status: tuple[str, str]) -> str:
+    """Prompt displayed inside a git repository.
+
+    Args:
+        cwd: The current directory.
+        repo_root: The root of the repository containing `cwd`.
+        status: The branch and status obtained with `read_status`.
+
+    Returns:
+        The string to be displayed in the prompt.
+    """
+    branch, status_key = status
+    return _git_prompter(branch, status_key, _repo_info(repo_root, cwd))
+
+
 def prompter() -> str:
     """Command line prompter.
 
+    Only one git process is started. The repository is found by looking
+    for `.git` in the current directory and its parents, outside of a
+    repository git is not called at all.
+
     Returns:
         The string to be displayed in the prompt.
     """
-    branch_res = git.get_branch()
-    if isinstance(branch_res, Bad):
-        return COL(r'\[{orange}\]\w\[{end}\]$ ')
-    return _git_prompter(branch_res.value)
+    cwd = Path.cwd()
+    repo_root = find_repo_root(cwd)
+    if repo_root is None:
+        return plain_prompt()
+    return read_status(repo_root).map(
+        partial(git_prompt, cwd, repo_root),
+    ).get_or_else(plain_prompt)
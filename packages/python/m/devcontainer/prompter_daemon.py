@@ -0,0 +1,505 @@
+"""Serve shell prompts from a long running process.
+
+Running `m` on every prompt pays for the interpreter startup. The daemon
+started with `m devcontainer prompter --daemon` keeps the git status of
+each repository in memory instead. Entries are invalidated by inotify
+events in the git directory and in the worktree. Once the events stop for
+`debounce` seconds the status is refreshed so that the next prompt is
+answered from memory.
+
+Prompts are requested with:
+
+- the unix socket: send the directory followed by a new line, the prompt is
+  sent back followed by a new line. See `request_prompt`.
+- the `<socket>.fifo` fifo: write `<reply fifo>\\t<directory>\\n` and read
+  the prompt from the reply fifo. This is used by the bash prompt since bash
+  cannot connect to unix sockets.
+"""
+import os
+import select
+import shlex
+import signal
+import socket
+import socketserver
+import stat
+import threading
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from m.core import Bad, Good, Res, issue, one_of, subprocess
+from m.core import rw as mio
+
+from .inotify import (
+    CHANGE_MASK,
+    IN_CREATE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    Inotify,
+    InotifyEvent,
+)
+from .prompter import (
+    find_repo_root,
+    git_prompt,
+    plain_prompt,
+    prompter,
+    read_status,
+)
+
+# Seconds without file system events before refreshing a status.
+DEBOUNCE = 0.1
+
+# Repositories kept in memory, the least recently used is dropped first.
+MAX_REPOS = 32
+
+# Seconds a client waits for the daemon.
+CLIENT_TIMEOUT = 0.5
+
+LS_FILES_CMD = ' '.join([
+    'git -C {repo} ls-files -z',
+    '--cached --others --exclude-standard --directory',
+])
+
+
+def default_socket_path() -> str:
+    """Find the path to the unix socket of the daemon.
+
+    Returns:
+        `MDC_PROMPTER_SOCKET` or a per user socket in `XDG_RUNTIME_DIR`,
+        `/tmp` when it is not set.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'  # noqa: S108
+    default = f'{runtime_dir}/m-prompter-{os.getuid()}.sock'
+    return os.environ.get('MDC_PROMPTER_SOCKET') or default
+
+
+@dataclass
+class _Repo:
+    """The cached status of a repository and its watches."""
+
+    root: Path
+    wds: set[int] = field(default_factory=set)
+    watched: bool = False
+    rescan: bool = False
+    generation: int = 0
+    status: tuple[str, str] | None = None
+    status_generation: int = -1
+    changed_at: float | None = None
+
+
+@dataclass
+class _Watch:
+    """A watched directory, nested repositories may share directories."""
+
+    path: Path
+    roots: set[Path] = field(default_factory=set)
+
+
+def _git_dirs(root: Path) -> Res[tuple[Path, Path]]:
+    git_path = root / '.git'
+    if git_path.is_dir():
+        return Good((git_path, git_path))
+    # worktrees and submodules point to their git directory
+    try:
+        gitdir_line = git_path.read_text().strip()
+        git_dir = root / gitdir_line.removeprefix('gitdir:').strip()
+        common_file = git_dir / 'commondir'
+        common = common_file.read_text().strip() if common_file.exists() else ''
+    except OSError as ex:
+        return issue('unable to read .git', cause=ex)
+    return Good((git_dir, (git_dir / common).resolve()))
+
+
+def _parent_dirs(root: Path, ls_files: str) -> set[Path]:
+    dirs = {root}
+    for entry in ls_files.split('\0'):
+        if not entry:
+            continue
+        # untracked directories are listed with a trailing slash
+        folder = root / entry if entry.endswith('/') else (root / entry).parent
+        while folder not in dirs:
+            dirs.add(folder)
+            folder = folder.parent
+    return dirs
+
+
+def _watched_dirs(root: Path) -> Res[list[Path]]:
+    cmd = LS_FILES_CMD.format(repo=shlex.quote(str(root)))
+    return one_of(lambda: [
+        [
+            *worktree,
+            git_dir,
+            common_dir,
+            *(Path(refs) for refs, _, _ in os.walk(common_dir / 'refs')),
+        ]
+        for git_dir, common_dir in _git_dirs(root)
+        for worktree in subprocess.eval_cmd(cmd).map(
+            lambda ls_files: _parent_dirs(root, ls_files),
+        )
+    ])
+
+
+class PromptDaemon:  # noqa: WPS214 - watch, cache and serve
+    """Cache the git status of repositories until they change.
+
+    usage::
+
+        daemon = PromptDaemon(Inotify.create().value)
+        daemon.serve_forever('/tmp/m-prompter.sock')
+
+    The status of a repository is trusted only while all of its
+    directories are watched. Otherwise `git status` runs on every request.
+    """
+
+    def __init__(
+        self,
+        inotify: Inotify,
+        debounce: float = DEBOUNCE,
+        max_repos: int = MAX_REPOS,
+    ):
+        """Initialize the cache, no directory is watched until requested.
+
+        Args:
+            inotify: The inotify instance used to watch the repositories.
+            debounce: Seconds without events before refreshing a status.
+            max_repos: Number of repositories kept in memory.
+        """
+        self.inotify = inotify
+        self.debounce = debounce
+        self.max_repos = max_repos
+        self._repos: dict[Path, _Repo] = {}
+        self._watches: dict[int, _Watch] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wake_read, self._wake_write = os.pipe()
+
+    def prompt(self, cwd: str) -> str:
+        """Create the prompt for a directory.
+
+        Args:
+            cwd: The working directory of the shell.
+
+        Returns:
+            The string to be displayed in the prompt.
+        """
+        directory = Path(cwd)
+        repo_root = find_repo_root(directory)
+        if repo_root is None:
+            return plain_prompt()
+        status = self.status(repo_root)
+        if status is None:
+            return plain_prompt()
+        return git_prompt(directory, repo_root, status)
+
+    def status(self, repo_root: Path) -> tuple[str, str] | None:
+        """Obtain the status of a repository, from memory when possible.
+
+        Args:
+            repo_root: The root of the repository.
+
+        Returns:
+            The branch and status, `None` if `git status` failed.
+        """
+        with self._lock:
+            repo = self._use_repo(repo_root)
+            if repo.rescan:
+                self._watch(repo)
+            if repo.watched and repo.status_generation == repo.generation:
+                return repo.status
+            generation = repo.generation
+        status_res = read_status(repo_root)
+        if isinstance(status_res, Bad):
+            return None
+        with self._lock:
+            repo.status = status_res.value
+            repo.status_generation = generation
+        return status_res.value
+
+    def handle_events(self, now: float) -> None:
+        """Invalidate the repositories changed by the queued events.
+
+        Args:
+            now: The monotonic time of the events.
+        """
+        events = self.inotify.read_events()
+        with self._lock:
+            for event in events:
+                self._handle_event(event, now)
+
+    def refresh(self, now: float) -> float | None:
+        """Refresh the statuses of the repositories done changing.
+
+        Args:
+            now: The current monotonic time.
+
+        Returns:
+            Seconds until the next refresh or `None` if none is pending.
+        """
+        with self._lock:
+            due = []
+            waits = []
+            for repo in self._repos.values():
+                if repo.changed_at is None:
+                    continue
+                wait = repo.changed_at + self.debounce - now
+                if wait > 0:
+                    waits.append(wait)
+                else:
+                    repo.changed_at = None
+                    due.append(repo.root)
+        for repo_root in due:
+            self.status(repo_root)
+        return min(waits, default=None)
+
+    def serve_forever(self, socket_path: str) -> None:
+        """Answer prompt requests until `shutdown` is called.
+
+        Args:
+            socket_path: The path to the unix socket. The fifo is created
+                next to it with the `.fifo` extension.
+        """
+        server = _PromptServer(socket_path, self)
+        fifo_path = f'{socket_path}.fifo'
+        os.chmod(socket_path, stat.S_IRUSR | stat.S_IWUSR)
+        os.mkfifo(fifo_path, stat.S_IRUSR | stat.S_IWUSR)
+        threads = [
+            threading.Thread(target=server.serve_forever, daemon=True),
+            threading.Thread(
+                target=self._serve_fifo,
+                args=(fifo_path,),
+                daemon=True,
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            self._watch_loop()
+        finally:
+            self._stopped.set()
+            server.shutdown()
+            server.server_close()
+            _write_nonblocking(fifo_path, b'\n')
+            for thread in threads:
+                thread.join()
+
+    def shutdown(self) -> None:
+        """Stop `serve_forever`, may be called from any thread."""
+        self._stopped.set()
+        os.write(self._wake_write, b'\0')
+
+    def _watch_loop(self) -> None:
+        timeout = None
+        while not self._stopped.is_set():
+            readable, _, _ = select.select(
+                [self.inotify, self._wake_read],
+                [],
+                [],
+                timeout,
+            )
+            now = time.monotonic()
+            if self.inotify in readable:
+                self.handle_events(now)
+            timeout = self.refresh(now)
+
+    def _serve_fifo(self, fifo_path: str) -> None:
+        # opened for writing as well so that it never reaches EOF
+        fd = os.open(fifo_path, os.O_RDWR)
+        with os.fdopen(fd, 'rb') as fifo:
+            while not self._stopped.is_set():
+                reply_path, _, cwd = fifo.readline().partition(b'\t')
+                if cwd:
+                    prompt = self.prompt(os.fsdecode(cwd.rstrip(b'\n')))
+                    _write_reply(os.fsdecode(reply_path), prompt)
+
+    def _use_repo(self, repo_root: Path) -> _Repo:
+        repo = self._repos.pop(repo_root, None)
+        if repo is None:
+            repo = _Repo(root=repo_root)
+            self._watch(repo)
+        # dicts keep the insertion order, the last one is the most recent
+        self._repos[repo_root] = repo
+        if len(self._repos) > self.max_repos:
+            self._unwatch(self._repos.pop(next(iter(self._repos))))
+        return repo
+
+    def _watch(self, repo: _Repo) -> None:
+        repo.rescan = False
+        dirs_res = _watched_dirs(repo.root)
+        if isinstance(dirs_res, Bad):
+            self._unwatch(repo)
+            return
+        for folder in dirs_res.value:
+            wd_res = self.inotify.add_watch(str(folder), CHANGE_MASK)
+            if isinstance(wd_res, Bad):
+                if isinstance(wd_res.value.cause, FileNotFoundError):
+                    # removed after listing it, the parent reports it
+                    continue
+                self._unwatch(repo)
+                return
+            repo.wds.add(wd_res.value)
+            watch = self._watches.setdefault(wd_res.value, _Watch(folder))
+            watch.roots.add(repo.root)
+        repo.watched = True
+
+    def _unwatch(self, repo: _Repo) -> None:
+        repo.watched = False
+        for wd in repo.wds:
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            watch.roots.discard(repo.root)
+            if not watch.roots:
+                del self._watches[wd]  # noqa: WPS420 - drop the watch
+                self.inotify.rm_watch(wd)
+        repo.wds.clear()
+
+    def _handle_event(self, event: InotifyEvent, now: float) -> None:
+        if event.mask & IN_Q_OVERFLOW:
+            # events were dropped, no cached status can be trusted
+            for repo in self._repos.values():
+                repo.generation += 1
+                repo.changed_at = now
+                repo.rescan = True
+            return
+        watch = self._watches.get(event.wd)
+        if watch is None:
+            return
+        if event.mask & IN_IGNORED:
+            # the directory was removed, its parent reported the change
+            del self._watches[event.wd]  # noqa: WPS420 - drop the watch
+            for repo_root in watch.roots:
+                self._repos[repo_root].wds.discard(event.wd)
+            return
+        if event.name.endswith('.lock'):
+            # git renames the lock files once done writing
+            return
+        created = event.mask & (IN_CREATE | IN_MOVED_TO)
+        new_dir = bool(created and event.mask & IN_ISDIR)
+        for repo_root in watch.roots:
+            repo = self._repos[repo_root]
+            repo.generation += 1
+            repo.changed_at = now
+            # new directories are watched before the next `git status` runs,
+            # unless ignored by git
+            repo.rescan = repo.rescan or new_dir
+
+
+class _PromptHandler(socketserver.StreamRequestHandler):
+    server: '_PromptServer'
+
+    def handle(self) -> None:
+        cwd = os.fsdecode(self.rfile.readline().rstrip(b'\n'))
+        prompt = self.server.prompt_daemon.prompt(cwd)
+        self.wfile.write(f'{prompt}\n'.encode())
+
+
+class _PromptServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, prompt_daemon: PromptDaemon):
+        self.prompt_daemon = prompt_daemon
+        super().__init__(socket_path, _PromptHandler)
+
+
+def _write_nonblocking(path: str, payload: bytes) -> None:
+    # fails instead of blocking when nobody is reading
+    with suppress(OSError):
+        fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+
+def _write_reply(reply_path: str, prompt: str) -> None:
+    with suppress(OSError):
+        if stat.S_ISFIFO(os.stat(reply_path).st_mode):
+            _write_nonblocking(reply_path, f'{prompt}\n'.encode())
+
+
+def request_prompt(
+    socket_path: str,
+    cwd: str,
+    timeout: float = CLIENT_TIMEOUT,
+) -> Res[str]:
+    """Ask the daemon for the prompt of a directory.
+
+    Args:
+        socket_path: The path to the unix socket of the daemon.
+        cwd: The working directory of the shell.
+        timeout: Seconds to wait for the daemon.
+
+    Returns:
+        A `OneOf` containing an `Issue` or the prompt.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(os.fsencode(cwd) + b'\n')
+            with client.makefile('rb') as reader:
+                line = reader.readline()
+    except OSError as ex:
+        return issue('prompter daemon unavailable', cause=ex)
+    if not line.endswith(b'\n'):
+        return issue('incomplete prompter daemon response')
+    return Good(line.decode().rstrip('\n'))
+
+
+def daemon_prompter(socket_path: str) -> str:
+    """Ask the daemon for the prompt, `prompter` is used if it is not running.
+
+    Args:
+        socket_path: The path to the unix socket of the daemon.
+
+    Returns:
+        The string to be displayed in the prompt.
+    """
+    if not Path(socket_path).exists():
+        return prompter()
+    return request_prompt(socket_path, str(Path.cwd())).get_or_else(prompter)
+
+
+def _remove_files(socket_path: str) -> None:
+    for path in (socket_path, f'{socket_path}.fifo', f'{socket_path}.pid'):
+        Path(path).unlink(missing_ok=True)
+
+
+def run_daemon(socket_path: str, debounce: float = DEBOUNCE) -> Res[None]:
+    """Run the prompter daemon until interrupted.
+
+    Args:
+        socket_path: The path to the unix socket.
+        debounce: Seconds without events before refreshing a status.
+
+    Returns:
+        A `OneOf` containing an `Issue` or `None` once the daemon stops.
+    """
+    running = Path(socket_path).exists() and not request_prompt(
+        socket_path,
+        '/',
+    ).is_bad
+    if running:
+        return issue('prompter daemon already running', context={
+            'socket': socket_path,
+        })
+    inotify_res = Inotify.create()
+    if isinstance(inotify_res, Bad):
+        return Bad(inotify_res.value)
+    _remove_files(socket_path)
+    pid_res = mio.write_file(f'{socket_path}.pid', f'{os.getpid()}\n')
+    if isinstance(pid_res, Bad):
+        return Bad(pid_res.value)
+    daemon = PromptDaemon(inotify_res.value, debounce)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.shutdown())
+    try:
+        daemon.serve_forever(socket_path)
+    except KeyboardInterrupt:
+        pass  # noqa: WPS420 - stopping the daemon is the expected way out
+    finally:
+        inotify_res.value.close()
+        _remove_files(socket_path)
+    return Good(None)
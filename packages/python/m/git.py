@@ -1,44 +1,334 @@
+import shlex
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Callable, Iterable
+
 from m.core import Bad, Good, Res, hone, one_of, subprocess
 
+# The optional locks are skipped so that reading the status never competes
+# with other git commands for the index lock.
+STATUS_ARGS = '--no-optional-locks status --porcelain=v2 --branch --show-stash'
+# The sha and then the branch of the current commit.
+HEAD_CMD = 'git rev-parse HEAD --abbrev-ref HEAD'
+
+
+@dataclass
+class GitStatus:  # noqa: WPS230 - mirrors the porcelain v2 output
+    """The status of a repository.
+
+    Obtained from the output of `git status --porcelain=v2 --branch
+    --show-stash`, which does not depend on the locale.
+    """
+
+    branch: str = 'HEAD'
+    oid: str = ''
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+    staged: int = 0
+    unstaged: int = 0
+    untracked: int = 0
+    conflicted: int = 0
+    stash: int = 0
+
+    @property
+    def has_stash(self) -> bool:
+        """Check if there are stashed changes.
+
+        Returns:
+            True if the stash has at least one entry.
+        """
+        return self.stash > 0
+
+    @property
+    def has_changes(self) -> bool:
+        """Check if the worktree or the index have changes.
+
+        Returns:
+            True if there are staged, unstaged, untracked or conflicted files.
+        """
+        changes = (self.staged, self.unstaged, self.untracked, self.conflicted)
+        return any(changes)
+
+    @property
+    def description(self) -> str:
+        """Describe the status with its counts.
+
+        Returns:
+            A comma separated summary, `clean` if there is nothing to report.
+        """
+        counts = [
+            ('ahead', self.ahead),
+            ('behind', self.behind),
+            ('staged', self.staged),
+            ('unstaged', self.unstaged),
+            ('untracked', self.untracked),
+            ('conflicted', self.conflicted),
+            ('stashed', self.stash),
+        ]
+        summary = [f'{count} {name}' for name, count in counts if count]
+        return ', '.join(summary) or 'clean'
+
+    def label(self, *, check_stash: bool = False) -> str:
+        """Summarize the status in one word.
+
+        The first of `stash`, `untracked`, `diverged`, `ahead`, `behind`,
+        `staged` and `dirty` that applies is returned, `clean` otherwise.
+
+        Args:
+            check_stash: Report stashed changes, they are not part of the
+                worktree.
+
+        Returns:
+            A word describing the status.
+        """
+        labels = (
+            ('stash', check_stash and self.has_stash),
+            ('untracked', self.untracked),
+            ('diverged', self.ahead and self.behind),
+            ('ahead', self.ahead),
+            ('behind', self.behind),
+            ('staged', self.staged),
+            ('dirty', self.unstaged or self.conflicted),
+        )
+        return next((name for name, applies in labels if applies), 'clean')
+
+
+def _parse_header(status: GitStatus, line: str) -> None:
+    key, _, header_value = line[2:].partition(' ')
+    if key == 'branch.oid':
+        status.oid = header_value
+    elif key == 'branch.head':
+        status.branch = header_value
+    elif key == 'branch.upstream':
+        status.upstream = header_value
+    elif key == 'branch.ab':
+        ahead, _, behind = header_value.partition(' ')
+        status.ahead = int(ahead)
+        status.behind = -int(behind)
+    elif key == 'stash':
+        status.stash = int(header_value)
+
+
+def parse_status(lines: Iterable[str]) -> GitStatus:
+    """Parse the output of `git status --porcelain=v2 --branch --show-stash`.
+
+    The lines are read one at a time and only counted.
+
+    Args:
+        lines: The lines of the output.
+
+    Returns:
+        The status of the repository.
+    """
+    status = GitStatus()
+    for line in lines:
+        kind = line[:1]
+        if kind == '#':
+            _parse_header(status, line)
+        elif kind == '?':
+            status.untracked += 1
+        elif kind in {'1', '2'}:
+            # the XY field: X is the staged state, Y the worktree state
+            status.staged += line[2] != '.'
+            status.unstaged += line[3] != '.'
+        elif kind == 'u':
+            status.conflicted += 1
+    return status
+
+
+class GitSession:
+    """Answer repeated git queries without starting a process each time.
+
+    The sha and the branch of the current commit are read together with a
+    single `git rev-parse`, or taken from the status when it was read during
+    the session. Answers that do not change, such as the first commit sha,
+    are kept for the whole session. The head and the status are snapshots:
+    they are dropped by `invalidate`, which the functions modifying the
+    repository call when given a session.
+
+    usage::
+
+        with GitSession() as session:
+            branch = get_branch(session=session)
+            sha = get_current_commit_sha(session=session)
+    """
 
-def get_branch() -> Res[str]:
+    def __init__(self) -> None:
+        """Initialize an empty session, git runs when needed."""
+        self._head: tuple[str, str] | None = None
+        self._status: GitStatus | None = None
+        self._cache: dict[str, str] = {}
+
+    def __enter__(self) -> 'GitSession':
+        """Use the session as a context manager.
+
+        Returns:
+            The session.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the session.
+
+        Args:
+            exc_type: The type of the exception raised in the block.
+            exc_value: The exception raised in the block.
+            traceback: The traceback of the exception.
+        """
+        self.close()
+
+    def head(self) -> Res[tuple[str, str]]:
+        """Read the sha and the branch of the current commit.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the sha and the branch name,
+            `HEAD` when detached.
+        """
+        if self._head is not None:
+            return Good(self._head)
+        return subprocess.eval_cmd(HEAD_CMD).map(self._store_head)
+
+    def status(self) -> GitStatus | None:
+        """Provide the status stored by `get_status`.
+
+        Returns:
+            The status of the repository if it was read during the session.
+        """
+        return self._status
+
+    def store_status(self, git_status: GitStatus) -> GitStatus:
+        """Keep a status until the session is invalidated.
+
+        Args:
+            git_status: The status of the repository.
+
+        Returns:
+            The same status.
+        """
+        self._status = git_status
+        return git_status
+
+    def branch(self) -> Res[str]:
+        """Find the current branch.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the branch name, `HEAD` when
+            detached.
+        """
+        if self._status:
+            branch = self._status.branch
+            return Good('HEAD' if branch == '(detached)' else branch)
+        return self.head().map(lambda head: head[1])
+
+    def head_sha(self) -> Res[str]:
+        """Find the sha of the current commit.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the sha.
+        """
+        if self._status and self._status.oid not in {'', '(initial)'}:
+            return Good(self._status.oid)
+        return self.head().map(lambda head: head[0])
+
+    def remember(self, key: str, compute: Callable[[], Res[str]]) -> Res[str]:
+        """Compute an answer once for the whole session.
+
+        Issues are not remembered.
+
+        Args:
+            key: The name of the answer.
+            compute: The function computing the answer.
+
+        Returns:
+            A `OneOf` containing an `Issue` or the answer.
+        """
+        if key in self._cache:
+            return Good(self._cache[key])
+        res = compute()
+        if isinstance(res, Good):
+            self._cache[key] = res.value
+        return res
+
+    def invalidate(self) -> None:
+        """Drop the head and the status after the repository changes."""
+        self._head = None
+        self._status = None
+
+    def close(self) -> None:
+        """Forget every answer of the session."""
+        self.invalidate()
+        self._cache.clear()
+
+    def _store_head(self, output: str) -> tuple[str, str]:
+        sha, _, branch = output.strip().partition('\n')
+        self._head = (sha, branch)
+        return self._head
+
+
+def _invalidate(session: GitSession | None) -> None:
+    if session:
+        session.invalidate()
+
+
+def get_branch(*, session: GitSession | None = None) -> Res[str]:
     """Get the current git branch name.
 
+    Args:
+        session: Answer from the session instead of running git.
+
     Returns:
         A `OneOf` containing an `Issue` or a string specifying the branch.
     """
+    if session:
+        return session.branch()
     return subprocess.eval_cmd('git rev-parse --abbrev-ref HEAD')
 
 
-def stage_all() -> Res[str]:
+def stage_all(*, session: GitSession | None = None) -> Res[str]:
     """Stage the current changes in the branch.
 
+    Args:
+        session: A session to invalidate.
+
     Returns:
         A `OneOf` containing an `Issue` or the response from `git add .`.
     """
+    _invalidate(session)
     res = subprocess.eval_cmd('git add .')
     return res.flat_map_bad(hone('git add failure'))
 
 
-def commit(msg: str) -> Res[str]:
+def commit(msg: str, *, session: GitSession | None = None) -> Res[str]:
     """Create a commit.
 
     Args:
         msg: commit description.
+        session: A session to invalidate.
 
     Returns:
         A `OneOf` containing an `Issue` or the response from the git command.
     """
+    _invalidate(session)
     res = subprocess.eval_cmd(f'git commit -m "{msg}"')
     return res.flat_map_bad(hone('git commit failure'))
 
 
-def pull() -> Res[str]:
+def pull(*, session: GitSession | None = None) -> Res[str]:
     """Pull branch.
 
+    Args:
+        session: A session to invalidate.
+
     Returns:
         A `OneOf` containing an `Issue` or the response from the git command.
     """
+    _invalidate(session)
     res = subprocess.eval_cmd('git pull')
     return res.flat_map_bad(hone('git pull failure'))
 
@@ -56,73 +346,108 @@ def push_branch(branch: str) -> Res[str]:
     return res.flat_map_bad(hone('git push failure'))
 
 
-def stash() -> Res[str]:
+def stash(*, session: GitSession | None = None) -> Res[str]:
     """Stash the current changes in the branch.
 
+    Args:
+        session: A session to invalidate.
+
     Returns:
         A `OneOf` containing an `Issue` or the response from `git stash`.
     """
+    _invalidate(session)
     return subprocess.eval_cmd('git stash')
 
 
-def stash_pop() -> Res[str]:
+def stash_pop(*, session: GitSession | None = None) -> Res[str]:
     """Pop the changes stored in the git stash.
 
+    Args:
+        session: A session to invalidate.
+
     Returns:
         A `OneOf` containing an `Issue` or the response from `git stash pop`.
     """
+    _invalidate(session)
     return subprocess.eval_cmd('git stash pop')
 
 
-def checkout_branch(branch: str, create: bool = True) -> Res[str]:
+def checkout_branch(
+    branch: str,
+    create: bool = True,
+    *,
+    session: GitSession | None = None,
+) -> Res[str]:
     """Checkout a branch.
 
     Args:
         branch: name of branch to checkout
         create: create new branch
+        session: A session to invalidate.
 
     Returns:
         A `OneOf` containing an `Issue` of the git response.
     """
+    _invalidate(session)
     opt = '-b' if create else ''
     res = subprocess.eval_cmd(f'git checkout {opt} {branch}')
     return res.flat_map_bad(hone('git checkout failure'))
 
 
-def get_first_commit_sha() -> Res[str]:
+def _eval_remembered(cmd: str, session: GitSession | None) -> Res[str]:
+    if session:
+        return session.remember(cmd, lambda: subprocess.eval_cmd(cmd))
+    return subprocess.eval_cmd(cmd)
+
+
+def get_first_commit_sha(*, session: GitSession | None = None) -> Res[str]:
     """Find the first commit sha in the repository.
 
+    Args:
+        session: Remember the sha for the rest of the session.
+
     Returns:
         A `OneOf` containing an `Issue` or a string of the first commit sha.
     """
-    return subprocess.eval_cmd('git rev-list --max-parents=0 HEAD')
+    return _eval_remembered('git rev-list --max-parents=0 HEAD', session)
 
 
-def get_current_commit_sha() -> Res[str]:
+def get_current_commit_sha(*, session: GitSession | None = None) -> Res[str]:
     """Find the sha of the current commit.
 
+    Args:
+        session: Answer from the session instead of running git.
+
     Returns:
         A `OneOf` containing an `Issue` or a string of the current commit sha.
     """
+    if session:
+        return session.head_sha()
     return subprocess.eval_cmd('git rev-parse HEAD')
 
 
-def get_repo_path() -> Res[str]:
+def get_repo_path(*, session: GitSession | None = None) -> Res[str]:
     """Get the absolute path to the repository.
 
+    Args:
+        session: Remember the path for the rest of the session.
+
     Returns:
         An issue or a string of the path to the repo.
     """
-    return subprocess.eval_cmd('git rev-parse --show-toplevel')
+    return _eval_remembered('git rev-parse --show-toplevel', session)
 
 
-def get_remote_url() -> Res[str]:
+def get_remote_url(*, session: GitSession | None = None) -> Res[str]:
     """Find the remote url of the repo.
 
+    Args:
+        session: Remember the url for the rest of the session.
+
     Returns:
         A `OneOf` containing an `Issue` or a string with the url.
     """
-    return subprocess.eval_cmd('git config --get remote.origin.url')
+    return _eval_remembered('git config --get remote.origin.url', session)
 
 
 def get_commits(
@@ -146,48 +471,32 @@ def get_commits(
     return subprocess.eval_cmd(cmd).map(lambda out: out.splitlines())
 
 
-def _extract_status(msg: str) -> tuple[str, str]:
-    matches = [
-        ('Untracked files', 'untracked'),
-        ('Your branch is ahead', 'ahead'),
-        ('Your branch is behind', 'behind'),
-        ('working tree clean', 'clean'),
-        ('Changes to be committed', 'staged'),
-        ('Changed but not updated', 'dirty'),
-        ('Changes not staged', 'dirty'),
-        ('Unmerged paths', 'dirty'),
-        ('diverged', 'diverged'),
-    ]
-    for substr, key in matches:
-        if substr in msg:
-            return key, substr
-    return 'unknown', 'unknown'
-
-
-def get_status(*, check_stash: bool = False) -> Res[tuple[str, str]]:
+def get_status(
+    repo_path: str | None = None,
+    *,
+    session: GitSession | None = None,
+) -> Res[GitStatus]:
     """Find the current git status.
 
-    Note that checking for stashed changes is not part of the regular git
-    status. To opt in you must set `check_stash=True`.
+    The output of `git status` is parsed while it is being read.
 
     Args:
-        check_stash: Check if there are any stashed changes.
+        repo_path: Directory of the repository, defaults to the current one.
+        session: Reuse the status read during the session and keep it for
+            the next queries. Only for the current repository.
 
     Returns:
-        A `OneOf` containing an `Issue` or a word denoting the git status.
+        A `OneOf` containing an `Issue` or the status of the repository.
     """
-    res = subprocess.eval_cmd('git status')
-    if check_stash:
-        stash_files = subprocess.eval_cmd('git stash show').get_or_else('')
-        has_untracked = res.get_or_else('').startswith('Untracked files')
-        if not has_untracked and stash_files:
-            return Good(('stash', 'stash'))
-    return one_of(
-        lambda: [
-            _extract_status(msg)
-            for msg in res
-        ],
-    )
+    session_status = session.status() if session else None
+    if session_status:
+        return Good(session_status)
+    repo_opt = f'-C {shlex.quote(repo_path)} ' if repo_path else ''
+    cmd = f'git {repo_opt}{STATUS_ARGS}'
+    res = subprocess.eval_cmd_lines(cmd, parse_status)
+    if session:
+        return res.map(session.store_status)
+    return res
 
 
 def raw_status() -> Res[str]:
@@ -243,6 +552,69 @@ def remove_git_tag(tag: str) -> Res[str]:
     ])
 
 
+def _eval_stage(cmds: list[str]) -> Res[list[str]]:
+    if not cmds:
+        return Good([])
+    outputs: list[str] = []
+    for cmd_result in subprocess.eval_cmds_concurrently(cmds):
+        if isinstance(cmd_result, Bad):
+            return Bad(cmd_result.value)
+        outputs.append(cmd_result.value)
+    return Good(outputs)
+
+
+def _join_tag_outputs(
+    tags: list[str],
+    removed: dict[str, tuple[str, str]],
+    created: list[str],
+    pushed: list[str],
+) -> str:
+    lines: list[str] = []
+    for tag, local, remote in zip(tags, created, pushed):
+        lines.extend(removed.get(tag, ()))
+        lines.extend([local, remote])
+    return '\n'.join(lines)
+
+
+def update_git_tags(
+    tags: list[str],
+    sha: str,
+    remote_tags: list[str],
+) -> Res[str]:
+    """Create or move several git tags.
+
+    The tags do not depend on each other so each step of `update_git_tag`
+    runs for all the tags at once: fetching the tags to move, removing them
+    locally, removing them remotely, creating them locally and pushing them.
+    A step only starts once the previous one succeeded for every tag.
+
+    Args:
+        tags: The tags to set.
+        sha: The commit sha to set the tags to.
+        remote_tags: The list of remote tags.
+
+    Returns:
+        A `OneOf` containing an `Issue` or the responses from the git commands.
+    """
+    moved = [tag for tag in tags if tag in remote_tags]
+    refs = [f'refs/tags/{tag}' for tag in moved]
+    return one_of(lambda: [
+        _join_tag_outputs(
+            tags,
+            dict(zip(moved, zip(local_removed, remote_removed))),
+            created,
+            pushed,
+        )
+        for _ in _eval_stage([f'git fetch origin +{ref}:{ref}' for ref in refs])
+        for local_removed in _eval_stage([f'git tag -d {tag}' for tag in moved])
+        for remote_removed in _eval_stage([
+            f'git push origin :{ref}' for ref in refs
+        ])
+        for created in _eval_stage([f'git tag {tag} {sha}' for tag in tags])
+        for pushed in _eval_stage([f'git push origin {tag}' for tag in tags])
+    ])
+
+
 def update_git_tag(
     tag: str,
     sha: str,
@@ -267,23 +639,14 @@ def update_git_tag(
     """
     if skip:
         return Good(f'skipping {tag}')
-    removal_output = ''
-    if tag in remote_tags:
-        removal_res = remove_git_tag(tag)
-        if isinstance(removal_res, Bad):
-            return Bad(removal_res.value)
-        removal_output = f'{removal_res.value}\n'
-    return one_of(lambda: [
-        f'{removal_output}{local}\n{remote}'
-        for local in subprocess.eval_cmd(f'git tag {tag} {sha}')
-        for remote in subprocess.eval_cmd(f'git push origin {tag}')
-    ])
+    return update_git_tags([tag], sha, remote_tags)
 
 
 def tag_release(version: str, sha: str, *, major_only: bool) -> Res[str]:
     """Create a git tags for a release.
 
     This is done to keep a major and minor versions tags pointing to the latest.
+    Both tags are updated with `update_git_tags`.
 
     Args:
         version: The version to tag.
@@ -299,14 +662,10 @@ def tag_release(version: str, sha: str, *, major_only: bool) -> Res[str]:
     major_tag = f'v{major}'
     minor_tag = f'v{major}.{minor}'
 
+    tags = [major_tag] if major_only else [major_tag, minor_tag]
+    skipped = [f'skipping {minor_tag}'] if major_only else []
     return one_of(lambda: [
-        '\n'.join([major_out, minor_out])
+        '\n'.join([tags_out, *skipped])
         for all_tags in list_tags(f'v{major}*')
-        for major_out in update_git_tag(major_tag, sha, list(all_tags))
-        for minor_out in update_git_tag(
-            minor_tag,
-            sha,
-            list(all_tags),
-            skip=major_only,
-        )
+        for tags_out in update_git_tags(tags, sha, list(all_tags))
     ])
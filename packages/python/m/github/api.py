@@ -1,13 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional
+from functools import partial
+from typing import Any, Optional, Sequence
 
-from m.core import Res, http
+from m.core import Bad, Good, Res, http, issue
 from pydantic import BaseModel
 
 from .request import request
 
 HttpMethod = http.HttpMethod
 
+# Number of statuses sent at once by `commit_statuses`. It matches the idle
+# connections kept by the connection pool so that they are all reused.
+STATUS_CONCURRENCY = 4
+
 
 def _repos(owner: str, repo: str, *endpoint: str) -> str:
     return '/'.join(['', 'repos', owner, repo, *endpoint])
@@ -144,4 +150,56 @@ def commit_status(
     }
     if sha_info.url:
         payload['target_url'] = sha_info.url
-    return request(token, endpoint, HttpMethod.post, payload)
+    # a status replaces the previous one with the same sha and context, it
+    # is retried when rate limited
+    return request(
+        token,
+        endpoint,
+        HttpMethod.post,
+        payload,
+        idempotent=True,
+    )
+
+
+def commit_statuses(
+    token: str,
+    owner: str,
+    repo: str,
+    statuses: Sequence[GithubShaStatus],
+    concurrency: int = STATUS_CONCURRENCY,
+) -> Res[list[Any]]:
+    """Set several commit statuses concurrently.
+
+    The statuses are sent from a pool of `concurrency` threads sharing the
+    keep-alive connections of `m.core.http`.
+
+    Args:
+        token: A github PAT.
+        owner: The owner of the repo.
+        repo: The name of the repo.
+        statuses: The statuses to set.
+        concurrency: Max number of requests in flight.
+
+    Returns:
+        The responses from Github in the same order as the statuses or an
+        issue listing all the statuses that could not be set.
+    """
+    if not statuses:
+        return Good([])
+    send = partial(commit_status, token, owner, repo)
+    workers = max(min(concurrency, len(statuses)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(send, statuses))
+    failed: dict[str, Any] = {}
+    responses: list[Any] = []
+    for sha_info, res in zip(statuses, results):
+        if isinstance(res, Bad):
+            failed[f'{sha_info.sha}:{sha_info.context}'] = res.value.to_dict()
+        else:
+            responses.append(res.value)
+    if failed:
+        return issue('commit status failures', context={
+            'failed': failed,
+            'created': len(responses),
+        })
+    return Good(responses)
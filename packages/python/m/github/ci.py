@@ -1,7 +1,7 @@
 import re
 from typing import Any, Optional
 
-from m.core import Good, Issue, OneOf, non_issue, one_of
+from m.core import Good, Issue, OneOf, one_of
 
 from ..core.json import get
 from .ci_dataclasses import (
@@ -13,14 +13,21 @@ from .ci_dataclasses import (
     PullRequest,
     Release,
 )
-from .ci_graph_queries import LATEST_RELEASE, PULL_REQUEST, commit_query
+from .ci_graph_queries import (
+    LATEST_RELEASE,
+    PULL_REQUEST,
+    PULL_REQUEST_FILES,
+    commit_query,
+)
 from .graphql import api
+from .graphql.paginate import MAX_PAGE_SIZE, fetch_nodes
 
 
 def create_ci_query(
     pr_number: int | None = None,
     include_commit: bool = False,
     include_release: bool = False,
+    include_parents: bool = False,
 ) -> str:
     """Create github graphql query.
 
@@ -30,6 +37,7 @@ def create_ci_query(
         pr_number: If included, it will add pull request information.
         include_commit: If true, include commit information.
         include_release: If true, include release information.
+        include_parents: If true, include the parents of the commit.
 
     Returns:
         A string with the graphql query.
@@ -38,7 +46,11 @@ def create_ci_query(
     query_params: list[str] = ['$owner: String!', '$repo: String!']
     if include_commit:
         include_pr = pr_number is None
-        query_items.append(commit_query(include_pr, include_author=True))
+        query_items.append(commit_query(
+            include_pr,
+            include_author=True,
+            include_parents=include_parents,
+        ))
         query_params.append('$sha: String')
     if pr_number:
         query_items.append(PULL_REQUEST)
@@ -100,12 +112,25 @@ def get_build_sha(
     return one_of(
         lambda: [
             _parse_commit_message(commit_msg, sha)
-            for res in api.graphql(token, query, variables)
+            for res in api.graphql(token, query, variables, cacheable=True)
             for commit_msg in get(res, 'repository.commit.message')
         ],
     )
 
 
+def _resolve_merge_commit(repo_data: Any, sha: str) -> Any:
+    commit = repo_data.get('commit')
+    if not commit:
+        return repo_data
+    parents = commit.pop('parents', None) or {}
+    build_sha = _parse_commit_message(commit.get('message', ''), sha)
+    if build_sha != sha:
+        for parent in parents.get('nodes') or []:
+            if parent.get('oid', '').startswith(build_sha):
+                repo_data['commit'] = parent
+    return repo_data
+
+
 def get_raw_ci_run_info(
     token: str,
     commit_info: CommitInfo,
@@ -120,9 +145,14 @@ def get_raw_ci_run_info(
         token: A Github PAT.
         commit_info: The owner, repo and sha.
         pr_number: The pull request number.
-        file_count:  The maximum number of files in the pr to retrieve.
+        file_count:  The maximum number of files in the pr to retrieve. At
+            most `MAX_PAGE_SIZE` files are included, `get_ci_run_info`
+            retrieves the next pages.
         include_release: If true it will provide release information.
-        get_sha: If true, it will obtain the actual sha of the commit.
+        get_sha: If true, it will obtain the actual sha of the commit. The
+            parents of the commit are requested in the same query and the
+            commit named in the message of a merge commit is reported
+            instead, see `get_build_sha`.
 
     Returns:
         The Github payload with the raw information.
@@ -131,19 +161,20 @@ def get_raw_ci_run_info(
         pr_number,
         include_commit=True,
         include_release=include_release,
+        include_parents=get_sha,
     )
     owner, repo, sha = [commit_info.owner, commit_info.repo, commit_info.sha]
-    variables = {'owner': owner, 'repo': repo, 'sha': sha, 'fc': file_count}
+    variables = {
+        'owner': owner,
+        'repo': repo,
+        'sha': sha,
+        'fc': min(file_count, MAX_PAGE_SIZE),
+    }
     if pr_number:
         variables['pr'] = pr_number
-    if get_sha:
-        build_sha = get_build_sha(token, owner, repo, sha)
-        if build_sha.is_bad:
-            return build_sha
-        variables['sha'] = non_issue(build_sha)
     return one_of(lambda: [
-        repo_data
-        for res in api.graphql(token, query, variables)
+        _resolve_merge_commit(repo_data, sha) if get_sha else repo_data
+        for res in api.graphql(token, query, variables, cacheable=True)
         for repo_data in get(res, 'repository')
     ])
 
@@ -192,9 +223,41 @@ def _get_commit(owner: str, repo: str, raw: Any) -> OneOf[Issue, Commit]:
     return Good(commit_info)
 
 
+def _get_pr_files(
+    token: str,
+    commit_info: CommitInfo,
+    pr_number: Optional[int],
+    raw: Any,
+    file_count: int,
+) -> OneOf[Issue, list[str]]:
+    pr_files = (raw.get('pullRequest') or {}).get('files') or {}
+    files = [node['path'] for node in pr_files.get('nodes', [])][:file_count]
+    page_info = pr_files.get('pageInfo') or {}
+    missing = file_count - len(files)
+    if not pr_number or missing <= 0 or not page_info.get('hasNextPage'):
+        return Good(files)
+    variables = {
+        'owner': commit_info.owner,
+        'repo': commit_info.repo,
+        'pr': pr_number,
+    }
+    return one_of(lambda: [
+        [*files, *(node['path'] for node in nodes)]
+        for nodes in fetch_nodes(
+            token,
+            PULL_REQUEST_FILES,
+            variables,
+            'repository.pullRequest.files',
+            limit=missing,
+            after=page_info.get('endCursor'),
+        )
+    ])
+
+
 def _get_pull_request(
     raw: Any,
     pr_number: Optional[int],
+    files: list[str],
 ) -> OneOf[Issue, Optional[PullRequest]]:
     pr = raw.get('pullRequest')
     if not pr:
@@ -212,7 +275,7 @@ def _get_pull_request(
             title=pr.get('title'),
             body=pr.get('body'),
             file_count=pr_files.get('totalCount', 0),
-            files=[x['path'] for x in pr_files.get('nodes', [])],
+            files=files,
             is_draft=pr.get('isDraft'),
         ),
     )
@@ -227,6 +290,9 @@ def get_ci_run_info(
 ) -> OneOf[Issue, GithubCiRunInfo]:
     """Transform the result from get_raw_ci_run_info to a GithubCiRunInfo.
 
+    The files of the pull request are retrieved one page at a time until
+    `file_count` files are found.
+
     Args:
         token: A Github PAT.
         commit_info: An instance of a commit info.
@@ -250,7 +316,14 @@ def get_ci_run_info(
             for raw in raw_res
             for release in _get_release(raw)
             for commit in _get_commit(commit_info.owner, commit_info.repo, raw)
-            for pr in _get_pull_request(raw, pr_number)
+            for files in _get_pr_files(
+                token,
+                commit_info,
+                pr_number,
+                raw,
+                file_count,
+            )
+            for pr in _get_pull_request(raw, pr_number, files)
         ],
     )
 
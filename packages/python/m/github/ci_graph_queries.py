@@ -1,4 +1,8 @@
-def commit_query(include_pr: bool, include_author: bool) -> str:
+def commit_query(
+    include_pr: bool,
+    include_author: bool,
+    include_parents: bool = False,
+) -> str:
     """Build a graphql query for github.
 
     The output of this function is meant to go inside the repository
@@ -7,6 +11,9 @@ def commit_query(include_pr: bool, include_author: bool) -> str:
     Args:
         include_pr: If true, it will include pull request information.
         include_author: If true, it will include user information.
+        include_parents: If true, the same information is included for the
+            parents of the commit. Used to read the pull request commit of
+            the merge commits created by Github.
 
     Returns:
         A valid graphql query.
@@ -42,12 +49,22 @@ def commit_query(include_pr: bool, include_author: bool) -> str:
         }
       }
     """ if include_pr else ''
+    parents = f"""
+      parents(first: 2) {{
+        nodes {{
+          message
+          {author}
+          {pr}
+        }}
+      }}
+    """ if include_parents else ''
     return f"""
       commit: object(expression: $sha) {{
         ... on Commit {{
           message
           {author}
           {pr}
+          {parents}
         }}
       }}
     """
@@ -81,6 +98,10 @@ PULL_REQUEST = """
     }
     files(first: $fc) {
       totalCount
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
       nodes {
         path
       }
@@ -89,3 +110,23 @@ PULL_REQUEST = """
     isDraft
   }
 """
+
+# The next pages of the files in a pull request, see
+# `m.github.graphql.paginate`.
+PULL_REQUEST_FILES = """query (
+  $owner: String!, $repo: String!, $pr: Int!, $first: Int!, $after: String
+) {
+  repository(owner: $owner, name: $repo) {
+    pullRequest(number: $pr) {
+      files(first: $first, after: $after) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          path
+        }
+      }
+    }
+  }
+}"""
@@ -41,7 +41,7 @@ def get_pr_info(
     return one_of(
         lambda: [
             pr_info
-            for res in graphql(token, query, variables)
+            for res in graphql(token, query, variables, cacheable=True)
             for pr_info in get(res, 'repository.pullRequest')
         ],
     )
@@ -77,7 +77,7 @@ def get_latest_release(
     return one_of(
         lambda: [
             tag_name
-            for res in graphql(token, query, variables)
+            for res in graphql(token, query, variables, cacheable=True)
             for releases in get(res, 'repository.releases.nodes')
             for tag_name in _get_latest_release(releases)
         ],
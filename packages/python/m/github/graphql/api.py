@@ -25,6 +25,7 @@ def graphql(
     token: str,
     query: str,
     variables: Mapping[str, Any],
+    cacheable: bool = False,
 ) -> OneOf[Issue, Any]:
     """Make a request to Github's graphql API.
 
@@ -34,6 +35,8 @@ def graphql(
         token: A github PAT.
         query: A graphql query.
         variables: The variables to use in the query.
+        cacheable: Whether the response may be cached. Only read-only
+            queries should set it. See `m.core.http.fetch_response`.
 
     Returns:
         The Github response.
@@ -42,7 +45,13 @@ def graphql(
     return one_of(
         lambda: [
             payload
-            for res in request(token, '/graphql', HttpMethod.post, payload)
+            for res in request(
+                token,
+                '/graphql',
+                HttpMethod.post,
+                payload,
+                cacheable=cacheable,
+            )
             for payload in _filter_data(res)
         ],
     )
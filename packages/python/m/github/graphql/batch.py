@@ -0,0 +1,188 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping, Sequence
+
+from m.core import Good, Issue, OneOf, http, issue
+from m.core.fp import Bad
+
+from ..request import request
+
+# Max number of aliased fields sent in one request.
+MAX_BATCH_SIZE = 50
+
+# Github rejects queries that may return more than 500,000 nodes.
+MAX_BATCH_NODES = 500000
+
+# Matches a variable or a token that may contain `$` without referring to
+# one: block strings, strings and comments. Only the variables have a name.
+VARIABLE_REGEX = re.compile(
+    r'"""(?:\\.|[^\\])*?"""'
+    r'|"(?:\\.|[^"\\\n])*"'
+    r'|#[^\n]*'
+    r'|\$(\w+)',
+)
+
+
+@dataclass
+class Lookup:
+    """A single top level field to include in a batched query.
+
+    usage::
+
+        Lookup(
+            query='''repository(owner: $owner, name: $repo) {
+                pullRequest(number: $pr) { mergeable }
+            }''',
+            params=['$owner: String!', '$repo: String!', '$pr: Int!'],
+            variables={'owner': 'jmlopez-rod', 'repo': 'm', 'pr': 1},
+        )
+    """
+
+    # The field with its arguments and selection.
+    query: str
+
+    # The declarations of the variables used in `query`.
+    params: Sequence[str] = field(default_factory=list)
+
+    # The values of the variables.
+    variables: Mapping[str, Any] = field(default_factory=dict)
+
+    # Estimate of the nodes returned by the field, see
+    # https://docs.github.com/en/graphql/overview/rate-limits-and-node-limits-for-the-graphql-api
+    nodes: int = 1
+
+
+def _rename_match(match: re.Match[str], alias: str) -> str:
+    name = match.group(1)
+    return f'${name}_{alias}' if name else match.group(0)
+
+
+def _rename(text: str, alias: str) -> str:
+    return VARIABLE_REGEX.sub(lambda match: _rename_match(match, alias), text)
+
+
+def build_batch_query(
+    lookups: Sequence[Lookup],
+) -> tuple[str, dict[str, Any]]:
+    """Merge several lookups into one query.
+
+    The field of each lookup is aliased as `r0`, `r1`, ... and its variables
+    are suffixed with the alias so that lookups may use the same names.
+
+    Args:
+        lookups: The lookups to merge.
+
+    Returns:
+        The query and its variables.
+    """
+    params: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, Any] = {}
+    for index, lookup in enumerate(lookups):
+        alias = f'r{index}'
+        params.extend(_rename(param, alias) for param in lookup.params)
+        fields.append(f'{alias}: {_rename(lookup.query.strip(), alias)}')
+        variables.update({
+            f'{name}_{alias}': var_value
+            for name, var_value in lookup.variables.items()
+        })
+    params_str = f'({", ".join(params)}) ' if params else ''
+    fields_str = '\n'.join(fields)
+    return f'query {params_str}{{\n{fields_str}\n}}', variables
+
+
+def chunk_lookups(
+    lookups: Sequence[Lookup],
+    max_size: int = MAX_BATCH_SIZE,
+    max_nodes: int = MAX_BATCH_NODES,
+) -> Iterator[Sequence[Lookup]]:
+    """Split the lookups in groups that may be sent in one request.
+
+    A lookup exceeding `max_nodes` by itself is sent alone.
+
+    Args:
+        lookups: The lookups to split.
+        max_size: Max number of lookups in a group.
+        max_nodes: Max number of nodes requested by a group.
+
+    Yields:
+        Consecutive groups of lookups.
+    """
+    start = 0
+    nodes = 0
+    for index, lookup in enumerate(lookups):
+        full = index - start >= max_size or nodes + lookup.nodes > max_nodes
+        if full and index > start:
+            yield lookups[start:index]
+            start = index
+            nodes = 0
+        nodes += lookup.nodes
+    if start < len(lookups):
+        yield lookups[start:]
+
+
+def _alias_results(
+    res: Mapping[str, Any],
+    size: int,
+) -> list[OneOf[Issue, Any]]:
+    errors: dict[str, list[Any]] = {}
+    for error in res.get('errors') or []:
+        path = error.get('path') or ['']
+        errors.setdefault(str(path[0]), []).append(error)
+    data = res.get('data') or {}
+    results: list[OneOf[Issue, Any]] = []
+    for index in range(size):
+        alias = f'r{index}'
+        alias_errors = errors.get(alias) or errors.get('')
+        if alias_errors:
+            results.append(issue(
+                'github graphql errors',
+                context={'errors': alias_errors},
+            ))
+        elif data.get(alias) is None:
+            results.append(issue(
+                'github response missing data field',
+                context={'alias': alias, 'response': res},
+            ))
+        else:
+            results.append(Good(data[alias]))
+    return results
+
+
+def batch_graphql(
+    token: str,
+    lookups: Sequence[Lookup],
+    max_size: int = MAX_BATCH_SIZE,
+    max_nodes: int = MAX_BATCH_NODES,
+) -> list[OneOf[Issue, Any]]:
+    """Retrieve the data of many lookups with as few requests as possible.
+
+    Each group of lookups given by `chunk_lookups` is sent as a single
+    query. Errors only affect the lookups they refer to, a failed request
+    affects all the lookups in its group.
+
+    Args:
+        token: A Github PAT.
+        lookups: The lookups to make.
+        max_size: Max number of lookups in a request.
+        max_nodes: Max number of nodes requested in a request.
+
+    Returns:
+        A `OneOf` with the data of the field of each lookup, in the same
+        order as the lookups.
+    """
+    results: list[OneOf[Issue, Any]] = []
+    for chunk in chunk_lookups(lookups, max_size, max_nodes):
+        query, variables = build_batch_query(chunk)
+        res = request(
+            token,
+            '/graphql',
+            http.HttpMethod.post,
+            {'query': query, 'variables': variables},
+            cacheable=True,
+        )
+        if isinstance(res, Bad):
+            results.extend(res for _ in chunk)
+        else:
+            results.extend(_alias_results(res.value, len(chunk)))
+    return results
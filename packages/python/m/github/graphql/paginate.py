@@ -0,0 +1,113 @@
+from itertools import islice
+from typing import Any, Iterator, Mapping, Optional
+
+from m.core import Issue, OneOf, one_of
+from m.core.fp import Bad, Good
+from m.core.json import get
+
+from . import api
+
+# Largest value Github accepts for the `first` and `last` arguments.
+MAX_PAGE_SIZE = 100
+
+
+def _fetch_page(
+    token: str,
+    query: str,
+    variables: Mapping[str, Any],
+    path: str,
+) -> OneOf[Issue, Any]:
+    return one_of(lambda: [
+        connection
+        for res in api.graphql(token, query, variables, cacheable=True)
+        for connection in get(res, path)
+    ])
+
+
+def paginate(
+    token: str,
+    query: str,
+    variables: Mapping[str, Any],
+    path: str,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+) -> Iterator[OneOf[Issue, Any]]:
+    """Iterate over the nodes of a graphql connection.
+
+    The query must declare the `$first: Int!` and `$after: String`
+    variables, use them as the arguments of the connection and select its
+    `pageInfo { hasNextPage endCursor }` along with the `nodes`. Pages are
+    requested with `MAX_PAGE_SIZE` nodes, or fewer when `limit` is close,
+    and only once the previous page has been consumed.
+
+    usage::
+
+        for node in paginate(token, query, variables, 'repository.refs'):
+            if isinstance(node, Bad):
+                return node
+            ...
+
+    Args:
+        token: A Github PAT.
+        query: A graphql query with the `$first` and `$after` variables.
+        variables: The other variables of the query.
+        path: The path to the connection in the response data.
+        limit: Max number of nodes to retrieve.
+        after: The cursor to start from, the start of the connection if
+            not provided.
+
+    Yields:
+        A `OneOf` for each node. An error is yielded as an issue and ends
+        the iteration.
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page_size = MAX_PAGE_SIZE
+        if remaining is not None:
+            page_size = min(page_size, remaining)
+        page_vars = {**variables, 'first': page_size, 'after': after}
+        connection = _fetch_page(token, query, page_vars, path)
+        if isinstance(connection, Bad):
+            yield connection
+            return
+        nodes = connection.value.get('nodes') or []
+        for node in nodes[:page_size]:
+            yield Good(node)
+        page_info = connection.value.get('pageInfo') or {}
+        if not page_info.get('hasNextPage'):
+            return
+        after = page_info.get('endCursor')
+        if remaining is not None:
+            remaining -= len(nodes)
+
+
+def fetch_nodes(
+    token: str,
+    query: str,
+    variables: Mapping[str, Any],
+    path: str,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+) -> OneOf[Issue, list[Any]]:
+    """Collect the nodes of a graphql connection.
+
+    See `paginate` for the requirements on the query.
+
+    Args:
+        token: A Github PAT.
+        query: A graphql query with the `$first` and `$after` variables.
+        variables: The other variables of the query.
+        path: The path to the connection in the response data.
+        limit: Max number of nodes to retrieve.
+        after: The cursor to start from.
+
+    Returns:
+        A `OneOf` containing the list of nodes or an issue.
+    """
+    nodes: list[Any] = []
+    pages = paginate(token, query, variables, path, limit, after)
+    for node in islice(pages, limit):
+        if isinstance(node, Bad):
+            return Bad(node.value)
+        nodes.append(node.value)
+    return Good(nodes)
@@ -89,7 +89,7 @@ def _fetch(
     return one_of(
         lambda: [
             transform(pull_requests)
-            for res in graphql(token, query, variables)
+            for res in graphql(token, query, variables, cacheable=True)
             for pull_requests in get(res, 'repository.pullRequests.nodes')
         ],
     )
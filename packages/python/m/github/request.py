@@ -1,13 +1,23 @@
+from functools import partial
 from typing import Any
 
 from m.core import Issue, OneOf, http
 
+from .scheduler import RequestScheduler, endpoint_resource
+
+GITHUB_API = 'https://api.github.com'
+
+# Shared by all the requests so that the rate limit is tracked across them.
+scheduler = RequestScheduler()
+
 
 def request(
     token: str,
     endpoint: str,
     method: http.HttpMethod = http.HttpMethod.get,
     dict_data: object | None = None,
+    cacheable: bool | None = None,
+    idempotent: bool | None = None,
 ) -> OneOf[Issue, Any]:
     """Make an api request to github.
 
@@ -16,15 +26,37 @@ def request(
         - https://docs.github.com/en/rest/overview/resources-in-the-rest-api
         - https://docs.github.com/en/rest/overview/endpoints-available-for-github-apps
 
+    The requests go through the module `scheduler`. It waits when the rate
+    limit of the endpoint resource is about to run out and retries the
+    requests that are safe to send again: `GET` requests, the ones marked
+    as `cacheable` and the ones marked as `idempotent`.
+
     Args:
         token: A github personal access token.
         endpoint: A github api endpoint.
         method: The http method to use. (default 'GET')
         dict_data: A payload if the method if `POST` or `GET`.
+        cacheable: Whether the response may be cached. Defaults to `True`
+            only for `GET` requests. See `m.core.http.fetch_response`.
+        idempotent: Whether sending the request twice has the same effect
+            as sending it once. Defaults to `True` for `GET` and cacheable
+            requests.
 
     Returns:
         A response from Github.
     """
-    url = f'https://api.github.com{endpoint}'
+    url = f'{GITHUB_API}{endpoint}'
     headers = {'authorization': f'Bearer {token}'}
-    return http.fetch_json(url, headers, method, dict_data)
+    resource = endpoint_resource(endpoint)
+    send = partial(
+        http.fetch_json,
+        url,
+        headers,
+        method,
+        dict_data,
+        cacheable=cacheable,
+        on_response=partial(scheduler.observe, resource=resource),
+    )
+    if idempotent is None:
+        idempotent = method == http.HttpMethod.get or bool(cacheable)
+    return scheduler.run(send, idempotent=idempotent, resource=resource)
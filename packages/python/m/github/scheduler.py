@@ -0,0 +1,273 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from http import client as httplib
+from typing import Callable, Optional, TypeVar
+
+from m.core import Issue
+from m.core.fp import Good, OneOf
+
+T = TypeVar('T')  # noqa: WPS111
+
+# Status codes worth retrying, 403 is only retried for rate limits.
+RETRY_STATUS = frozenset((
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+))
+
+# Network errors worth retrying.
+RETRY_ERRORS = (OSError, httplib.HTTPException)
+
+
+@dataclass
+class SchedulerStats:
+    """Counters of a `RequestScheduler`."""
+
+    requests: int = 0
+    retries: int = 0
+    wait_time: float = 0
+
+
+@dataclass
+class RateLimit:
+    """Primary rate limit of a Github API resource."""
+
+    remaining: Optional[float] = None
+    reset_at: float = 0
+
+
+def endpoint_resource(endpoint: str) -> str:
+    """Guess the rate limit resource of an endpoint.
+
+    Github reports the resource in the `x-ratelimit-resource` header, this
+    is used to pick the limit to check before the first response.
+
+    Args:
+        endpoint: A github api endpoint.
+
+    Returns:
+        The name of the resource: `graphql`, `search` or `core`.
+    """
+    if endpoint.startswith('/graphql'):
+        return 'graphql'
+    if endpoint.startswith('/search/'):
+        return 'search'
+    return 'core'
+
+
+def _header_number(
+    res: httplib.HTTPResponse,
+    name: str,
+) -> Optional[float]:
+    header_value = res.getheader(name)
+    if header_value is None:
+        return None
+    try:
+        return float(header_value)
+    except ValueError:
+        return None
+
+
+class RequestScheduler:  # noqa: WPS230 - rate limit state
+    """Schedule the requests made to the Github API.
+
+    The rate limit headers of every response are recorded:
+
+    - `x-ratelimit-remaining` and `x-ratelimit-reset`: tracked for each
+      `x-ratelimit-resource` (`core`, `graphql`, `search`...). Once fewer
+      than `throttle_below` requests are left the requests to the
+      resource are spread until the reset time. With `min_remaining`
+      requests left the scheduler waits for the reset.
+    - `retry-after`: sent with the secondary rate limits, no request is
+      made before the given number of seconds.
+
+    Failed idempotent requests are retried after a jittered exponential
+    backoff. Waits never exceed `max_wait` seconds.
+
+    https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+    """
+
+    def __init__(  # noqa: WPS211 - tuning knobs
+        self,
+        max_retries: int = 3,
+        backoff: float = 1,
+        max_backoff: float = 60,
+        min_remaining: int = 1,
+        throttle_below: int = 50,
+        max_wait: float = 900,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_retries: Max number of retries of a request.
+            backoff: Seconds to wait before the first retry.
+            max_backoff: Max seconds to wait between retries.
+            min_remaining: Wait for the reset with this many requests left.
+            throttle_below: Spread the requests with this many left.
+            max_wait: Max seconds to wait before a request.
+            sleep: Function used to wait.
+            clock: Function returning the current epoch time.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.min_remaining = min_remaining
+        self.throttle_below = throttle_below
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.clock = clock
+        self.stats = SchedulerStats()
+        self.limits: dict[str, RateLimit] = {}
+        self.retry_at: float = 0
+        self._lock = threading.Lock()
+
+    def limit(self, resource: str) -> RateLimit:
+        """Get the rate limit state of a resource.
+
+        Args:
+            resource: The name of a rate limit resource.
+
+        Returns:
+            The state, created on first use.
+        """
+        return self.limits.setdefault(resource, RateLimit())
+
+    def observe(
+        self,
+        res: httplib.HTTPResponse,
+        resource: str = 'core',
+    ) -> None:
+        """Record the rate limit headers of a response.
+
+        Args:
+            res: A response from the Github API.
+            resource: The resource of the request, used when the response
+                has no `x-ratelimit-resource` header.
+        """
+        resource = res.getheader('x-ratelimit-resource') or resource
+        remaining = _header_number(res, 'x-ratelimit-remaining')
+        reset_at = _header_number(res, 'x-ratelimit-reset')
+        retry_after = _header_number(res, 'retry-after')
+        with self._lock:
+            rate_limit = self.limit(resource)
+            if remaining is not None:
+                rate_limit.remaining = remaining
+            if reset_at is not None:
+                rate_limit.reset_at = reset_at
+            if retry_after is not None:
+                self.retry_at = max(self.retry_at, self.clock() + retry_after)
+
+    def delay(self, resource: str = 'core') -> float:
+        """Compute the seconds to wait before the next request.
+
+        Args:
+            resource: The rate limit resource of the request.
+
+        Returns:
+            The number of seconds, 0 if the request can be made right away.
+        """
+        with self._lock:
+            now = self.clock()
+            delay = self.retry_at - now
+            rate_limit = self.limit(resource)
+            remaining = rate_limit.remaining
+            until_reset = rate_limit.reset_at - now
+            if remaining is not None and until_reset > 0:
+                if remaining <= self.min_remaining:
+                    delay = max(delay, until_reset)
+                elif remaining < self.throttle_below:
+                    delay = max(delay, until_reset / remaining)
+        return min(max(delay, 0), self.max_wait)
+
+    def wait(self, seconds: float) -> None:
+        """Sleep and record the time spent waiting.
+
+        Args:
+            seconds: The number of seconds to wait.
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.stats.wait_time += seconds
+        self.sleep(seconds)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Compute the backoff before a retry.
+
+        Half of the delay is random so that concurrent clients do not retry
+        at the same time.
+
+        Args:
+            attempt: The number of the retry, starting at 1.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2.0 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)  # noqa: S311
+
+    def is_retryable(self, error: Issue, resource: str = 'core') -> bool:
+        """Determine if a failed request may succeed if sent again.
+
+        Args:
+            error: The issue returned by the request.
+            resource: The rate limit resource of the request.
+
+        Returns:
+            True for network errors, server errors and rate limits.
+        """
+        context = error.context if isinstance(error.context, dict) else {}
+        code = context.get('code')
+        if code is None:
+            return isinstance(error.cause, RETRY_ERRORS)
+        if code in RETRY_STATUS:
+            return True
+        if code != HTTPStatus.FORBIDDEN:
+            return False
+        with self._lock:
+            exhausted = self.limit(resource).remaining == 0
+            limited = exhausted or self.retry_at > self.clock()
+        res_body = str(context.get('res_body', '')).lower()
+        return limited or 'rate limit' in res_body
+
+    def run(
+        self,
+        send: Callable[[], OneOf[Issue, T]],
+        idempotent: bool,
+        resource: str = 'core',
+    ) -> OneOf[Issue, T]:
+        """Send a request once the rate limit allows it.
+
+        Args:
+            send: Function making the request.
+            idempotent: Allow retries, only for requests without side
+                effects such as `GET` requests and graphql queries.
+            resource: The rate limit resource of the request.
+
+        Returns:
+            The result of the last attempt.
+        """
+        attempt = 0
+        while True:  # noqa: WPS457 - until a result is final
+            self.wait(self.delay(resource))
+            with self._lock:
+                self.stats.requests += 1
+            res = send()
+            if isinstance(res, Good) or not idempotent:
+                return res
+            if attempt >= self.max_retries:
+                return res
+            if not self.is_retryable(res.value, resource):
+                return res
+            attempt += 1
+            with self._lock:
+                self.stats.retries += 1
+            if self.delay(resource) <= 0:
+                self.wait(self.backoff_delay(attempt))
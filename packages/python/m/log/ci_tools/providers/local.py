@@ -11,19 +11,22 @@ from ..types import EnvVars, Message, ProviderModule
 def env_vars() -> OneOf[Issue, EnvVars]:
     """Obtain basic environment variables in a local environment.
 
+    The branch and the sha are read from a single `git rev-parse`.
+
     Returns:
         An `EnvVars` instance if successful.
     """
-    return one_of(
-        lambda: [
-            EnvVars(
-                git_branch=git_branch,
-                git_sha=git_sha,
-            )
-            for git_branch in git.get_branch()
-            for git_sha in git.get_current_commit_sha()
-        ],
-    )
+    with git.GitSession() as session:
+        return one_of(
+            lambda: [
+                EnvVars(
+                    git_branch=git_branch,
+                    git_sha=git_sha,
+                )
+                for git_branch in git.get_branch(session=session)
+                for git_sha in git.get_current_commit_sha(session=session)
+            ],
+        )
 
 
 def log_format(
@@ -2,14 +2,14 @@ from m.ci.docker.tags import docker_tags, is_semver
 
 from ..core import Issue, issue
 from ..core.fp import Bad, Good, OneOf
-from .cli import add_dist_tag
+from .cli import add_dist_tags
 
 
 def add_tags(pkg: str, version: str, branch: str) -> OneOf[Issue, list[str]]:
     """Add tags to a package.
 
     The branch name will be added to the tags in the event that we have a
-    valid sem-version.
+    valid sem-version. The tags are added concurrently.
 
     Args:
         pkg: The name of the npm package.
@@ -25,8 +25,7 @@ def add_tags(pkg: str, version: str, branch: str) -> OneOf[Issue, list[str]]:
         tags.append(branch)
     issues: list[Issue] = []
     added: list[str] = []
-    for tag in tags:
-        cmd_result = add_dist_tag(pkg, version, tag)
+    for cmd_result in add_dist_tags(pkg, version, tags):
         if isinstance(cmd_result, Bad):
             issues.append(cmd_result.value)
         else:
@@ -2,7 +2,7 @@ from typing import Dict, List, Set, cast
 
 from ..core import Issue, issue, one_of
 from ..core.fp import Good, OneOf
-from .cli import get_dist_tags, remove_dist_tag
+from .cli import get_dist_tags, remove_dist_tags
 
 
 def clean_tags(pkg: str) -> OneOf[Issue, List[str]]:
@@ -38,7 +38,7 @@ def find_empty_tags(tag_map: Dict[str, str]) -> Set[str]:
 
 
 def remove_tags(pkg: str, tags: Set[str]) -> OneOf[Issue, List[str]]:
-    """Call `npm dist-tag` to remove npm tags.
+    """Call `npm dist-tag` concurrently to remove npm tags.
 
     See https://docs.npmjs.com/cli/v8/commands/npm-dist-tag
 
@@ -52,8 +52,7 @@ def remove_tags(pkg: str, tags: Set[str]) -> OneOf[Issue, List[str]]:
     """
     issues: List[Issue] = []
     removed: List[str] = []
-    for tag in tags:
-        cmd_result = remove_dist_tag(pkg, tag)
+    for cmd_result in remove_dist_tags(pkg, tags):
         if cmd_result.is_bad:
             issues.append(cast(Issue, cmd_result.value))
         else:
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Iterable, List
 
 from ..core import one_of, subprocess
 from ..core.fp import OneOf
@@ -37,6 +37,25 @@ def remove_dist_tag(pkg_name: str, tag: str) -> OneOf[Issue, str]:
     return subprocess.eval_cmd(f'npm dist-tag rm {pkg_name} {tag} --json')
 
 
+def remove_dist_tags(
+    pkg_name: str,
+    tags: Iterable[str],
+) -> List[OneOf[Issue, str]]:
+    """Remove npm tags concurrently.
+
+    Args:
+        pkg_name: The name of the npm package.
+        tags: The tags to remove.
+
+    Returns:
+        The `OneOf` result of each removal in the order of the tags.
+    """
+    return subprocess.eval_cmds_concurrently([
+        f'npm dist-tag rm {pkg_name} {tag} --json'
+        for tag in tags
+    ])
+
+
 def add_dist_tag(pkg_name: str, version: str, tag: str) -> OneOf[Issue, str]:
     """Add an npm tag.
 
@@ -49,3 +68,24 @@ def add_dist_tag(pkg_name: str, version: str, tag: str) -> OneOf[Issue, str]:
         A `OneOf` containing an `Issue` or the output of the npm command.
     """
     return subprocess.eval_cmd(f'npm dist-tag add {pkg_name}@{version} {tag}')
+
+
+def add_dist_tags(
+    pkg_name: str,
+    version: str,
+    tags: Iterable[str],
+) -> List[OneOf[Issue, str]]:
+    """Add npm tags concurrently.
+
+    Args:
+        pkg_name: The name of the npm package.
+        version: The version to tag.
+        tags: The tags to add.
+
+    Returns:
+        The `OneOf` result of each addition in the order of the tags.
+    """
+    return subprocess.eval_cmds_concurrently([
+        f'npm dist-tag add {pkg_name}@{version} {tag}'
+        for tag in tags
+    ])
@@ -1,7 +1,7 @@
 from re import sub
 from typing import Any, Callable, TypeVar
 
-from pydantic import BaseModel, ConfigDict, TypeAdapter
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
 
 from .core import Good, Res, hone, issue, one_of
 from .core.rw import assert_file_exists
@@ -85,6 +85,44 @@ def parse_model(model: type[GenericModel], model_data: Any) -> Res[GenericModel]
         return issue('parse_model_failure', cause=ex)
 
 
+_type_adapters: dict[Any, TypeAdapter] = {}
+
+
+def _type_adapter(model: Any) -> TypeAdapter:
+    adapter = _type_adapters.get(model)
+    if adapter is None:
+        adapter = TypeAdapter(model)
+        _type_adapters[model] = adapter
+    return adapter
+
+
+def parse_json_model(
+    model: type[GenericModel],
+    json_data: str | bytes,
+) -> Res[GenericModel]:
+    """Decode json data straight into a model.
+
+    The data is decoded and validated by pydantic in a single pass, no
+    intermediate python dictionaries are created. Fields that are not part
+    of the model are skipped. Using a `TypedDict` as the model avoids the
+    cost of creating model instances. Invalid json results in the same issue
+    message as `m.core.json.parse_json`.
+
+    Args:
+        model: The class to create an instance of.
+        json_data: The json document.
+
+    Returns:
+        A `OneOf` with the model or an issue.
+    """
+    try:
+        return Good(_type_adapter(model).validate_json(json_data))
+    except ValidationError as ex:
+        if ex.errors()[0]['type'] == 'json_invalid':
+            return issue('failed to parse the json data', cause=ex)
+        return issue('parse_model_failure', cause=ex)
+
+
 DataTransformer = Callable[[Any], Res[Any]]
 
 
@@ -1,5 +1,7 @@
 # noqa: WPS412
 from .conftest import run_action_step, run_action_test_case
+from .fake_github import FakeGithub
+from .server import LocalServer, QuietHandler
 from .testing import (
     ActionStepTestCase,
     block_m_side_effects,
@@ -9,6 +11,9 @@ from .testing import (
 
 __all__ = [  # noqa: WPS410
     'ActionStepTestCase',
+    'FakeGithub',
+    'LocalServer',
+    'QuietHandler',
     'block_m_side_effects',
     'block_network_access',
     'mock',
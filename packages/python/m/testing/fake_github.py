@@ -0,0 +1,404 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from typing import Any, List, Optional, Tuple
+
+from .server import LocalServer, QuietHandler
+
+# Value of the `x-ratelimit-limit` header.
+DEFAULT_RATE_LIMIT = 5000
+
+REPO_REGEX = re.compile(
+    r'^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/(?P<rest>.*)$',
+)
+MERGE_REGEX = re.compile(r'^pulls/(?P<number>\d+)/merge$')
+STATUS_REGEX = re.compile(r'^statuses/(?P<sha>\w+)$')
+
+# Injected errors sent with a `retry-after` header.
+LIMIT_STATUS = frozenset((HTTPStatus.FORBIDDEN, HTTPStatus.TOO_MANY_REQUESTS))
+
+# status code and json body of a response
+Reply = Tuple[int, Any]
+
+
+@dataclass
+class FakePullRequest:
+    """A pull request stored by `FakeGithub`."""
+
+    number: int
+    title: str
+    head: str
+    base: str
+    body: str = ''
+    merged: bool = False
+    closed: bool = False
+    files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FakeCommit:
+    """A commit stored by `FakeGithub`."""
+
+    oid: str
+    message: str
+    parents: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FakeGithubState:
+    """The data served by `FakeGithub`."""
+
+    pull_requests: List[FakePullRequest] = field(default_factory=list)
+    releases: List[str] = field(default_factory=list)
+    commits: List[FakeCommit] = field(default_factory=list)
+    statuses: List[Any] = field(default_factory=list)
+
+    def find_pr(self, number: int) -> Optional[FakePullRequest]:
+        """Find a pull request.
+
+        Args:
+            number: The number of the pull request.
+
+        Returns:
+            The pull request or `None` if it does not exist.
+        """
+        return next(
+            (pr for pr in self.pull_requests if pr.number == number),
+            None,
+        )
+
+    def find_commit(self, oid: str) -> Optional[FakeCommit]:
+        """Find a commit.
+
+        Args:
+            oid: The sha of the commit or a prefix of it.
+
+        Returns:
+            The commit or `None` if it does not exist.
+        """
+        return next(
+            (commit for commit in self.commits if commit.oid.startswith(oid)),
+            None,
+        )
+
+
+def _author() -> Any:
+    return {
+        'login': 'fake-user',
+        'avatarUrl': 'https://avatars.githubusercontent.com/u/0',
+        'email': '',
+    }
+
+
+def _gql_commit(
+    state: FakeGithubState,
+    commit: FakeCommit,
+    with_parents: bool = True,
+) -> Any:
+    parents = [state.find_commit(oid) for oid in commit.parents]
+    return {
+        'oid': commit.oid,
+        'message': commit.message,
+        'author': {
+            'name': 'Fake User',
+            'email': '',
+            'user': {'login': 'fake-user'},
+        },
+        'associatedPullRequests': {'nodes': []},
+        'parents': {'nodes': [
+            _gql_commit(state, parent, with_parents=False)
+            for parent in parents
+            if parent and with_parents
+        ]},
+    }
+
+
+def _gql_pr(pr: FakePullRequest, owner: str, repo: str) -> Any:
+    return {
+        'closed': pr.closed,
+        'title': pr.title,
+        'number': pr.number,
+        'body': pr.body,
+        'url': f'https://github.com/{owner}/{repo}/pull/{pr.number}',
+        'author': _author(),
+        'headRefName': pr.head,
+        'headRefOid': '0' * 40,
+        'baseRefName': pr.base,
+        'baseRefOid': '0' * 40,
+        'mergeable': 'UNKNOWN' if pr.merged else 'MERGEABLE',
+        'merged': pr.merged,
+        'isDraft': False,
+        'latestReviews': {'nodes': []},
+        'files': {
+            'totalCount': len(pr.files),
+            'pageInfo': {'hasNextPage': False, 'endCursor': None},
+            'nodes': [{'path': file_path} for file_path in pr.files],
+        },
+    }
+
+
+def _graphql_repository(  # noqa: WPS231 - one branch per supported field
+    state: FakeGithubState,
+    query: str,
+    variables: Any,
+) -> Any:
+    owner, repo = variables.get('owner', ''), variables.get('repo', '')
+    repository: Any = {}
+    if 'object(expression: $sha)' in query:
+        commit = state.find_commit(variables.get('sha') or '')
+        repository['commit'] = commit and _gql_commit(state, commit)
+    if 'pullRequests(' in query:
+        branch = variables.get('branch')
+        repository['pullRequests'] = {'nodes': [
+            _gql_pr(pr, owner, repo)
+            for pr in state.pull_requests
+            if pr.head == branch
+        ][:2]}
+    if 'pullRequest(number: $pr)' in query:
+        pr = state.find_pr(variables.get('pr') or 0)
+        repository['pullRequest'] = pr and _gql_pr(pr, owner, repo)
+    if 'releases(' in query:
+        repository['releases'] = {'nodes': [
+            {
+                'name': tag,
+                'tagName': tag,
+                'publishedAt': '2025-01-01T00:00:00Z',
+            }
+            for tag in state.releases[-1:]
+        ]}
+    return repository
+
+
+class _FakeGithubHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+    # The headers and the body are written separately, without this the
+    # body waits for the delayed ack of the client.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._handle()
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._handle()
+
+    def do_PUT(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._handle()
+
+    def _handle(self) -> None:
+        fake: FakeGithub = getattr(self.server, 'fake')  # noqa: B009
+        size = int(self.headers.get('content-length') or 0)
+        raw_body = self.rfile.read(size) if size else b''
+        payload = json.loads(raw_body) if raw_body else {}
+        if fake.latency:
+            time.sleep(fake.latency)
+        code, headers, reply = fake.respond(self.command, self.path, payload)
+        data = json.dumps(reply).encode()
+        self.send_response(code)
+        for name, header_value in headers.items():
+            self.send_header(name, header_value)
+        self.send_header('content-type', 'application/json; charset=utf-8')
+        self.send_header('content-length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeGithub(LocalServer):  # noqa: WPS230 - server settings and state
+    """A local stand in for the Github REST and graphql APIs used by m.
+
+    Supports creating releases, creating and merging pull requests, setting
+    commit statuses and the graphql queries in `m.github`. The data lives in
+    `state`. Every response includes the rate limit headers and
+    `rate_limit` requests may be made before the server replies with
+    `403` until it is restarted.
+
+    usage::
+
+        with FakeGithub(latency=0.05) as fake:
+            mocker.patch.object(m.github.request, 'GITHUB_API', fake.url)
+            fake.state.releases.append('1.0.0')
+            fake.fail_next(HTTPStatus.BAD_GATEWAY)
+            ...
+            assert fake.count('POST', '/graphql') == 2
+    """
+
+    def __init__(  # noqa: WPS211 - server settings
+        self,
+        latency: float = 0,
+        error_rate: float = 0,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        retry_after: int = 1,
+        seed: int = 0,
+        tls: bool = False,
+    ):
+        """Create the server, it starts handling requests on `start`.
+
+        Args:
+            latency: Seconds to wait before replying to a request.
+            error_rate: Probability of replying with a `502` error.
+            rate_limit: Number of requests allowed.
+            retry_after: Value of the `retry-after` header sent with the
+                injected `403` and `429` errors.
+            seed: Seed of the random errors.
+            tls: Serve https instead of http.
+        """
+        super().__init__(_FakeGithubHandler, tls=tls)
+        setattr(self.httpd, 'fake', self)  # noqa: B010
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.state = FakeGithubState()
+        self.requests: List[Tuple[str, str]] = []
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self._failures: List[int] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, *codes: int) -> None:
+        """Reply to the next requests with the given status codes.
+
+        Args:
+            codes: A status code for each of the next requests.
+        """
+        with self._lock:
+            self._failures.extend(codes)
+
+    def count(self, method: str = '', path: str = '') -> int:
+        """Count the requests received.
+
+        Args:
+            method: Only count the requests with this method.
+            path: Only count the requests to paths starting with this value.
+
+        Returns:
+            The number of requests.
+        """
+        return sum(
+            1
+            for req_method, req_path in self.requests
+            if method in {'', req_method} and req_path.startswith(path)
+        )
+
+    def respond(
+        self,
+        method: str,
+        path: str,
+        payload: Any,
+    ) -> Tuple[int, dict[str, str], Any]:
+        """Compute the response to a request.
+
+        Args:
+            method: The request method.
+            path: The path of the request.
+            payload: The json body of the request.
+
+        Returns:
+            The status code, headers and json body of the response.
+        """
+        with self._lock:
+            self.requests.append((method, path))
+            self.remaining = max(self.remaining - 1, -1)
+            headers = self._rate_limit_headers()
+            failure = self._next_failure()
+            if failure:
+                if failure in LIMIT_STATUS:
+                    headers['retry-after'] = str(self.retry_after)
+                return failure, headers, {
+                    'message': 'You have exceeded a secondary rate limit',
+                }
+            if self.remaining < 0:
+                return HTTPStatus.FORBIDDEN, headers, {
+                    'message': 'API rate limit exceeded',
+                }
+            code, res_body = self._route(method, path, payload)
+        return code, headers, res_body
+
+    def _rate_limit_headers(self) -> dict[str, str]:
+        return {
+            'x-ratelimit-limit': str(self.rate_limit),
+            'x-ratelimit-remaining': str(max(self.remaining, 0)),
+            'x-ratelimit-used': str(self.rate_limit - max(self.remaining, 0)),
+            'x-ratelimit-reset': str(self.reset_at),
+        }
+
+    def _next_failure(self) -> int:
+        if self._failures:
+            return self._failures.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return HTTPStatus.BAD_GATEWAY
+        return 0
+
+    def _route(self, method: str, path: str, payload: Any) -> Reply:
+        if method == 'POST' and path == '/graphql':
+            repository = _graphql_repository(
+                self.state,
+                payload.get('query', ''),
+                payload.get('variables') or {},
+            )
+            return HTTPStatus.OK, {'data': {'repository': repository}}
+        match = REPO_REGEX.match(path)
+        if match:
+            return self._route_repo(method, match.group('rest'), payload)
+        return HTTPStatus.NOT_FOUND, {'message': 'Not Found'}
+
+    def _route_repo(  # noqa: WPS212 - one return per endpoint
+        self,
+        method: str,
+        rest: str,
+        payload: Any,
+    ) -> Reply:
+        merge = MERGE_REGEX.match(rest)
+        status = STATUS_REGEX.match(rest)
+        if method == 'POST' and rest == 'pulls':
+            return self._create_pr(payload)
+        if method == 'PUT' and merge:
+            return self._merge_pr(int(merge.group('number')))
+        if method == 'POST' and rest == 'releases':
+            self.state.releases.append(payload['tag_name'])
+            return HTTPStatus.CREATED, {
+                'id': len(self.state.releases),
+                'tag_name': payload['tag_name'],
+            }
+        if method == 'POST' and status:
+            status_info = {**payload, 'sha': status.group('sha')}
+            self.state.statuses.append(status_info)
+            return HTTPStatus.CREATED, {
+                'id': len(self.state.statuses),
+                **status_info,
+            }
+        return HTTPStatus.NOT_FOUND, {'message': 'Not Found'}
+
+    def _create_pr(self, payload: Any) -> Reply:
+        pr = FakePullRequest(
+            number=len(self.state.pull_requests) + 1,
+            title=payload['title'],
+            head=payload['head'],
+            base=payload['base'],
+            body=payload.get('body', ''),
+        )
+        self.state.pull_requests.append(pr)
+        return HTTPStatus.CREATED, {
+            **asdict(pr),
+            'html_url': f'https://github.com/fake/pull/{pr.number}',
+        }
+
+    def _merge_pr(self, number: int) -> Reply:
+        pr = self.state.find_pr(number)
+        if not pr:
+            return HTTPStatus.NOT_FOUND, {'message': 'Not Found'}
+        if pr.merged:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {
+                'message': 'Pull Request is not mergeable',
+            }
+        pr.merged = True
+        pr.closed = True
+        return HTTPStatus.OK, {
+            'sha': f'{number:040x}',
+            'merged': True,
+            'message': 'Pull Request successfully merged',
+        }
@@ -0,0 +1,203 @@
+import ssl
+import subprocess  # noqa: S404
+import threading
+from functools import cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import TracebackType
+from typing import Any, Optional, Type
+
+from typing_extensions import Self
+
+# Creates a self signed certificate for `localhost` and `127.0.0.1`.
+CERT_CMD = (
+    'openssl',
+    'req',
+    '-x509',
+    '-newkey',
+    'ec',
+    '-pkeyopt',
+    'ec_paramgen_curve:prime256v1',
+    '-nodes',
+    '-days',
+    '1',
+    '-subj',
+    '/CN=localhost',
+    '-addext',
+    'subjectAltName=DNS:localhost,IP:127.0.0.1',
+    '-keyout',
+    'localhost.key',
+    '-out',
+    'localhost.pem',
+)
+
+
+@cache
+def _certificate_dir() -> TemporaryDirectory[str]:
+    cert_dir = TemporaryDirectory(prefix='m-testing-')
+    subprocess.run(  # noqa: S603
+        CERT_CMD,
+        cwd=cert_dir.name,
+        check=True,
+        capture_output=True,
+    )
+    return cert_dir
+
+
+def certificate_files() -> tuple[str, str]:
+    """Paths to the certificate and the private key of the test servers.
+
+    The certificate is created with `openssl` the first time it is needed
+    and removed when the process exits. It is only meant to be used by
+    tests.
+
+    Returns:
+        The paths to the certificate and to the private key.
+    """
+    cert_dir = Path(_certificate_dir().name)
+    return str(cert_dir / 'localhost.pem'), str(cert_dir / 'localhost.key')
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """A request handler that does not log the requests."""
+
+    def log_message(self, *args: Any) -> None:
+        """Silence the server logs.
+
+        Args:
+            args: The format and the values of the log message.
+        """
+
+
+class _CountingServer(ThreadingHTTPServer):
+    """Keep track of the connections accepted by the server."""
+
+    daemon_threads = True
+    connections = 0
+
+    def get_request(self) -> Any:
+        """Accept a connection.
+
+        Returns:
+            The socket and the address of the client.
+        """
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+
+class LocalServer:
+    """An http(s) server running in a thread on the loopback interface.
+
+    usage::
+
+        with LocalServer(Handler, tls=True) as server:
+            fetch(f'{server.url}/path', {})
+            assert server.connections == 1
+
+    With `tls` enabled the server uses a self signed certificate created with
+    `openssl`. Use `client_context` to create an `SSLContext` that trusts it.
+    """
+
+    def __init__(
+        self,
+        handler: Type[BaseHTTPRequestHandler],
+        tls: bool = False,
+    ):
+        """Create the server, it starts handling requests on `start`.
+
+        Args:
+            handler: The class handling the requests.
+            tls: Serve https instead of http.
+        """
+        self.tls = tls
+        self.httpd = _CountingServer(('127.0.0.1', 0), handler)
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*certificate_files())
+            self.httpd.socket = context.wrap_socket(
+                self.httpd.socket,
+                server_side=True,
+            )
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            daemon=True,
+        )
+
+    @property
+    def host(self) -> str:
+        """Host and port the server is listening on.
+
+        Returns:
+            A string of the form `localhost:port`.
+        """
+        return f'localhost:{self.httpd.server_address[1]}'
+
+    @property
+    def url(self) -> str:
+        """Base url of the server.
+
+        Returns:
+            The url without a trailing slash.
+        """
+        protocol = 'https' if self.tls else 'http'
+        return f'{protocol}://{self.host}'
+
+    @property
+    def connections(self) -> int:
+        """Number of connections accepted, one per TLS handshake.
+
+        Returns:
+            The number of accepted connections.
+        """
+        return self.httpd.connections
+
+    @staticmethod
+    def client_context() -> ssl.SSLContext:
+        """Create a client context that trusts the server certificate.
+
+        Returns:
+            An `SSLContext` to use in https connections to the server.
+        """
+        cert_file, _ = certificate_files()
+        return ssl.create_default_context(cafile=cert_file)
+
+    def start(self) -> Self:
+        """Start serving requests.
+
+        Returns:
+            The server instance.
+        """
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self) -> Self:
+        """Start the server.
+
+        Returns:
+            The server instance.
+        """
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the server.
+
+        Args:
+            exc_type: The type of the exception raised in the block.
+            exc_value: The exception raised in the block.
+            traceback: The traceback of the exception.
+        """
+        self.stop()
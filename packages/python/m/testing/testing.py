@@ -1,3 +1,4 @@
+import ipaddress
 import os
 import socket
 from functools import partial
@@ -6,21 +7,54 @@ from typing import Any
 from pydantic import BaseModel, Field
 
 
+def _is_local(address: Any) -> bool:
+    if isinstance(address, (str, bytes)):
+        # unix domain socket
+        return True
+    host = address[0]
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
 class BlockNetwork(socket.socket):
-    """Implements a socket that blocks all network calls."""
+    """Implements a socket that blocks all non local network calls.
+
+    Connections to the loopback interface are allowed so that tests may run
+    against local servers.
+    """
 
-    # pylint: disable-next=super-init-not-called
-    def __init__(self, *args: Any, **kwargs: Any):
-        """Raise an error if called.
+    def connect(self, address: Any) -> None:
+        """Raise an error if the address is not local.
 
         Args:
-            args: ...
-            kwargs: ...
+            address: The address to connect to.
 
         Raises:
-            RuntimeError: Always.
+            RuntimeError: If the address is not local.
+        """
+        if not _is_local(address):
+            raise RuntimeError('Network call blocked')
+        super().connect(address)
+
+    def connect_ex(self, address: Any) -> int:
+        """Raise an error if the address is not local.
+
+        Args:
+            address: The address to connect to.
+
+        Raises:
+            RuntimeError: If the address is not local.
+
+        Returns:
+            The error indicator of the connection.
         """
-        raise RuntimeError('Network call blocked')
+        if not _is_local(address):
+            raise RuntimeError('Network call blocked')
+        return super().connect_ex(address)
 
 
 class ActionStepTestCase(BaseModel):
@@ -119,8 +153,8 @@ def block_network_access() -> None:
     do not depend on other local services it is a good idea to call this before
     any of our tests runs.
 
-    Otherwise we may want to modify this function to allow certain hosts to be
-    called. (PRs welcomed).
+    Only connections to the loopback interface are allowed, see
+    [`m.testing.LocalServer`][m.testing.LocalServer].
     """
     # making sure that no calls to the internet are done
     socket.socket = BlockNetwork  # type: ignore
@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+
+import pytest
+from m.ci.celt.core.baseline import Baseline, open_baseline
+from m.ci.celt.core.types import Configuration, ExitCode
+from m.ci.celt.post_processor import get_post_processor
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+CONFIG = {'allowedFlake8Rules': {'E1': 2, 'E2': 1}}
+
+
+@pytest.fixture
+def workdir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.py').write_text('a = 1\n')
+    (tmp_path / 'b.py').write_text('b = 1\n')
+    return tmp_path
+
+
+def _run(payload: str, baseline: Baseline):
+    tool = assert_ok(get_post_processor('flake8', Configuration()))
+    return assert_ok(tool.run_incremental(payload, CONFIG, baseline))
+
+
+def test_incremental_run(workdir: Path) -> None:
+    index = assert_ok(open_baseline(str(workdir / 'celt.db')))
+    full = _run(
+        'a.py:1:1: E1 m1\na.py:2:1: E1 m2\nb.py:1:1: E2 m3\n',
+        Baseline(index, 'flake8'),
+    )
+    assert full.status == ExitCode.ok
+    assert index.file_counts('flake8', ()) == {
+        'a.py': {'E1': 2},
+        'b.py': {'E2': 1},
+    }
+
+    # Only b.py was linted, a.py counts come from the index.
+    extra = _run(
+        'b.py:1:1: E2 m3\nb.py:2:1: E2 m4\n',
+        Baseline(index, 'flake8', ['b.py']),
+    )
+    assert extra.status == ExitCode.error
+    assert extra.rules['E1'].found == 2
+    assert not extra.rules['E1'].violations
+    assert extra.rules['E2'].found == 2
+    assert extra.file_totals == {'a.py': 2, 'b.py': 2}
+    assert extra.error_msg == '1 extra errors were introduced'
+
+    fixed = _run('', Baseline(index, 'flake8', ['b.py']))
+    assert fixed.status == ExitCode.needs_readjustment
+    assert fixed.rules['E2'].found == 0
+    assert index.file_counts('flake8', ()) == {'a.py': {'E1': 2}}
+    assert index.file_counts('pylint', ()) == {}
+    index.close()
+
+
+def test_stale_files(workdir: Path) -> None:
+    index = assert_ok(open_baseline(str(workdir / 'celt.db')))
+    _run('a.py:1:1: E1 m1\n', Baseline(index, 'flake8', ['a.py', 'b.py']))
+    assert index.stale_files('flake8') == []
+    (workdir / 'b.py').write_text('b = 2\n')
+    assert index.stale_files('flake8') == ['b.py']
+    index.close()
+
+
+def test_stale_files_stamp(workdir: Path) -> None:
+    old_time = 1_000_000_000
+    os.utime(workdir / 'b.py', (old_time, old_time))
+    index = assert_ok(open_baseline(str(workdir / 'celt.db')))
+    _run('', Baseline(index, 'flake8', ['a.py', 'b.py']))
+
+    # b.py keeps its size and mtime so it is not hashed again, a.py was
+    # indexed right after being written so it is always hashed
+    (workdir / 'a.py').write_text('a = 2\n')
+    (workdir / 'b.py').write_text('b = 2\n')
+    os.utime(workdir / 'b.py', (old_time, old_time))
+    assert index.stale_files('flake8') == ['a.py']
+    index.close()
+
+
+def test_open_baseline_bad(tmp_path: Path) -> None:
+    assert_issue(
+        open_baseline(str(tmp_path / 'missing' / 'celt.db')),
+        'failed to open the baseline index',
+    )
+
+
+def test_unlisted_changes(workdir: Path) -> None:
+    index = assert_ok(open_baseline(str(workdir / 'celt.db')))
+    tool = assert_ok(get_post_processor('flake8', Configuration()))
+    payload = 'a.py:1:1: E1 m1\nb.py:1:1: E2 m2\n'
+    _run(payload, Baseline(index, 'flake8'))
+    (workdir / 'b.py').write_text('b = 2\n')
+    res = tool.run_incremental('', CONFIG, Baseline(index, 'flake8', ['a.py']))
+    err = assert_issue(res, 'files changed since they were indexed')
+    assert issue_context(err)['files'] == ['b.py']
+
+    # deleted files have no violations left
+    (workdir / 'b.py').unlink()
+    project = _run('', Baseline(index, 'flake8', ['a.py']))
+    assert project.file_totals == {}
+    assert index.file_counts('flake8', ()) == {}
+    index.close()
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from m.ci.celt import batch
+from m.ci.celt.core.types import Configuration, ExitCode
+from tests.conftest import assert_issue, assert_ok
+
+PYCODESTYLE = '\n'.join([
+    'src/a.py:1:2: E303 too many blank lines (4)',
+    'src/b.py:3:4: W291 trailing whitespace',
+])
+
+
+def _manifest(tmp_path: Path) -> Path:
+    (tmp_path / 'flake8.txt').write_text(PYCODESTYLE)
+    (tmp_path / 'cfg.json').write_text('{"allowedFlake8Rules": {"E303": 1}}')
+    manifest = tmp_path / 'manifest.yaml'
+    manifest.write_text('\n'.join([
+        'tools:',
+        '  - tool: flake8',
+        f'    payload: {tmp_path}/flake8.txt',
+        f'    config: {tmp_path}/cfg.json',
+        '  - tool: pycodestyle',
+        f'    payload: "@{tmp_path}/flake8.txt"',
+        '    config:',
+        '      allowedPycodestyleRules: {E303: 1, W291: 1}',
+        '  - tool: flake8',
+        f'    payload: {tmp_path}/flake8.txt',
+        '    fileRegex: src/a',
+        '  - tool: unknown',
+        '    payload: missing.txt',
+    ]))
+    return manifest
+
+
+def test_run_batch(tmp_path: Path) -> None:
+    manifest = assert_ok(batch.load_manifest(str(_manifest(tmp_path))))
+    default_config = {'allowedFlake8Rules': {'E303': 2}}
+    results = batch.run_batch(
+        manifest.tools,
+        Configuration(),
+        default_config,
+        max_workers=2,
+    )
+    assert [res.status for res in results] == [
+        ExitCode.error,
+        ExitCode.ok,
+        ExitCode.needs_readjustment,
+        ExitCode.error,
+    ]
+    assert 'src/b.py:3:4' in results[0].output
+    assert results[0].error_msg == '1 extra errors were introduced'
+    assert 'W291' not in results[2].output
+    assert results[3].issue is not None
+    assert results[3].issue['message'] == (
+        'unknown is not a supported post processor'
+    )
+    assert batch.combined_status(results) == ExitCode.error
+    assert batch.combined_status(results[1:3]) == ExitCode.needs_readjustment
+    assert batch.combined_status(results[1:2]) == ExitCode.ok
+
+
+def test_run_batch_stats(tmp_path: Path) -> None:
+    manifest = assert_ok(batch.load_manifest(str(_manifest(tmp_path))))
+    results = batch.run_batch(
+        manifest.tools[:1],
+        Configuration(),
+        {},
+        stats_only=True,
+    )
+    assert '"allowedFlake8Rules"' in results[0].output
+
+
+def test_load_manifest_bad(tmp_path: Path) -> None:
+    manifest = tmp_path / 'manifest.yaml'
+    manifest.write_text('tools:\n  - payload: a.txt\n')
+    assert_issue(
+        batch.load_manifest(str(manifest)),
+        'pydantic.load_model_failure',
+    )
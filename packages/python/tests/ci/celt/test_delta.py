@@ -0,0 +1,82 @@
+from m.ci.celt.core import delta
+from m.ci.celt.core.types import ExitCode, FileReport, Violation
+
+from ...util import FpTestCase
+
+
+def _report(file_path: str, *violations: Violation) -> FileReport:
+    return FileReport(file_path, list(violations))
+
+
+class DeltaTest(FpTestCase):
+    """Collection of tests for the celt delta mode."""
+
+    def test_normalize_message(self):
+        """Remove locations and extra whitespace from the messages."""
+        self.assertEqual(
+            delta.normalize_message(' redefined  from line 12\n'),
+            'redefined from line #',
+        )
+        self.assertEqual(
+            delta.normalize_message('too many arguments (7/5)'),
+            'too many arguments (7/5)',
+        )
+
+    def test_line_shift(self):
+        """Match violations that moved after lines were added."""
+        base = [_report(
+            'a.py',
+            Violation('E1', 'm1', 1, 1, 'a.py'),
+            Violation('E2', 'unused at line 3', 3, 1, 'a.py'),
+        )]
+        head = [_report(
+            'a.py',
+            Violation('E1', 'm1', 5, 1, 'a.py'),
+            Violation('E2', 'unused at line 7', 7, 1, 'a.py'),
+            Violation('E2', 'other', 8, 1, 'a.py'),
+        )]
+        self.assertEqual(
+            delta.new_violations(base, head),
+            [Violation('E2', 'other', 8, 1, 'a.py')],
+        )
+
+    def test_duplicates(self):
+        """Prefer the violations on the same line when keys repeat."""
+        base = [_report(
+            'a.py',
+            Violation('E1', 'm1', 4, 1, 'a.py'),
+            Violation('E1', 'm1', 9, 1, 'a.py'),
+        )]
+        head = [_report(
+            'a.py',
+            Violation('E1', 'm1', 2, 1, 'a.py'),
+            Violation('E1', 'm1', 4, 1, 'a.py'),
+            Violation('E1', 'm1', 9, 1, 'a.py'),
+        )]
+        self.assertEqual(
+            delta.new_violations(base, head),
+            [Violation('E1', 'm1', 2, 1, 'a.py')],
+        )
+        self.assertEqual(delta.new_violations(head, base), [])
+
+    def test_other_files(self):
+        """Do not match violations from different files."""
+        base = [_report('a.py', Violation('E1', 'm1', 1, 1, 'a.py'))]
+        head = [_report('b.py', Violation('E1', 'm1', 1, 1, 'b.py'))]
+        self.assertEqual(delta.new_violations(base, head), head[0].violations)
+
+    def test_delta_status(self):
+        """Report every new violation of the rules not ignored."""
+        violations = [
+            Violation('E1', 'm1', 1, 1, 'a.py'),
+            Violation('E2', 'm2', 2, 1, 'a.py'),
+            Violation('E1', 'm3', 3, 1, 'b.py'),
+        ]
+        project = delta.get_delta_status('', violations, {'E2': 'why'})
+        self.assertEqual(project.status, ExitCode.error)
+        self.assertEqual(project.rules['E1'].found, 2)
+        self.assertTrue(project.rules['E2'].ignored)
+        self.assertEqual(project.file_totals, {'a.py': 2, 'b.py': 1})
+        self.assertEqual(project.error_msg, '2 extra errors were introduced')
+        ignored = delta.get_delta_status('', violations[1:2], {'E2': 'why'})
+        self.assertEqual(ignored.status, ExitCode.ok)
@@ -0,0 +1,79 @@
+import io
+import json
+
+from m.ci.celt.core import formats
+from m.ci.celt.core.types import ExitCode, ProjectStatus, RuleInfo, Violation
+
+from ...util import FpTestCase
+
+E1 = [
+    Violation('E1', 'bad, 100%', 1, 2, 'src/a:b.py'),
+    Violation('E1', 'two\nlines', 3, 0, 'b.py'),
+    Violation('E1', 'm3', 0, 0, 'c.py'),
+]
+E2 = [Violation('E2', 'm4', 4, 1, 'a.py')]
+PROJECT = ProjectStatus(
+    ExitCode.error,
+    '',
+    {
+        'E1': RuleInfo('E1', E1, 3, 1),
+        'E2': RuleInfo('E2', E2, 1, 1),
+        'E3': RuleInfo('E3', E2, 1, 0, ignored=True),
+    },
+    {},
+)
+
+
+class FormatsTest(FpTestCase):
+    """Collection of tests for the celt output formats."""
+
+    def test_sarif(self):
+        """Generate a valid SARIF log, skipping the ignored rules."""
+        stream = io.StringIO()
+        formats.write_chunks(formats.sarif_chunks('flake8', PROJECT), stream)
+        sarif = json.loads(stream.getvalue())
+        self.assertEqual(sarif['version'], '2.1.0')
+        run = sarif['runs'][0]
+        self.assertEqual(run['tool']['driver'], {
+            'name': 'flake8',
+            'rules': [{'id': 'E1'}, {'id': 'E2'}],
+        })
+        results = run['results']
+        self.assertEqual(
+            [(res['ruleId'], res['level']) for res in results],
+            [('E1', 'error'), ('E1', 'error'), ('E1', 'error'),
+             ('E2', 'warning')],
+        )
+        locations = [
+            res['locations'][0]['physicalLocation'] for res in results
+        ]
+        self.assertEqual(locations[0], {
+            'artifactLocation': {'uri': 'src/a:b.py'},
+            'region': {'startLine': 1, 'startColumn': 2},
+        })
+        self.assertEqual(locations[1]['region'], {'startLine': 3})
+        self.assertNotIn('region', locations[2])
+
+    def test_sarif_empty(self):
+        """Generate a SARIF log without results."""
+        project = ProjectStatus(ExitCode.ok, '', {}, {})
+        sarif = json.loads(''.join(formats.sarif_chunks('ruff', project)))
+        self.assertEqual(sarif['runs'][0]['results'], [])
+
+    def test_github_annotations(self):
+        """Annotate only the rules that exceeded their allowance."""
+        lines = list(formats.github_annotations(PROJECT, -1))
+        self.assertEqual(lines, [
+            '::error file=src/a%3Ab.py,line=1,col=2::E1: bad, 100%25\n',
+            '::error file=b.py,line=3::E1: two%0Alines\n',
+            '::error file=c.py::E1: m3\n',
+        ])
+
+    def test_github_annotations_limit(self):
+        """Stop annotating at the limit and report the rest."""
+        lines = list(formats.github_annotations(PROJECT, 1))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(
+            lines[1],
+            '::notice::2 more violations were not annotated\n',
+        )
@@ -0,0 +1,67 @@
+import os
+from functools import cmp_to_key
+from unittest.mock import patch
+
+from m.ci.celt.core import io
+from m.ci.celt.core.types import (
+    Configuration,
+    ExitCode,
+    ProjectStatus,
+    RuleInfo,
+    Violation,
+)
+
+from ...util import FpTestCase
+
+
+def _legacy_compare(rule_a: RuleInfo, rule_b: RuleInfo) -> int:
+    diff = rule_a.found - rule_b.found or rule_a.allowed - rule_b.allowed
+    if not diff:
+        return 1 if rule_a.rule_id < rule_b.rule_id else -1
+    return diff
+
+
+class IoTest(FpTestCase):
+    """Collection of tests for the celt io module."""
+
+    def test_sort_rules(self):
+        """Sort with a key in the same order as the previous comparator."""
+        rules = {
+            rule_id: RuleInfo(rule_id, [], found, allowed, ignored=False)
+            for rule_id, found, allowed in (
+                ('a', 3, 0), ('b', 1, 1), ('c', 3, 0), ('d', 1, 0), ('e', 3, 2),
+            )
+        }
+        expected = sorted(rules.values(), key=cmp_to_key(_legacy_compare))
+        self.assertEqual(io.sort_rules(rules), expected)
+        self.assertEqual(
+            [rule.rule_id for rule in expected],
+            ['d', 'b', 'c', 'a', 'e'],
+        )
+
+    def test_top_files(self):
+        """Select the files with the most violations."""
+        totals = {'a': 2, 'b': 5, 'c': 2, 'd': 1, 'e': 5}
+        self.assertEqual(io.top_files(totals, -1), [
+            ('d', 1), ('a', 2), ('c', 2), ('b', 5), ('e', 5),
+        ])
+        self.assertEqual(io.top_files(totals, 3), [
+            ('c', 2), ('b', 5), ('e', 5),
+        ])
+        self.assertEqual(io.top_files(totals, 0), [])
+        self.assertEqual(io.top_files(totals, 10), io.top_files(totals, -1))
+
+    @patch.dict(os.environ, {'NO_COLOR': 'true'})
+    def test_max_files(self):
+        """Cap the FILES section."""
+        violation = Violation('R1', 'msg', 1, 1, 'a.py')
+        project = ProjectStatus(
+            ExitCode.error,
+            '',
+            {'R1': RuleInfo('R1', [violation], 7, 0, ignored=False)},
+            {},
+            {'a.py': 1, 'b.py': 4, 'c.py': 2},
+        )
+        output = io.project_status_str(project, Configuration(max_files=2))
+        self.assertIn('... and 1 more\n  c.py: found 2\n  b.py: found 4', output)
+        self.assertNotIn('a.py: found', output)
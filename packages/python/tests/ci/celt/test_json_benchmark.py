@@ -0,0 +1,85 @@
+import json
+import os
+import time
+from collections.abc import Callable
+from typing import Any, List
+
+import pytest
+from m.ci.celt.post_processors import eslint
+from m.core.json import json_backends
+from m.pydantic import parse_json_model
+
+REPORT_MB = 50
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get('M_BENCHMARK'),
+    reason='set M_BENCHMARK=1 to run the benchmarks',
+)
+
+
+def _eslint_report(size_mb: int) -> str:
+    source = 'export const value = compute(input);\n' * 40
+    rules = ('no-unused-vars', 'semi', 'quotes', 'max-len', 'no-console')
+    files = []
+    total = 0
+    index = 0
+    while total < size_mb * 2**20:
+        messages = [
+            {
+                'ruleId': rules[num % len(rules)],
+                'severity': 2,
+                'message': f'Unexpected usage of "value{num}" in this scope.',
+                'line': num + 1,
+                'column': num % 80 + 1,
+                'nodeType': 'Identifier',
+                'messageId': 'unexpected',
+                'endLine': num + 1,
+                'endColumn': num % 80 + 6,
+            }
+            for num in range(index % 25)
+        ]
+        entry = json.dumps({
+            'filePath': f'/workspaces/app/src/pkg{index % 40}/mod{index}.ts',
+            'messages': messages,
+            'suppressedMessages': [],
+            'errorCount': len(messages),
+            'fatalErrorCount': 0,
+            'warningCount': 0,
+            'fixableErrorCount': 0,
+            'fixableWarningCount': 0,
+            'source': source,
+            'usedDeprecatedRules': [],
+        })
+        files.append(entry)
+        total += len(entry) + 1
+        index += 1
+    return f'[{",".join(files)}]'
+
+
+def _throughput(decode: Callable[[str], Any], payload: str) -> float:
+    start = time.perf_counter()
+    decode(payload)
+    return len(payload) / 2**20 / (time.perf_counter() - start)
+
+
+def test_eslint_decode_throughput(capsys: pytest.CaptureFixture) -> None:
+    payload = _eslint_report(REPORT_MB)
+    decoders: dict[str, Callable[[str], Any]] = {
+        name: backend.loads
+        for name, backend in json_backends().items()
+    }
+    decoders['pydantic (typed)'] = lambda text: parse_json_model(
+        List[eslint.EslintFile],
+        text,
+    ).value
+    decoders['eslint.read_payload'] = eslint.read_payload
+    results = {
+        name: _throughput(decode, payload)
+        for name, decode in decoders.items()
+    }
+    size = len(payload) / 2**20
+    with capsys.disabled():
+        print(f'\neslint report: {size:.1f} MB')  # noqa: WPS421
+        for name, mb_per_sec in results.items():
+            print(f'{name:>20}: {mb_per_sec:8.1f} MB/s')  # noqa: WPS421
+    assert all(mb_per_sec > 0 for mb_per_sec in results.values())
@@ -0,0 +1,68 @@
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+from m.ci.celt import post_processor
+from m.ci.celt.core.types import Configuration
+from m.ci.celt.post_processors import pycodestyle
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok
+
+GROUP = post_processor.ENTRY_POINT_GROUP
+ENTRY_POINTS = [
+    EntryPoint('mypy', 'm.ci.celt.post_processors.pycodestyle', GROUP),
+    EntryPoint('no_payload', 'm.ci.celt.core.types', GROUP),
+    EntryPoint('missing', 'celt_missing.processor', GROUP),
+]
+
+
+@pytest.fixture
+def registered(mocker: MockerFixture) -> None:
+    def _entry_points(group: str, name: str | None = None):
+        return [
+            entry
+            for entry in ENTRY_POINTS
+            if entry.group == group and name in {None, entry.name}
+        ]
+    mocker.patch.object(post_processor, 'entry_points', _entry_points)
+
+
+def test_lazy_import(mocker: MockerFixture) -> None:
+    prefix = 'm.ci.celt.post_processors.'
+    modules = {
+        name: module
+        for name, module in sys.modules.items()
+        if not name.startswith(prefix)
+    }
+    mocker.patch.dict(sys.modules, modules, clear=True)
+    assert_ok(post_processor.get_post_processor('flake8', Configuration()))
+    loaded = [name for name in sys.modules if name.startswith(prefix)]
+    assert loaded == [f'{prefix}pycodestyle']
+
+
+@pytest.mark.usefixtures('registered')
+def test_entry_point_processor() -> None:
+    tool = assert_ok(post_processor.get_post_processor('mypy', Configuration()))
+    assert tool.name == 'mypy'
+    assert tool.transform is pycodestyle.read_payload
+    assert tool.stream_transform is pycodestyle.read_stream
+    available = post_processor.available_post_processors()
+    assert available['mypy'] == 'm.ci.celt.post_processors.pycodestyle'
+    assert available['eslint'] == 'm.ci.celt.post_processors.eslint'
+
+
+@pytest.mark.usefixtures('registered')
+def test_entry_point_errors() -> None:
+    config = Configuration()
+    assert_issue(
+        post_processor.get_post_processor('no_payload', config),
+        'no_payload post processor does not define read_payload',
+    )
+    assert_issue(
+        post_processor.get_post_processor('missing', config),
+        'unable to load the missing post processor',
+    )
+    assert_issue(
+        post_processor.get_post_processor('unknown', config),
+        'unknown is not a supported post processor',
+    )
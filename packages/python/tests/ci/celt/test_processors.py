@@ -1,5 +1,6 @@
 import inspect
 import os
+from io import StringIO
 from typing import List, cast
 
 import pytest
@@ -7,6 +8,8 @@ from m.ci.celt.core.process import PostProcessor
 from m.ci.celt.core.types import Configuration, ExitCode, ProjectStatus
 from m.ci.celt.post_processor import get_post_processor
 
+from tests.conftest import assert_issue
+
 from ...util import FpTestCase, read_fixture
 
 
@@ -277,3 +280,47 @@ class CeltTest(FpTestCase):
             project.error_msg,
             '4 extra errors were introduced',
         )
+
+
+@pytest.mark.parametrize(('name', 'fixture'), [
+    ('eslint', 'eslint_payload.json'),
+    ('eslint', 'eslint_payload_clear.json'),
+    ('pycodestyle', 'pycodestyle_payload.txt'),
+    ('pylint', 'pylint_payload.json'),
+    ('pylint', 'pylint_payload_order.json'),
+])
+def test_stream_matches_payload(name: str, fixture: str) -> None:
+    payload = read_fixture(fixture)
+    config = {f'allowed{name.capitalize()}Rules': {'semi': 2}}
+    processor = _post_processor(name)
+    project = cast(ProjectStatus, processor.run(payload, config).value)
+    stream_res = processor.run_stream(StringIO(payload), config)
+    assert not stream_res.is_bad
+    streamed = cast(ProjectStatus, stream_res.value)
+    assert streamed.status == project.status
+    assert streamed.error_msg == project.error_msg
+    assert streamed.file_totals == project.file_totals
+    assert processor.to_str(streamed) == processor.to_str(project)
+    assert processor.stats_json(streamed) == processor.stats_json(project)
+
+
+def test_stream_keeps_max_lines() -> None:
+    line = 'path/to/f{0}.py:{0}:1: E303 too many blank lines (4)\n'
+    payload = ''.join(line.format(num) for num in range(100))
+    processor = _post_processor('flake8')
+    processor.celt_config.max_lines = 3
+    processor.celt_config.file_prefix = 'path/to:src'
+    stream_res = processor.run_stream(StringIO(payload), {})
+    project = cast(ProjectStatus, stream_res.value)
+    rule = project.rules['E303']
+    assert rule.found == 100
+    assert len(rule.violations) == 3
+    assert rule.violations[0].file_path == 'src/f0.py'
+    assert len(project.file_totals) == 100
+    assert '... and 97 more' in processor.to_str(project)
+
+
+def test_stream_bad_json() -> None:
+    pylint = _post_processor('pylint')
+    result = pylint.run_stream(StringIO('[{"symbol": "a"'), {})
+    assert_issue(result, 'failed to process the payload stream')
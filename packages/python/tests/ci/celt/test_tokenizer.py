@@ -0,0 +1,64 @@
+from m.ci.celt.core import tokenizer
+from m.ci.celt.core.types import FileReport, Violation
+from m.ci.celt.post_processors import pycodestyle, typescript
+
+from ...util import FpTestCase
+
+PAYLOAD = '\r\n'.join([
+    'C:/repo/a.py:1:2: E303 too many blank lines (4)',
+    'not a violation',
+    '/abs/path/to/b.py:3:4: W291 see /abs/path/to/a.py',
+    '',
+])
+
+
+class TokenizerTest(FpTestCase):
+    """Collection of tests for the celt tokenizer module."""
+
+    def test_tokenize(self):
+        """Extract the violations in a single pass."""
+        violations = list(pycodestyle.TOKENIZER.tokenize(PAYLOAD).view())
+        self.assertEqual(violations, [
+            Violation('E303', 'too many blank lines (4)', 1, 2, 'C:/repo/a.py'),
+            Violation(
+                'W291', 'see /abs/path/to/a.py', 3, 4, '/abs/path/to/b.py',
+            ),
+        ])
+        lines = PAYLOAD.splitlines(keepends=True)
+        streamed = list(pycodestyle.TOKENIZER.tokenize_lines(lines))
+        self.assertEqual(streamed, violations)
+
+    def test_tokenize_typescript(self):
+        """Skip the lines that continue a message."""
+        payload = '\n'.join([
+            'src/(a).ts(12,20): error TS2345: Argument of type.',
+            '  Type (12,20): error TS1: is not assignable.',
+        ])
+        violations = list(typescript.TOKENIZER.tokenize(payload).view())
+        self.assertEqual(violations, [
+            Violation('TS2345', 'Argument of type.', 12, 20, 'src/(a).ts'),
+        ])
+
+    def test_path_replacer(self):
+        """Replace prefixes in paths and messages."""
+        replacer = tokenizer.path_replacer('/abs/path/to|path/to:REPO').value
+        assert replacer is not None
+        self.assertEqual(replacer.path('/abs/path/to/b.py'), 'REPO/b.py')
+        self.assertEqual(replacer.cache, {'/abs/path/to/b.py': 'REPO/b.py'})
+        self.assertEqual(replacer.message('see path/to/a.py'), 'see REPO/a.py')
+        self.assertEqual(replacer.message('no paths'), 'no paths')
+
+    def test_replace_paths_merge(self):
+        """Merge reports that end up with the same path."""
+        replacer = tokenizer.path_replacer('/ws/|/gh/:').value
+        reports = [
+            FileReport('/ws/a.py', [Violation('R1', 'm1', 1, 1, '/ws/a.py')]),
+            FileReport('/gh/a.py', [Violation('R2', 'm2', 1, 1, '/gh/a.py')]),
+        ]
+        merged = tokenizer.replace_paths(reports, replacer)
+        self.assertEqual(merged, [
+            FileReport('a.py', [
+                Violation('R1', 'm1', 1, 1, 'a.py'),
+                Violation('R2', 'm2', 1, 1, 'a.py'),
+            ]),
+        ])
@@ -0,0 +1,76 @@
+from array import array
+
+from m.ci.celt.core import process
+from m.ci.celt.core.types import FileReport, Violation, ViolationTable
+
+from ...util import FpTestCase
+
+VIOLATIONS = [
+    Violation('R1', 'm1', 1, 2, 'a.py'),
+    Violation('R2', 'mensaje ñ', 3, 4, 'b.py'),
+    Violation('R1', 'm3', 5, 6, 'b.py'),
+]
+
+
+class ViolationTableTest(FpTestCase):
+    """Collection of tests for the celt `ViolationTable`."""
+
+    def test_columns(self):
+        """Intern the rules and files, store the rest in columns."""
+        table = ViolationTable.from_violations(VIOLATIONS)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.rule_ids, ['R1', 'R2'])
+        self.assertEqual(table.file_paths, ['a.py', 'b.py'])
+        self.assertEqual(table.rules, array('I', [0, 1, 0]))
+        self.assertEqual(table.lines, array('I', [1, 3, 5]))
+        self.assertEqual(table.message(1), 'mensaje ñ')
+        self.assertEqual(table.violation(2), VIOLATIONS[2])
+        self.assertEqual(list(table.view()), VIOLATIONS)
+
+    def test_missing_location(self):
+        """Store missing lines and columns as 0."""
+        table = ViolationTable()
+        table.append('R1', 'm1', None, None, 'a.py')  # type: ignore
+        violation = table.violation(0)
+        self.assertEqual(violation, Violation('R1', 'm1', 0, 0, 'a.py'))
+
+    def test_views(self):
+        """Group rows into views without creating violations."""
+        table = ViolationTable.from_violations(VIOLATIONS)
+        by_rule = table.by_rule(range(len(table)))
+        self.assertEqual(list(by_rule), ['R1', 'R2'])
+        self.assertEqual(by_rule['R1'].rows, array('I', [0, 2]))
+        self.assertEqual(by_rule['R1'], [VIOLATIONS[0], VIOLATIONS[2]])
+        self.assertEqual(by_rule['R1'][1:], [VIOLATIONS[2]])
+        self.assertEqual(table.file_reports(), [
+            FileReport('a.py', [VIOLATIONS[0]]),
+            FileReport('b.py', VIOLATIONS[1:]),
+        ])
+
+    def test_rename_files(self):
+        """Merge files renamed to the same path and rewrite messages."""
+        table = ViolationTable.from_violations(VIOLATIONS)
+        table.rename_files(lambda _: 'c.py')
+        table.message_hook = str.upper
+        self.assertEqual(table.file_paths, ['c.py'])
+        self.assertEqual(table.files, array('I', [0, 0, 0]))
+        violation = table.violation(0)
+        self.assertEqual(violation, Violation('R1', 'M1', 1, 2, 'c.py'))
+
+    def test_from_reports(self):
+        """Reuse the table when the reports cover every row."""
+        table = ViolationTable.from_violations(VIOLATIONS)
+        reports = table.file_reports()
+        self.assertIs(ViolationTable.from_reports(reports), table)
+        partial = ViolationTable.from_reports(reports[1:])
+        self.assertIsNot(partial, table)
+        self.assertEqual(list(partial.view()), VIOLATIONS[1:])
+
+    def test_rules_dict_views(self):
+        """Map rules to views of the table in order of appearance."""
+        reports = ViolationTable.from_violations(VIOLATIONS).file_reports()
+        rules = process.to_rules_dict(reports[1:])
+        self.assertEqual(rules, {
+            'R2': [VIOLATIONS[1]],
+            'R1': [VIOLATIONS[2]],
+        })
@@ -8,7 +8,7 @@ from pytest_mock import MockerFixture
 from tests.conftest import assert_issue, assert_ok
 from tests.util import read_fixture
 
-from .util import CONFIG, ENV_VARS, TCase, mock_commit_sha
+from .util import CONFIG, ENV_VARS, TCase
 
 
 @pytest.mark.parametrize('tcase', [
@@ -77,7 +77,6 @@ def test_m_flow(tcase: TCase, mocker: MockerFixture) -> None:
 
     mocker.patch('time.time').return_value = 123456789
     mocker.patch('m.core.http.fetch').side_effect = [
-        Good(mock_commit_sha('sha')),
         Good(read_fixture(tcase.gh_res)),
     ]
 
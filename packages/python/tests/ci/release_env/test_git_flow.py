@@ -8,7 +8,7 @@ from pytest_mock import MockerFixture
 from tests.conftest import assert_issue, assert_ok
 from tests.util import read_fixture
 
-from .util import CONFIG, ENV_VARS, TCase, mock_commit_sha
+from .util import CONFIG, ENV_VARS, TCase
 
 
 @pytest.mark.parametrize('tcase', [
@@ -254,7 +254,6 @@ def test_git_flow(tcase: TCase, mocker: MockerFixture) -> None:
     env_vars.ci_env = True
 
     mocker.patch('m.core.http.fetch').side_effect = [
-        Good(mock_commit_sha('sha')),
         Good(read_fixture(tcase.gh_res)),
     ]
 
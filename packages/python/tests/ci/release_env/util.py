@@ -27,18 +27,6 @@ ENV_VARS = EnvVars(  # noqa: S106 - testing, token is irrelevant
 )
 
 
-def mock_commit_sha(sha: str) -> str:
-    return f"""{{
-        "data": {{
-            "repository": {{
-                "commit": {{
-                    "message": "Merge {sha} into sha2"
-                }}
-            }}
-        }}
-    }}"""
-
-
 class TCase(BaseModel):
     desc: str
     config: dict[str, Any]
@@ -71,21 +71,26 @@ class GitEnvTest(FpTestCase):
                     dict(
                         repository=dict(
                             commit={
-                                'message': 'Merge sha1 into sha2',
-                            },
-                        ),
-                    ),
-                ),
-                Good(
-                    dict(
-                        repository=dict(
-                            commit={
-                                'oid': '123456789',
-                                'message': 'commit message',
+                                'oid': 'git-sha-abc-123',
+                                'message': 'Merge 123456789 into abcdef',
+                                'parents': {
+                                    'nodes': [
+                                        {
+                                            'oid': 'abcdef',
+                                            'message': 'base message',
+                                        },
+                                        {
+                                            'oid': '123456789',
+                                            'message': 'commit message',
+                                        },
+                                    ],
+                                },
                             },
                         ),
                     ),
                 ),
             ]
             result = get_git_env(self.config, self.env_vars)
-            self.assertFalse(result.is_bad)
+            git_env = self.assert_ok(result)
+            self.assertEqual(git_env.sha, '123456789')
+            self.assertEqual(graphql_mock.call_count, 1)
@@ -1,5 +1,7 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from pathlib import Path
 
 import pytest
 from pytest_mock import MockerFixture
@@ -44,6 +46,29 @@ class TCase(CliTestCase):
         expected_file='cfg_01_expected_ruff_err.txt',
         exit_code=1,
     ),
+    TCase(
+        cmd='m ci celt -c @cfg_01.json -t pycodestyle --stream @pycodestyle.txt',
+        expected_file='cfg_01_expected.txt',
+        exit_code=1,
+    ),
+    TCase(
+        cmd='m ci celt -c @cfg_01.json -t typescript --stream @typescript.txt',
+        expected_file='cfg_01_expected_typescript.txt',
+        exit_code=1,
+    ),
+    TCase(
+        cmd='m ci celt -c @cfg_01.json -t ruff --stream @ruff.json',
+        expected_file='cfg_01_expected_ruff.txt',
+        exit_code=1,
+    ),
+    TCase(
+        cmd=(
+            'm ci celt -c @cfg_01.json -t pycodestyle '
+            '--base @pycodestyle_base.txt @pycodestyle.txt'
+        ),
+        expected_file='cfg_01_expected_delta.txt',
+        exit_code=1,
+    ),
     TCase(
         cmd='m ci celt -c @cfg_01.json -t invalid_tool @pycodestyle.txt',
         expected_file='cfg_01_invalid_tool.txt',
@@ -51,12 +76,52 @@ class TCase(CliTestCase):
     ),
 ])
 def test_m_ci_celt(tcase: TCase, mocker: MockerFixture) -> None:
+    _run_celt(tcase, mocker)
+
+
+@pytest.mark.parametrize('tcase', [
+    TCase(
+        cmd='m ci celt -c @cfg_01.json --batch batch.yaml',
+        expected_file='batch_expected.txt',
+        exit_code=1,
+    ),
+    TCase(
+        cmd='m ci celt -c @cfg_01.json --batch missing.yaml',
+        expected_file='batch_missing.txt',
+        exit_code=1,
+    ),
+])
+def test_m_ci_celt_batch(tcase: TCase, mocker: MockerFixture) -> None:
+    # Worker processes would not see the mocked file system.
+    mocker.patch('m.ci.celt.batch.ProcessPoolExecutor', ThreadPoolExecutor)
+    _run_celt(tcase, mocker)
+
+
+def test_m_ci_celt_github_format(mocker: MockerFixture) -> None:
+    tcase = TCase(
+        cmd=(
+            'm ci celt -c @cfg_01.json -t pycodestyle @pycodestyle.txt '
+            '--format github --annotation-limit 2'
+        ),
+        expected_file='cfg_01_expected.txt',
+        exit_code=1,
+    )
+    std_out = _run_celt(tcase, mocker)
+    lines = std_out.splitlines()
+    assert len(lines) == 3
+    assert all(line.startswith('::error file=') for line in lines[:2])
+    assert lines[2].endswith('more violations were not annotated')
+
+
+def _run_celt(tcase: TCase, mocker: MockerFixture) -> str:
     # Testing with Github to make sense out of error blocks
     mocker.patch.dict(
         os.environ,
         {'GITHUB_ACTIONS': 'true', 'NO_COLOR': 'true'},
         clear=True,
     )
+    # The mocked file system cannot read the installed packages metadata.
+    mocker.patch('m.ci.celt.post_processor.entry_points', return_value=[])
     mocker.patch('pathlib.Path.exists', _file_exists)
     mocker.patch(
         'pathlib.Path.open',
@@ -67,5 +132,83 @@ def test_m_ci_celt(tcase: TCase, mocker: MockerFixture) -> None:
         ),
     )
 
-    _, std_err = run_cli(tcase.cmd, tcase.exit_code, mocker)
+    std_out, std_err = run_cli(tcase.cmd, tcase.exit_code, mocker)
     assert std_err == _get_fixture(tcase.expected_file)
+    return std_out
+
+
+def test_m_ci_celt_baseline(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    mocker.patch.dict(os.environ, {'NO_COLOR': 'true'}, clear=True)
+    (tmp_path / 'a.py').write_text('a = 1\n')
+    (tmp_path / 'b.py').write_text('b = 1\n')
+    (tmp_path / 'full.txt').write_text('a.py:1:1: E1 m1\nb.py:1:1: E1 m2\n')
+    (tmp_path / 'payload.txt').write_text('a.py:1:1: E1 m1\n')
+    (tmp_path / 'changed.txt').write_text('a.py\n')
+    cmd = 'm ci celt -t flake8 -c {"allowedFlake8Rules":{"E1":2}} '
+    cmd = f'{cmd}--baseline celt.db'
+    run_cli(f'{cmd} @full.txt', 0, mocker)
+    # b.py violations are read from the index
+    incremental = f'{cmd} --changed-files @changed.txt @payload.txt'
+    _, std_err = run_cli(incremental, 0, mocker)
+    assert std_err == 'project has 2 errors to clear\n'
+
+    (tmp_path / 'b.py').write_text('b = 2\n')
+    _, std_err = run_cli(incremental, 1, mocker)
+    assert 'files changed since they were indexed' in std_err
+    assert '"b.py"' in std_err
+
+
+@pytest.mark.parametrize('output_format', ['sarif', 'github'])
+def test_m_ci_celt_stream_formats(
+    output_format: str,
+    tmp_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.dict(os.environ, {'NO_COLOR': 'true'}, clear=True)
+    payload = tmp_path / 'payload.txt'
+    payload.write_text(''.join(
+        f'src/f{index}.py:1:1: E303 too many blank lines\n'
+        for index in range(12)
+    ))
+    cmd = (
+        f'm ci celt -t pycodestyle -c {{}} --format {output_format} '
+        f'--annotation-limit -1 @{payload}'
+    )
+    std_out, _ = run_cli(cmd, 1, mocker)
+    stream_out, _ = run_cli(f'{cmd} --stream', 1, mocker)
+    assert stream_out == std_out
+    assert std_out.count('src/f') == 12
+
+
+def test_m_ci_celt_missing_changed_files(mocker: MockerFixture) -> None:
+    cmd = ' '.join([
+        'm ci celt -t flake8 -c {}',
+        '--baseline b.db --changed-files @missing.txt',
+    ])
+    _, std_err = run_cli(cmd, 2, mocker)
+    error = 'argument --changed-files: file "missing.txt" does not exist'
+    assert error in std_err
+
+
+@pytest.mark.parametrize(('options', 'error'), [
+    ('--stream --base \\@x', 'conflicting options'),
+    ('--base \\@x --baseline celt.db', 'conflicting options'),
+    ('--changed-files a.py', '--changed-files requires --baseline'),
+    ('--output celt.sarif', '--output requires --format'),
+    ('--batch batch.yaml --format sarif', 'options not supported with --batch'),
+    ('--batch batch.yaml -t flake8', 'options not supported with --batch'),
+])
+def test_m_ci_celt_options(
+    options: str,
+    error: str,
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.dict(os.environ, {'NO_COLOR': 'true'}, clear=True)
+    cmd = f'm ci celt -c {{}} {options}'
+    _, std_err = run_cli(cmd, 1, mocker)
+    assert error in std_err
@@ -3,10 +3,14 @@ from pathlib import Path
 from typing import Any
 
 import pytest
-from m.core import Good, issue, subprocess
+from m.core import Good, issue
+from m.devcontainer.prompter import prompt_status
 from pytest_mock import MockerFixture
 from tests.cli.conftest import TCase as CliTestCase
 from tests.cli.conftest import assert_streams, run_cli
+from tests.conftest import mock_cmd_lines
+
+from m import git
 
 
 class TCase(CliTestCase):
@@ -15,20 +19,25 @@ class TCase(CliTestCase):
     environ: dict[str, str] = {}
     cmd: str = 'm devcontainer prompter'
     exit_code: int = 0
-    branch: Any
-    status: Any | None = None
-    repo_path: Any | None = None
-    cwd: str | None = None
-    rev_parse_side_effect: Any | None = None
+    status: Any = None
+    cwd: str = 'repo'
     no_color: str = 'true'
     new_line: bool = False
 
 
+def _porcelain(branch: str, *lines: str) -> Any:
+    return Good('\n'.join([
+        '# branch.oid abcdef0123456789abcdef0123456789abcdef01',
+        f'# branch.head {branch}',
+        *lines,
+    ]))
+
+
 @pytest.mark.parametrize('tcase', [
     pytest.param(
         TCase(
             expected=r'\[\]\w\[\]$ ',
-            branch=issue('not in a git repo'),
+            cwd='not_a_repo',
         ),
         id='no_git',
     ),
@@ -36,7 +45,7 @@ class TCase(CliTestCase):
         TCase(
             # wants me to write `\w` but then what do I do with \x1b?
             expected='\\[\x1b[38;5;172m\\]\\w\\[\x1b[0m\\]$ ',  # noqa: WPS342
-            branch=issue('not in a git repo'),
+            cwd='not_a_repo',
             no_color='false',
         ),
         id='no_git_with_color',
@@ -47,10 +56,7 @@ class TCase(CliTestCase):
                 '\\[\x1b[38;5;82m\\]➜ \\[\\]devcontainer\\[\\]:\\[\\]repo',
                 '\\[\\][\\[\x1b[38;5;82m\\]✔ master\\[\\]] \\[\\]^\\[\\]$ ',
             ]),
-            cwd='/home/user/repo',
-            branch=Good('master'),
-            status=Good(('clean', 'working tree clean')),
-            repo_path=Good('/home/user/repo'),
+            status=_porcelain('master', '# branch.ab +0 -0'),
         ),
         id='clean',
     ),
@@ -61,10 +67,12 @@ class TCase(CliTestCase):
                 '\\[\\][\\[\x1b[38;5;142m\\]◀ topic/feature\\[\\]]',
                 r'\[\]^/some/dir/in/repo\[\]$ ',
             ]),
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('topic/feature'),
-            status=Good(('behind', 'Your branch is behind')),
-            repo_path=Good('/home/user/repo'),
+            cwd='repo/some/dir/in/repo',
+            status=_porcelain(
+                'topic/feature',
+                '# branch.upstream origin/topic/feature',
+                '# branch.ab +0 -2',
+            ),
         ),
         id='relative_path',
     ),
@@ -79,10 +87,12 @@ class TCase(CliTestCase):
                 'DK_CONTAINER_NAME': 'container',
                 'DK_CONTAINER_VERSION': '1.2',
             },
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('topic/feature'),
-            status=Good(('behind', 'Your branch is behind')),
-            repo_path=Good('/home/user/repo'),
+            cwd='repo/some/dir/in/repo',
+            status=_porcelain(
+                'topic/feature',
+                '# branch.upstream origin/topic/feature',
+                '# branch.ab +0 -2',
+            ),
         ),
         id='container_version',
     ),
@@ -98,10 +108,12 @@ class TCase(CliTestCase):
                 'DK_CONTAINER_NAME': 'my-container',
                 'DK_CONTAINER_VERSION': '0.0.0-rc123.abc',
             },
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('topic/feature'),
-            status=Good(('behind', 'Your branch is behind')),
-            repo_path=Good('/home/user/repo'),
+            cwd='repo/some/dir/in/repo',
+            status=_porcelain(
+                'topic/feature',
+                '# branch.upstream origin/topic/feature',
+                '# branch.ab +0 -2',
+            ),
         ),
         id='container_version_rc',
     ),
@@ -117,10 +129,12 @@ class TCase(CliTestCase):
                 'DK_CONTAINER_NAME': 'my-container',
                 'DK_CONTAINER_VERSION': '0.0.0-local.abc',
             },
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('topic/feature'),
-            status=Good(('behind', 'Your branch is behind')),
-            repo_path=Good('/home/user/repo'),
+            cwd='repo/some/dir/in/repo',
+            status=_porcelain(
+                'topic/feature',
+                '# branch.upstream origin/topic/feature',
+                '# branch.ab +0 -2',
+            ),
         ),
         id='container_version_dev',
     ),
@@ -129,55 +143,78 @@ class TCase(CliTestCase):
             expected=' '.join([
                 '\\[\x1b[38;5;82m\\]➜',
                 r'\[\]my-container@[DEV]\[\]:\[\]repo',
-                '\\[\\][\\[\x1b[38;5;82m\\]✔ abcdef\\[\\]]',
+                '\\[\\][\\[\x1b[38;5;82m\\]✔ abcdef0\\[\\]]',
                 r'\[\]^/some/dir/in/repo\[\]$ ',
             ]),
             environ={
                 'DK_CONTAINER_NAME': 'my-container',
                 'DK_CONTAINER_VERSION': '0.0.0-local.abc',
             },
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('HEAD'),
-            status=Good(('clean', 'working tree clean')),
-            repo_path=Good('/home/user/repo'),
-            rev_parse_side_effect=Good('abcdef'),
+            cwd='repo/some/dir/in/repo',
+            status=_porcelain('(detached)'),
         ),
         id='short_sha',
     ),
     pytest.param(
         TCase(
-            expected=' '.join([
-                '\\[\x1b[38;5;82m\\]➜',
-                r'\[\]my-container@[DEV]\[\]:\[\]repo',
-                '\\[\\][\\[\x1b[38;5;82m\\]✔ HEAD\\[\\]]',
-                r'\[\]^/some/dir/in/repo\[\]$ ',
-            ]),
-            environ={
-                'DK_CONTAINER_NAME': 'my-container',
-                'DK_CONTAINER_VERSION': '0.0.0-local.abc',
-            },
-            cwd='/home/user/repo/some/dir/in/repo',
-            branch=Good('HEAD'),
-            status=Good(('clean', 'working tree clean')),
-            repo_path=Good('/home/user/repo'),
-            rev_parse_side_effect=issue('no short sha for you'),
+            expected=r'\[\]\w\[\]$ ',
+            status=issue('git status failure'),
         ),
-        id='no_short_sha',
+        id='status_failure',
     ),
 ])
-def test_prompter(tcase: TCase, mocker: MockerFixture) -> None:
+def test_prompter(
+    tcase: TCase,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
     mocker.patch.dict(
         os.environ,
-        {'NO_COLOR': tcase.no_color, **tcase.environ},
+        {
+            'NO_COLOR': tcase.no_color,
+            'MDC_PROMPTER_SOCKET': str(tmp_path / 'no_daemon.sock'),
+            **tcase.environ,
+        },
         clear=True,
     )
-    if tcase.cwd:
-        mocker.patch.object(Path, 'cwd').return_value = Path(tcase.cwd)
-    if tcase.rev_parse_side_effect:
-        eval_mock = mocker.patch.object(subprocess, 'eval_cmd')
-        eval_mock.return_value = tcase.rev_parse_side_effect
-    mocker.patch('m.git.get_branch').return_value = tcase.branch
-    mocker.patch('m.git.get_status').return_value = tcase.status
-    mocker.patch('m.git.get_repo_path').return_value = tcase.repo_path
+    (tmp_path / 'repo' / '.git').mkdir(parents=True)
+    mocker.patch.object(Path, 'cwd').return_value = tmp_path / tcase.cwd
+    cmd_mock = mock_cmd_lines(mocker, tcase.status or issue('no git'))
     std_out, std_err = run_cli(tcase.cmd, tcase.exit_code, mocker)
     assert_streams(std_out, std_err, tcase)
+    if tcase.status is None:
+        cmd_mock.assert_not_called()
+    else:
+        cmd_mock.assert_called_once()
+        assert cmd_mock.call_args.args[0] == ' '.join([
+            f'git -C {tmp_path}/repo --no-optional-locks status',
+            '--porcelain=v2 --branch --show-stash',
+        ])
+
+
+def test_prompter_daemon(mocker: MockerFixture, tmp_path: Path) -> None:
+    socket_path = tmp_path / 'daemon.sock'
+    socket_path.touch()
+    mocker.patch.dict(os.environ, {'MDC_PROMPTER_SOCKET': str(socket_path)})
+    mocker.patch.object(Path, 'cwd').return_value = Path('/repo')
+    request_mock = mocker.patch(
+        'm.devcontainer.prompter_daemon.request_prompt',
+        return_value=Good('[daemon]$ '),
+    )
+    std_out, std_err = run_cli('m devcontainer prompter', 0, mocker)
+    assert std_out == '[daemon]$ '
+    assert not std_err
+    request_mock.assert_called_once_with(str(socket_path), '/repo')
+
+
+@pytest.mark.parametrize(('lines', 'expected'), [
+    (['# branch.head master'], ('master', 'clean')),
+    (['# branch.head master', '# stash 2', '? new.txt'], ('master', 'stash')),
+    (['# branch.head dev', '# branch.ab +1 -3'], ('dev', 'diverged')),
+    (
+        ['# branch.oid 0123456789abcdef', '# branch.head (detached)'],
+        ('0123456', 'clean'),
+    ),
+])
+def test_prompt_status(lines: list[str], expected: tuple[str, str]) -> None:
+    assert prompt_status(git.parse_status(lines)) == expected
@@ -47,9 +47,22 @@ CMD = ('m', 'github', 'ci')
                 '--sha': '4538b2a2556efcbdfc1e7df80c4f71ade45f3958',
             }),
         ],
-        response_files=['ci_no_merge_1.json', 'ci_no_merge_2.json'],
+        response_files=['ci_no_merge.json'],
         expected_file='ci_no_merge_expected.json',
     ),
+    TCase(
+        cmd=[
+            *CMD,
+            '--merge-commit',
+            *cli_params({
+                '--owner': 'fake',
+                '--repo': 'hotdog',
+                '--sha': '4538b2a2556efcbdfc1e7df80c4f71ade45f3958',
+            }),
+        ],
+        response_files=['ci_merge.json'],
+        expected_file='ci_merge_expected.json',
+    ),
 ])
 def test_github_latest_release(tcase: TCase, mocker: MockerFixture) -> None:
     fetch_json = mocker.patch('m.core.http.fetch_json')
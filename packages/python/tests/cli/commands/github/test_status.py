@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from m.core import issue
 from m.core.fp import Good
 from pytest_mock import MockerFixture
 from tests.cli.conftest import TCase as CliTestCase
@@ -63,3 +66,95 @@ def test_github_status(tcase: TCase, mocker: MockerFixture) -> None:
     assert url == 'https://api.github.com/repos/fake/hotdog/statuses/SHA'
     assert method == 'POST'
     assert body == tcase.body_to_send
+
+
+def test_github_status_batch(mocker: MockerFixture) -> None:
+    fetch_json = mocker.patch('m.core.http.fetch_json')
+    fetch_json.return_value = Good({'id': 1})
+    statuses = [
+        {'context': 'amd64', 'state': 'success', 'description': 'built'},
+        {'context': 'arm64', 'state': 'failure', 'description': 'failed'},
+        {
+            'sha': 'OTHER',
+            'context': 'docs',
+            'state': 'pending',
+            'description': 'building',
+            'url': 'https://url-info',
+        },
+    ]
+    cmd = [
+        *CMD,
+        *cli_params({
+            '--owner': 'fake',
+            '--repo': 'hotdog',
+            '--sha': 'SHA',
+            '--batch': json.dumps(statuses),
+        }),
+    ]
+    std_out, _ = run_cli(cmd, 0, mocker)
+    assert json.loads(std_out) == [{'id': 1}] * 3
+    sent = sorted(
+        (call.args[0], call.args[3]['context'])
+        for call in fetch_json.call_args_list
+    )
+    assert sent == [
+        ('https://api.github.com/repos/fake/hotdog/statuses/OTHER', 'docs'),
+        ('https://api.github.com/repos/fake/hotdog/statuses/SHA', 'amd64'),
+        ('https://api.github.com/repos/fake/hotdog/statuses/SHA', 'arm64'),
+    ]
+
+
+def test_github_status_batch_failures(mocker: MockerFixture) -> None:
+    fetch_json = mocker.patch('m.core.http.fetch_json')
+    fetch_json.side_effect = lambda url, *_, **__: (
+        issue('http request failure (422)') if url.endswith('BAD')
+        else Good({'id': 1})
+    )
+    statuses = [
+        {'sha': 'BAD', 'context': 'a', 'state': 'success', 'description': ''},
+        {'sha': 'OK', 'context': 'b', 'state': 'success', 'description': ''},
+    ]
+    cmd = [
+        *CMD,
+        *cli_params({'--repo': 'hotdog', '--batch': json.dumps(statuses)}),
+    ]
+    _, std_err = run_cli(cmd, 1, mocker)
+    assert 'commit status failures' in std_err
+    assert 'BAD:a' in std_err
+
+
+@pytest.mark.parametrize('batch', [
+    '{"context": "a"}',
+    '[{"context": "a"}]',
+])
+def test_github_status_batch_invalid(batch: str, mocker: MockerFixture) -> None:
+    fetch_json = mocker.patch('m.core.http.fetch_json')
+    cmd = [*CMD, *cli_params({'--repo': 'hotdog', '--batch': batch})]
+    run_cli(cmd, 1, mocker)
+    fetch_json.assert_not_called()
+
+
+def test_github_status_missing_args(mocker: MockerFixture) -> None:
+    fetch_json = mocker.patch('m.core.http.fetch_json')
+    cmd = [*CMD, *cli_params({'--repo': 'hotdog', '--sha': 'SHA'})]
+    _, std_err = run_cli(cmd, 1, mocker)
+    assert 'missing arguments' in std_err
+    fetch_json.assert_not_called()
+
+
+def test_github_status_batch_problems(mocker: MockerFixture) -> None:
+    fetch_json = mocker.patch('m.core.http.fetch_json')
+    statuses = [
+        {'context': 'a', 'state': 'success', 'description': ''},
+        {'sha': 'OK', 'context': 'b', 'state': 'done', 'description': ''},
+        {'sha': 'OK', 'context': 'c', 'state': 'success', 'description': ''},
+    ]
+    cmd = [
+        *CMD,
+        *cli_params({'--repo': 'hotdog', '--batch': json.dumps(statuses)}),
+    ]
+    _, std_err = run_cli(cmd, 1, mocker)
+    fetch_json.assert_not_called()
+    assert 'invalid statuses in batch' in std_err
+    assert std_err.count('missing sha') == 1
+    assert std_err.count('state should be one of') == 1
@@ -6,6 +6,8 @@ from m.core.fp import Good, OneOf
 from tests.cli.conftest import TCase as CliTestCase
 from tests.fixture_utils import read_fixture
 
+from m.git import GitStatus
+
 get_fixture = partial(
     read_fixture,
     path='cli/commands/start_release/fixtures',
@@ -25,7 +27,7 @@ class TCaseErr(CliTestCase):
     exit_code: int = 1
     branch: str = 'master'
     user_input: list[str] = []
-    status: tuple[str, str] = ('clean', 'clean msg')
+    status: GitStatus = GitStatus()
     version: str = '0.0.1'
     # Its a test, and pydantic does not support the OneOf type...
     git_stash: Any = Good('it has been stashed')
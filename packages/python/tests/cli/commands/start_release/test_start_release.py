@@ -9,6 +9,8 @@ from m.core import rw as mio
 from pytest_mock import MockerFixture
 from tests.cli.conftest import assert_streams, run_cli
 
+from m.git import GitStatus
+
 from .conftest import TCaseErr, get_fixture, read_file_fake
 
 TODAY = datetime.now().strftime('%B %d, %Y')
@@ -28,7 +30,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('ahead', '-> msg'),
+        status=GitStatus(ahead=1),
         exit_code=1,
         errors=[
             'branch is not in sync with the remote branch',
@@ -38,7 +40,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('behind', '<- msg'),
+        status=GitStatus(behind=2),
         exit_code=1,
         errors=[
             'branch is not in sync with the remote branch',
@@ -48,7 +50,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'cannot stash'),
+        status=GitStatus(conflicted=1),
         exit_code=1,
         errors=[
             'releases can only be done in a clean git state',
@@ -58,7 +60,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'Changes not staged'),
+        status=GitStatus(unstaged=1),
         user_input=['no'],
         exit_code=1,
         errors=[
@@ -69,7 +71,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'Changes not staged'),
+        status=GitStatus(unstaged=1),
         user_input=['yes'],
         git_stash=issue('oops, cannot help you here'),
         exit_code=1,
@@ -81,7 +83,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'Changes not staged'),
+        status=GitStatus(unstaged=1),
         user_input=['yes', 'no'],
         git_stash=Good('we stashed your changes'),
         commits=[],
@@ -96,7 +98,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('clean', 'oh good for you'),
+        status=GitStatus(),
         user_input=['0.1.0'],
         commits=['feature 1', 'feature 2'],
         git_checkout=issue('unable to switch branches'),
@@ -108,7 +110,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('clean', 'oh good for you'),
+        status=GitStatus(),
         # no commits - should be a hotfix but we do it anyway
         user_input=['yes', '0.1.0'],
         commits=[],
@@ -123,7 +125,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_hotfix',
         branch='master',
-        status=('clean', 'oh good for you'),
+        status=GitStatus(),
         # Commits may be features - proceeding anyway
         user_input=['yes', '0.1.0'],
         commits=['feature 1'],
@@ -139,7 +141,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_hotfix',
         branch='master',
-        status=('clean', 'oh good for you'),
+        status=GitStatus(),
         # Commits may be features - stopping processes
         user_input=['no'],
         commits=['feature 1'],
@@ -155,7 +157,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'Changes not staged'),
+        status=GitStatus(unstaged=1),
         git_stash=Good('we stashed your changes'),
         git_stash_pop=issue('something went wrong popping the stash'),
         user_input=['yes', '0.1.0'],
@@ -170,7 +172,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('dirty', 'Changes not staged'),
+        status=GitStatus(unstaged=1),
         git_stash=Good('we stashed your changes'),
         git_stash_pop=Good('your changes are back'),
         user_input=['yes', '0.1.0'],
@@ -183,7 +185,7 @@ env_mock = {'NO_COLOR': 'true'}
     TCaseErr(
         cmd='m start_release',
         branch='master',
-        status=('clean', 'oh good for you'),
+        status=GitStatus(),
         user_input=['0.1.0'],
         commits='issue retrieving commits',
         git_checkout=issue('unable to switch branches'),
@@ -2,6 +2,12 @@ import pytest
 from m.core import Bad, Good, issue
 from pytest_mock import MockerFixture
 from tests.cli.conftest import TCase, assert_streams, run_cli
+from tests.conftest import (
+    assert_issue,
+    assert_ok,
+    mock_cmd_lines,
+    mock_concurrent_cmds,
+)
 
 from m import git
 
@@ -22,51 +28,13 @@ from m import git
         eval_cmd_side_effects=[Good('012_zyx')],
         expected='012_zyx',
     ),
-    TCase(
-        cmd='m git status',
-        eval_cmd_side_effects=[
-            Good('some unknown message'),
-        ],
-        expected='unknown',
-    ),
-    TCase(
-        cmd='m git status',
-        eval_cmd_side_effects=[
-            Good('Untracked files'),
-        ],
-        expected='untracked',
-    ),
-    TCase(
-        cmd='m git status --check-stashed',
-        eval_cmd_side_effects=[
-            Good('Untracked files'),
-            Good('some stashed files'),
-        ],
-        expected='untracked',
-    ),
-    TCase(
-        cmd='m git status --check-stashed',
-        eval_cmd_side_effects=[
-            Good('Your branch is ahead'),
-            Good('some stashed files'),
-        ],
-        expected='stash',
-    ),
-    TCase(
-        cmd='m git status --check-stashed',
-        eval_cmd_side_effects=[
-            Good('Your branch is ahead'),
-            issue('something wrong with stash'),
-        ],
-        expected='ahead',
-    ),
     TCase(
         cmd='m git tag_release --version 1.2.3',
         eval_cmd_side_effects=[
             Good(''),
             Good('local create - major'),
-            Good('remote create - major'),
             Good('local create - minor'),
+            Good('remote create - major'),
             Good('remote create - minor'),
         ],
         expected='\n'.join([
@@ -91,12 +59,95 @@ from m import git
     ),
 ])
 def test_m_git_cli(tcase: TCase, mocker: MockerFixture) -> None:
+    mock_concurrent_cmds(mocker)
     eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
     eval_cmd.side_effect = tcase.eval_cmd_side_effects
     std_out, std_err = run_cli(tcase.cmd, tcase.exit_code, mocker)
     assert_streams(std_out, std_err, tcase)
 
 
+@pytest.mark.parametrize(('cmd', 'lines', 'expected'), [
+    ('m git status', ['# branch.head master'], 'clean'),
+    ('m git status', ['# branch.ab +1 -0', '? new.txt'], 'untracked'),
+    ('m git status', ['# stash 1', '# branch.ab +1 -0'], 'ahead'),
+    ('m git status --check-stashed', ['# stash 1', '? new.txt'], 'stash'),
+])
+def test_m_git_status(
+    mocker: MockerFixture,
+    cmd: str,
+    lines: list[str],
+    expected: str,
+) -> None:
+    cmd_mock = mock_cmd_lines(mocker, Good('\n'.join(lines)))
+    std_out, _ = run_cli(cmd, 0, mocker)
+    assert std_out == f'{expected}\n'
+    cmd_mock.assert_called_once()
+    assert cmd_mock.call_args.args[0] == ' '.join([
+        'git --no-optional-locks status',
+        '--porcelain=v2 --branch --show-stash',
+    ])
+
+
+def test_m_git_status_failure(mocker: MockerFixture) -> None:
+    mock_cmd_lines(mocker, issue('not a git repository'))
+    _, std_err = run_cli('m git status', 1, mocker)
+    assert 'not a git repository' in std_err
+
+
+def test_parse_status() -> None:
+    status = git.parse_status(iter([
+        '# branch.oid 0123456789abcdef',
+        '# branch.head topic/feature',
+        '# branch.upstream origin/topic/feature',
+        '# branch.ab +2 -3',
+        '# stash 4',
+        '1 M. N... 100644 100644 100644 a b staged.py',
+        '1 MM N... 100644 100644 100644 a b both.py',
+        '2 R. N... 100644 100644 100644 a b R100 new.py\told.py',
+        '1 .D N... 100644 100644 000000 a b deleted.py',
+        'u UU N... 100644 100644 100644 100644 a b c conflict.py',
+        '? untracked.txt',
+        '? other/',
+        '! ignored.txt',
+    ]))
+    assert status == git.GitStatus(
+        branch='topic/feature',
+        oid='0123456789abcdef',
+        upstream='origin/topic/feature',
+        ahead=2,
+        behind=3,
+        staged=3,
+        unstaged=2,
+        untracked=2,
+        conflicted=1,
+        stash=4,
+    )
+    assert status.label() == 'untracked'
+    assert status.label(check_stash=True) == 'stash'
+    assert git.GitStatus().description == 'clean'
+    assert status.description == ', '.join([
+        '2 ahead',
+        '3 behind',
+        '3 staged',
+        '2 unstaged',
+        '2 untracked',
+        '1 conflicted',
+        '4 stashed',
+    ])
+
+
+@pytest.mark.parametrize(('status', 'expected'), [
+    (git.GitStatus(), 'clean'),
+    (git.GitStatus(ahead=1, behind=1, staged=1), 'diverged'),
+    (git.GitStatus(behind=1, staged=1), 'behind'),
+    (git.GitStatus(staged=1, unstaged=1), 'staged'),
+    (git.GitStatus(conflicted=1), 'dirty'),
+    (git.GitStatus(stash=1), 'clean'),
+])
+def test_status_label(status: git.GitStatus, expected: str) -> None:
+    assert status.label() == expected
+
+
 @pytest.mark.parametrize('tcase', [
     TCase(
         runner=git.pull,
@@ -201,6 +252,7 @@ def test_m_git_cli(tcase: TCase, mocker: MockerFixture) -> None:
     ),
 ])
 def test_m_git_fns(tcase: TCase, mocker: MockerFixture) -> None:
+    mock_concurrent_cmds(mocker)
     eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
     eval_cmd.side_effect = tcase.eval_cmd_side_effects
     assert tcase.runner is not None
@@ -215,3 +267,114 @@ def test_m_git_fns(tcase: TCase, mocker: MockerFixture) -> None:
 def test_m_git_get_commits() -> None:
     res = git.get_commits('0.0.0')
     assert res.value is None
+
+
+def test_tag_release_stages(mocker: MockerFixture) -> None:
+    concurrent = mock_concurrent_cmds(mocker)
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.side_effect = [
+        Good('sha0\trefs/tags/v1\nsha0\trefs/tags/v1.2\n'),
+        *[Good('') for _ in range(4)],
+        Good('removed v1'),
+        Good('removed v1.2'),
+        *[Good('') for _ in range(6)],
+    ]
+    assert_ok(git.tag_release('1.2.3', 'sha1', major_only=False))
+    assert [call.args[0] for call in concurrent.call_args_list] == [
+        [
+            'git fetch origin +refs/tags/v1:refs/tags/v1',
+            'git fetch origin +refs/tags/v1.2:refs/tags/v1.2',
+        ],
+        ['git tag -d v1', 'git tag -d v1.2'],
+        ['git push origin :refs/tags/v1', 'git push origin :refs/tags/v1.2'],
+        ['git tag v1 sha1', 'git tag v1.2 sha1'],
+        ['git push origin v1', 'git push origin v1.2'],
+    ]
+
+
+def test_tag_release_local_failure(mocker: MockerFixture) -> None:
+    concurrent = mock_concurrent_cmds(mocker)
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.side_effect = [
+        Good('sha0\trefs/tags/v1\nsha0\trefs/tags/v1.2\n'),
+        Good(''),
+        Good(''),
+        Good(''),
+        issue('cannot delete tag'),
+    ]
+    res = git.tag_release('1.2.3', 'sha1', major_only=False)
+    assert_issue(res, 'cannot delete tag')
+    # no remote tag is removed when a local tag cannot be removed
+    assert len(concurrent.call_args_list) == 2
+
+
+def test_remove_git_tag_local_failure(mocker: MockerFixture) -> None:
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.side_effect = [Good('fetched'), issue('cannot delete tag')]
+    assert_issue(git.remove_git_tag('v1'), 'cannot delete tag')
+    # the remote tag is kept when the local tag cannot be removed
+    assert [call.args[0] for call in eval_cmd.call_args_list] == [
+        'git fetch origin +refs/tags/v1:refs/tags/v1',
+        'git tag -d v1',
+    ]
+
+
+def test_session_head(mocker: MockerFixture) -> None:
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.return_value = Good('abc123\ntopic/hotdog')
+    with git.GitSession() as session:
+        assert git.get_branch(session=session).value == 'topic/hotdog'
+        assert git.get_current_commit_sha(session=session).value == 'abc123'
+        eval_cmd.assert_called_once_with(git.HEAD_CMD)
+        session.invalidate()
+        git.get_branch(session=session)
+        assert eval_cmd.call_count == 2
+
+
+def test_session_detached(mocker: MockerFixture) -> None:
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.return_value = Good('aaa111\nHEAD')
+    with git.GitSession() as session:
+        assert git.get_branch(session=session).value == 'HEAD'
+        assert git.get_current_commit_sha(session=session).value == 'aaa111'
+
+
+def test_session_head_issue(mocker: MockerFixture) -> None:
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.side_effect = [issue('no commits'), Good('abc123\nmain')]
+    session = git.GitSession()
+    assert_issue(git.get_branch(session=session), 'no commits')
+    # issues are not kept, the next query runs git again
+    assert assert_ok(session.head()) == ('abc123', 'main')
+
+
+def test_session_status(mocker: MockerFixture) -> None:
+    cmd_lines = mock_cmd_lines(mocker, Good('\n'.join([
+        '# branch.oid abc123',
+        '# branch.head (detached)',
+        '1 .M N... 100644 100644 100644 aaa aaa file.txt',
+    ])))
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    with git.GitSession() as session:
+        git_status = assert_ok(git.get_status(session=session))
+        assert git_status.unstaged == 1
+        assert git.get_status(session=session).value is git_status
+        assert git.get_branch(session=session).value == 'HEAD'
+        assert git.get_current_commit_sha(session=session).value == 'abc123'
+        assert cmd_lines.call_count == 1
+        eval_cmd.return_value = Good('')
+        git.stash(session=session)
+        git.get_status(session=session)
+        assert cmd_lines.call_count == 2
+
+
+def test_session_remember(mocker: MockerFixture) -> None:
+    eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
+    eval_cmd.side_effect = [Bad(issue('no repo')), Good('first'), Good('url')]
+    with git.GitSession() as session:
+        assert git.get_first_commit_sha(session=session).is_bad
+        assert git.get_first_commit_sha(session=session).value == 'first'
+        assert git.get_first_commit_sha(session=session).value == 'first'
+        git.checkout_branch('topic', session=session)
+        assert git.get_first_commit_sha(session=session).value == 'first'
+    assert eval_cmd.call_count == 3
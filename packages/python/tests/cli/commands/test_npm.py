@@ -5,6 +5,7 @@ from m.core import Bad, Good, Issue
 from pytest_mock import MockerFixture
 from tests.cli.conftest import TCase as CliTestCase
 from tests.cli.conftest import assert_streams, run_cli
+from tests.conftest import mock_concurrent_cmds
 
 
 class TCase(CliTestCase):
@@ -75,5 +76,6 @@ class TCase(CliTestCase):
 def test_m_npm_dist_tags(tcase: TCase, mocker: MockerFixture) -> None:
     eval_cmd = mocker.patch('m.core.subprocess.eval_cmd')
     eval_cmd.side_effect = tcase.eval_cmd_side_effects
+    mock_concurrent_cmds(mocker)
     std_out, std_err = run_cli(tcase.cmd, tcase.exit_code, mocker)
     assert_streams(std_out, std_err, tcase)
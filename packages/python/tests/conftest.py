@@ -1,7 +1,14 @@
-from typing import Any, TypeVar
+from typing import Any, Iterator, TypeVar
 
+import pytest
+from m.core import http
 from m.core.fp import Bad, Good, OneOf
+from m.core.http import ConnectionPool
 from m.core.issue import Issue
+from m.github import request as github_request
+from m.github.scheduler import RequestScheduler
+from m.testing import LocalServer
+from pytest_mock import MockerFixture
 
 G = TypeVar('G')  # pylint: disable=invalid-name
 
@@ -28,3 +35,98 @@ def assert_issue(error: OneOf[Issue, Any], message: str | list[str]) -> Issue:
     else:
         assert err.message == message
     return err
+
+
+def issue_context(err: Issue) -> dict[str, Any]:
+    """Assert that the issue has a dictionary as its context.
+
+    Args:
+        err: The issue to inspect.
+
+    Returns:
+        The context of the issue.
+    """
+    assert isinstance(err.context, dict), 'expecting a context dictionary'
+    return err.context
+
+
+def mock_cmd_lines(mocker: Any, output: OneOf[Issue, str]) -> Any:
+    """Mock `m.core.subprocess.eval_cmd_lines`.
+
+    Args:
+        mocker: The mocker fixture.
+        output: The output of the command or the issue to return.
+
+    Returns:
+        The mock, its calls provide the commands.
+    """
+    def _eval_cmd_lines(_cmd: str, consume: Any) -> OneOf[Issue, Any]:
+        return output.map(lambda text: consume(iter(text.splitlines())))
+
+    return mocker.patch(
+        'm.core.subprocess.eval_cmd_lines',
+        side_effect=_eval_cmd_lines,
+    )
+
+
+def mock_concurrent_cmds(mocker: Any) -> Any:
+    """Mock `m.core.subprocess.eval_cmds_concurrently`.
+
+    The commands are passed one at a time, in order, to `eval_cmd` so that
+    the tests can provide the results by mocking `eval_cmd`.
+
+    Args:
+        mocker: The mocker fixture.
+
+    Returns:
+        The mock, its calls provide the groups of commands.
+    """
+    from m.core import subprocess  # noqa: WPS433
+
+    def _eval_cmds(cmds: Any, **_: Any) -> list[OneOf[Issue, str]]:
+        return [subprocess.eval_cmd(cmd) for cmd in cmds]
+
+    return mocker.patch(
+        'm.core.subprocess.eval_cmds_concurrently',
+        side_effect=_eval_cmds,
+    )
+
+
+@pytest.fixture
+def http_pool(mocker: MockerFixture) -> Iterator[ConnectionPool]:
+    """Replace the connection pool of `m.core.http` with a fresh one.
+
+    The pool trusts the certificate of `m.testing.LocalServer`.
+
+    Args:
+        mocker: The mocker fixture.
+
+    Yields:
+        The connection pool, its connections are closed after the test.
+    """
+    conn_pool = ConnectionPool(ssl_context=LocalServer.client_context())
+    mocker.patch.object(http, 'connection_pool', conn_pool)
+    yield conn_pool
+    conn_pool.close_all()
+
+
+def _no_sleep(_seconds: float) -> None:
+    """Skip the waits of the scheduler."""
+
+
+@pytest.fixture
+def github_scheduler(mocker: MockerFixture) -> RequestScheduler:
+    """Replace the scheduler of `m.github.request` with a fresh one.
+
+    The rate limits and retries start from scratch and the scheduler does
+    not sleep.
+
+    Args:
+        mocker: The mocker fixture.
+
+    Returns:
+        The scheduler used by the github requests.
+    """
+    req_scheduler = RequestScheduler(sleep=_no_sleep)
+    mocker.patch.object(github_request, 'scheduler', req_scheduler)
+    return req_scheduler
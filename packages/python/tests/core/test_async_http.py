@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from http import HTTPStatus
+from urllib.parse import urlparse
+
+from m.core.async_http import FetchRequest, fetch_json_many
+from m.core.http import HttpMethod
+from m.testing import LocalServer, QuietHandler
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+
+class _EchoHandler(QuietHandler):
+    """Reply with the path and body of the request after a short delay."""
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._reply()
+
+    def _reply(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.active -= 1
+        path = urlparse(self.path).path
+        if path == '/stall':
+            time.sleep(0.5)
+        if path == '/missing':
+            self._send(HTTPStatus.NOT_FOUND, b'{"message": "Not Found"}')
+            return
+        length = int(self.headers.get('content-length', 0))
+        req_body = self.rfile.read(length).decode() or 'null'
+        res_body = f'{{"path": "{path}", "body": {req_body}}}'.encode()
+        if path == '/chunked':
+            self._send_chunked(res_body)
+        else:
+            self._send(HTTPStatus.OK, res_body)
+
+    def _send(self, status: HTTPStatus, res_body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+
+    def _send_chunked(self, res_body: bytes) -> None:
+        self.protocol_version = 'HTTP/1.1'
+        self.send_response(HTTPStatus.OK)
+        self.send_header('transfer-encoding', 'chunked')
+        self.end_headers()
+        half = len(res_body) // 2
+        for chunk in (res_body[:half], res_body[half:]):
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+
+def test_fetch_json_many_order() -> None:
+    _EchoHandler.max_active = 0
+    with LocalServer(_EchoHandler, tls=True) as server:
+        requests = [
+            FetchRequest(f'{server.url}/item/{index}')
+            for index in range(8)
+        ]
+        results = fetch_json_many(
+            requests,
+            concurrency=3,
+            ssl_context=server.client_context(),
+        )
+    assert [assert_ok(res)['path'] for res in results] == [
+        f'/item/{index}' for index in range(8)
+    ]
+    assert 1 < _EchoHandler.max_active <= 3
+
+
+def test_fetch_json_many_results() -> None:
+    with LocalServer(_EchoHandler) as server:
+        results = fetch_json_many([
+            FetchRequest(
+                f'{server.url}/post',
+                method=HttpMethod.post,
+                body_json={'a': 1},
+            ),
+            FetchRequest(f'{server.url}/missing'),
+            FetchRequest(f'{server.url}/chunked?x=1'),
+        ])
+    assert assert_ok(results[0]) == {'path': '/post', 'body': {'a': 1}}
+    err = assert_issue(results[1], 'http request failure (404)')
+    assert issue_context(err)['code'] == 404
+    assert assert_ok(results[2]) == {'path': '/chunked', 'body': None}
+
+
+def test_fetch_json_many_connection_failure() -> None:
+    with LocalServer(_EchoHandler) as server:
+        url = server.url
+    results = fetch_json_many([FetchRequest(f'{url}/closed')])
+    assert_issue(results[0], 'http request failure')
+
+
+def test_fetch_json_many_timeout() -> None:
+    with LocalServer(_EchoHandler, tls=True) as server:
+        start = time.perf_counter()
+        results = fetch_json_many(
+            [FetchRequest(f'{server.url}/stall')],
+            ssl_context=server.client_context(),
+            timeout=0.1,
+        )
+        assert time.perf_counter() - start < 0.5
+    err = assert_issue(results[0], 'https response failure')
+    assert isinstance(err.cause, asyncio.TimeoutError)
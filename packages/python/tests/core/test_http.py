@@ -1,8 +1,10 @@
-from typing import cast
+from http import HTTPStatus
+from typing import List, cast
 
 import pytest
-from m.core import Issue
-from m.core.http import fetch
+from m.core import Bad, Issue, http
+from m.core.http import ConnectionPool, HttpMethod, fetch
+from m.testing import LocalServer, QuietHandler
 from pytest_mock import MockerFixture
 from tests.conftest import assert_issue, assert_ok
 
@@ -34,7 +36,7 @@ def test_http_vs_https_fetch(mocker: MockerFixture, protocol) -> None:
 
     in_use_mock.return_value.getresponse.return_value = response
     response.getcode.return_value = 200
-    response.read.return_value = b'content'
+    response.read.side_effect = [b'content', b'']
 
     fetch_result = fetch(f'{protocol}://{HOST}', {})
 
@@ -78,14 +80,18 @@ def test_fetch_https_body(mocker: MockerFixture):
     https_inst = https_mock.return_value
     https_inst.getresponse.return_value = response
     response.getcode.return_value = 200
-    response.read.return_value = b'content'
+    response.read.side_effect = [b'content', b'']
     fetch_result = fetch(f'https://{HOST}', {}, body='{"a":1}')
     https_mock.assert_called_once_with(HOST)
     https_inst.request.assert_called_once_with(
         'GET',
         '',
         '{"a":1}',
-        {'user-agent': 'm', 'content-length': '7'},
+        {
+            'user-agent': 'm',
+            'accept-encoding': 'gzip, deflate',
+            'content-length': '7',
+        },
     )
     assert_ok(fetch_result)
 
@@ -96,7 +102,87 @@ def test_fetch_https_server_err(mocker: MockerFixture):
     https_inst = https_mock.return_value
     https_inst.getresponse.return_value = response
     response.getcode.return_value = 500
-    response.read.return_value = b'server error'
+    response.read.side_effect = [b'server error', b'']
     fetch_result = fetch(f'https://{HOST}', {})
     https_mock.assert_called_once_with(HOST)
     assert_issue(fetch_result, 'https request failure (500)')
+
+
+class _JsonHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+    # Close the socket after each response without telling the client.
+    drop_connection = False
+
+    # paths of the POST requests processed by the server
+    posts: List[str] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self.rfile.read(int(self.headers.get('content-length', 0)))
+        self.posts.append(self.path)
+        self._reply()
+
+    def _reply(self) -> None:
+        res_body = b'{"ok": true}'
+        self.send_response(HTTPStatus.OK)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+        self.close_connection = self.drop_connection
+
+
+class _DroppingHandler(_JsonHandler):
+    drop_connection = True
+
+
+def test_pool_reuses_connection(http_pool: ConnectionPool) -> None:
+    with LocalServer(_JsonHandler, tls=True) as server:
+        for _ in range(5):
+            assert assert_ok(http.fetch_json(server.url, {})) == {'ok': True}
+        assert server.connections == 1
+    assert http_pool.created == 1
+
+
+def test_pool_stale_connection(http_pool: ConnectionPool) -> None:
+    with LocalServer(_DroppingHandler, tls=True) as server:
+        for _ in range(3):
+            assert assert_ok(http.fetch_json(server.url, {})) == {'ok': True}
+        assert server.connections == 3
+    assert http_pool.created == 3
+
+
+def test_pool_stale_connection_post(http_pool: ConnectionPool) -> None:
+    _DroppingHandler.posts = []
+    with LocalServer(_DroppingHandler, tls=True) as server:
+        url = f'{server.url}/statuses'
+        assert_ok(http.fetch_json(url, {}, HttpMethod.post, {'n': 1}))
+        res = http.fetch_json(url, {}, HttpMethod.post, {'n': 2})
+        # the request may have been processed, it is not sent again
+        assert isinstance(res, Bad)
+        assert isinstance(res.value.cause, http.STALE_ERRORS)
+        assert server.connections == 1
+    assert _DroppingHandler.posts == ['/statuses']
+
+
+def test_pool_idle_timeout(http_pool: ConnectionPool) -> None:
+    http_pool.idle_timeout = 0
+    with LocalServer(_JsonHandler) as server:
+        assert_ok(http.fetch(server.url, {}))
+        assert_ok(http.fetch(server.url, {}))
+        assert server.connections == 2
+
+
+def test_pool_max_size(mocker: MockerFixture) -> None:
+    conn_pool = ConnectionPool(max_size=1)
+    connections = [mocker.Mock(), mocker.Mock()]
+    for connection in connections:
+        conn_pool.release('https', HOST, connection)
+    connections[0].close.assert_not_called()
+    connections[1].close.assert_called_once()
+    assert conn_pool.acquire('https', HOST) == (connections[0], True)
+    conn_pool.release('https', HOST, connections[0])
+    conn_pool.close_all()
+    connections[0].close.assert_called_once()
@@ -0,0 +1,131 @@
+import os
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from m.core import Good, http
+from m.core.http import ConnectionPool, HttpMethod
+from m.core.http_cache import CacheEntry, ResponseCache, cache_key
+from m.github.graphql import api
+from m.testing import LocalServer, QuietHandler
+from pytest_mock import MockerFixture
+from tests.conftest import assert_ok
+
+ETAG = '"v1"'
+
+
+class _EtagHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+    # status codes sent by the server
+    sent: List[int] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self.rfile.read(int(self.headers.get('content-length', 0)))
+        self._reply()
+
+    def _reply(self) -> None:
+        if self.headers.get('if-none-match') == ETAG:
+            self.sent.append(HTTPStatus.NOT_MODIFIED)
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('etag', ETAG)
+            self.end_headers()
+            return
+        res_body = f'{{"path": "{self.path}"}}'.encode()
+        self.sent.append(HTTPStatus.OK)
+        self.send_response(HTTPStatus.OK)
+        self.send_header('etag', ETAG)
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+
+
+@pytest.fixture
+def server(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    http_pool: ConnectionPool,
+) -> Iterator[LocalServer]:
+    monkeypatch.setenv('M_HTTP_CACHE_DIR', str(tmp_path / 'cache'))
+    _EtagHandler.sent = []
+    with LocalServer(_EtagHandler) as local_server:
+        yield local_server
+
+
+def test_revalidate(server: LocalServer) -> None:
+    url = f'{server.url}/repos'
+    for _ in range(3):
+        assert assert_ok(http.fetch_json(url, {})) == {'path': '/repos'}
+    assert _EtagHandler.sent == [200, 304, 304]
+    res = assert_ok(http.fetch_response(url, {}))
+    assert res.response and res.response.status == 304
+    assert res.body == '{"path": "/repos"}'
+
+
+def test_keyed_by_token(server: LocalServer) -> None:
+    url = f'{server.url}/repos'
+    assert_ok(http.fetch(url, {'authorization': 'Bearer a'}))
+    assert_ok(http.fetch(url, {'authorization': 'Bearer b'}))
+    assert_ok(http.fetch(url, {'authorization': 'Bearer a'}))
+    assert _EtagHandler.sent == [200, 200, 304]
+
+
+def test_post_requests(server: LocalServer) -> None:
+    url = f'{server.url}/graphql'
+    query = {'query': 'query { viewer { login } }'}
+    for _ in range(2):
+        assert_ok(http.fetch_json(url, {}, HttpMethod.post, query))
+    for _ in range(2):
+        assert_ok(http.fetch_json(url, {}, HttpMethod.post, query, True))
+    assert _EtagHandler.sent == [200, 200, 200, 304]
+
+
+def test_max_age(server: LocalServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('M_HTTP_CACHE_MAX_AGE', '60')
+    url = f'{server.url}/fresh'
+    res = assert_ok(http.fetch_response(url, {}))
+    assert res.response
+    res = assert_ok(http.fetch_response(url, {}))
+    assert res.response is None
+    assert res.body == '{"path": "/fresh"}'
+    assert _EtagHandler.sent == [200]
+
+
+def test_disabled(server: LocalServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv('M_HTTP_CACHE_DIR')
+    url = f'{server.url}/repos'
+    assert_ok(http.fetch(url, {}))
+    assert_ok(http.fetch(url, {}))
+    assert _EtagHandler.sent == [200, 200]
+
+
+def test_graphql_cacheable(mocker: MockerFixture) -> None:
+    request = mocker.patch('m.github.graphql.api.request')
+    request.return_value = Good({'data': {'viewer': {'login': 'm'}}})
+    assert_ok(api.graphql('token', 'mutation { m }', {}))
+    assert request.call_args.kwargs['cacheable'] is False
+    assert_ok(api.graphql('token', 'query { m }', {}, cacheable=True))
+    assert request.call_args.kwargs['cacheable'] is True
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    cache = ResponseCache(str(tmp_path), max_bytes=400)
+    keys = [
+        cache_key('GET', f'https://x/{idx}', None, {})
+        for idx in range(3)
+    ]
+    past = time.time() - 100
+    for idx, key in enumerate(keys[:2]):
+        cache.put(key, CacheEntry('x' * 80, etag=f'"{idx}"'))
+        os.utime(tmp_path / f'{key}.json', (past + idx, past + idx))
+    # reading the first entry makes the second one the least recently used
+    assert cache.get(keys[0])
+    cache.put(keys[2], CacheEntry('x' * 80, etag='"2"'))
+    assert cache.get(keys[0])
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2])
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,100 @@
+import gzip
+import json
+import zlib
+from http import HTTPStatus
+from typing import Generator, Iterator, cast
+
+import pytest
+from m.core import http
+from m.core.http import ConnectionPool
+from m.testing import LocalServer, QuietHandler
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+ITEMS = [
+    {'filename': f'src/file_{idx}.py', 'additions': idx}
+    for idx in range(5000)
+]
+PAYLOAD = json.dumps(ITEMS).encode()
+
+
+class _CompressingHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        if self.path == '/missing':
+            self._send(b'{"message": "Not Found"}', HTTPStatus.NOT_FOUND)
+            return
+        accepted = self.headers.get('accept-encoding', '')
+        if self.path == '/deflate' and 'deflate' in accepted:
+            self._send(zlib.compress(PAYLOAD), encoding='deflate')
+        elif 'gzip' in accepted:
+            self._send(gzip.compress(PAYLOAD), encoding='gzip')
+        else:
+            self._send(PAYLOAD)
+
+    def _send(
+        self,
+        res_body: bytes,
+        status: HTTPStatus = HTTPStatus.OK,
+        encoding: str = '',
+    ) -> None:
+        self.send_response(status)
+        if encoding:
+            self.send_header('content-encoding', encoding)
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+
+
+@pytest.fixture
+def server(http_pool: ConnectionPool) -> Iterator[LocalServer]:
+    with LocalServer(_CompressingHandler) as local_server:
+        yield local_server
+
+
+@pytest.mark.parametrize('path', ['/gzip', '/deflate'])
+def test_compressed_response(server: LocalServer, path: str) -> None:
+    res = assert_ok(http.fetch_response(f'{server.url}{path}', {}))
+    assert res.response
+    assert res.response.getheader('content-encoding') == path[1:]
+    assert json.loads(res.body) == ITEMS
+
+
+def test_uncompressed_response(server: LocalServer) -> None:
+    headers = {'accept-encoding': 'identity'}
+    assert assert_ok(http.fetch_json(f'{server.url}/plain', headers)) == ITEMS
+
+
+def test_fetch_stream(server: LocalServer) -> None:
+    stream = assert_ok(http.fetch_stream(f'{server.url}/gzip', {}))
+    chunks = list(stream)
+    assert len(chunks) > 1
+    assert ''.join(chunks) == PAYLOAD.decode()
+    # the connection is reused after the body is consumed
+    assert_ok(http.fetch(f'{server.url}/gzip', {}))
+    assert server.connections == 1
+
+
+def test_fetch_json_stream(server: LocalServer) -> None:
+    items = assert_ok(http.fetch_json_stream(f'{server.url}/gzip', {}))
+    assert next(items) == ITEMS[0]
+    assert list(items) == ITEMS[1:]
+
+
+def test_fetch_stream_not_consumed(server: LocalServer) -> None:
+    chunks = cast(
+        Generator[str, None, None],
+        assert_ok(http.fetch_stream(f'{server.url}/gzip', {})),
+    )
+    next(chunks)
+    chunks.close()
+    assert_ok(http.fetch(f'{server.url}/gzip', {}))
+    assert server.connections == 2
+
+
+def test_fetch_stream_failure(server: LocalServer) -> None:
+    err = assert_issue(
+        http.fetch_stream(f'{server.url}/missing', {}),
+        'http request failure (404)',
+    )
+    assert issue_context(err)['res_body'] == '{"message": "Not Found"}'
@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+from m.core import json as mjson
+from m.core.json import iter_json_array
+from pytest_mock import MockerFixture
+
+DATA = [
+    {'filePath': 'a.ts', 'messages': [{'message': 'x"y]', 'line': 1}]},
+    12345,
+    'str, with ] and [',
+    [],
+    {},
+    None,
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 4096])
+def test_iter_json_array_chunks(chunk_size: int) -> None:
+    text = json.dumps(DATA, indent=2)
+    chunks = [
+        text[index:index + chunk_size]
+        for index in range(0, len(text), chunk_size)
+    ]
+    assert list(iter_json_array(chunks)) == DATA
+
+
+@pytest.mark.parametrize(('chunks', 'expected'), [
+    ([], []),
+    (['  \n'], []),
+    (['[', ' ]'], []),
+    (['[1', '2, 3', ']'], [12, 3]),
+])
+def test_iter_json_array_edge_cases(chunks, expected) -> None:
+    assert list(iter_json_array(chunks)) == expected
+
+
+@pytest.mark.parametrize(('text', 'error'), [
+    ('{}', r"Expecting '\['"),
+    ('[1 2]', "Expecting ',' delimiter"),
+    ('[1,]', 'Expecting value'),
+    ('[1', 'Unterminated array'),
+])
+def test_iter_json_array_errors(text: str, error: str) -> None:
+    with pytest.raises(json.JSONDecodeError, match=error):
+        list(iter_json_array(iter(text)))
+
+
+def test_backends() -> None:
+    backends = mjson.json_backends()
+    assert backends['json'].loads('[1]') == [1]
+    assert mjson.get_backend('json').name == 'json'
+    assert mjson.get_backend('unknown').name == 'json'
+    assert mjson.get_backend().name in backends
+
+
+@pytest.mark.parametrize('backend', ['json', 'orjson', 'msgspec'])
+def test_loads_matches_stdlib(backend: str, mocker: MockerFixture) -> None:
+    if backend != 'json':
+        pytest.importorskip(backend)
+    mocker.patch.dict(os.environ, {'M_JSON_BACKEND': backend})
+    assert mjson.get_backend().name == backend
+    text = '{"a": [1, 2.5, "x"], "b": NaN, "c": 123456789012345678901234567890}'
+    decoded = mjson.loads(text)
+    assert decoded['a'] == [1, 2.5, 'x']
+    assert decoded['c'] == 123456789012345678901234567890
+    with pytest.raises(json.JSONDecodeError, match='Expecting value'):
+        mjson.loads('[1,')
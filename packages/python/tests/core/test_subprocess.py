@@ -1,8 +1,23 @@
+import asyncio
+import sys
+import time
+from itertools import islice
 from subprocess import CalledProcessError
+from typing import Iterator
 
-from m.core import subprocess
+from m.core import Issue, OneOf, subprocess
 from pytest_mock import MockerFixture
-from tests.conftest import assert_issue
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+PYTHON = sys.executable
+
+
+def _sum_lines(lines: Iterator[str]) -> int:
+    return sum(int(line) for line in lines)
+
+
+def _all_lines(lines: Iterator[str]) -> list[str]:
+    return list(lines)
 
 
 def test_m_git_subprocess(mocker: MockerFixture) -> None:
@@ -21,6 +36,35 @@ def test_m_git_subprocess_error(mocker: MockerFixture) -> None:
     assert_issue(test_res, 'command returned a non zero exit code')
 
 
+def test_eval_cmd_lines() -> None:
+    cmd = f'{PYTHON} -c "for i in range(5000): print(i)"'
+    # only the first lines are consumed, the rest is drained
+    res = subprocess.eval_cmd_lines(cmd, lambda lines: list(islice(lines, 2)))
+    assert assert_ok(res) == ['0', '1']
+    assert assert_ok(subprocess.eval_cmd_lines(cmd, _sum_lines)) == 12497500
+
+
+def test_eval_cmd_lines_error() -> None:
+    cmd = f'{PYTHON} -c "import sys; print(1); sys.exit(\'bad args\')"'
+    res = subprocess.eval_cmd_lines(cmd, _all_lines)
+    err = assert_issue(res, 'command returned a non zero exit code')
+    assert err.context == {'cmd': cmd, 'output': 'bad args\n'}
+
+
+def test_eval_cmd_lines_large_error_output() -> None:
+    # more than a pipe buffer written before the standard output
+    script = 'import sys; sys.stderr.write(200000 * "x"); print(1); exit(2)'
+    cmd = f"{PYTHON} -c '{script}'"
+    res = subprocess.eval_cmd_lines(cmd, _all_lines)
+    err = assert_issue(res, 'command returned a non zero exit code')
+    assert len(issue_context(err)['output']) == 200000
+
+
+def test_eval_cmd_lines_missing_command() -> None:
+    res = subprocess.eval_cmd_lines('m-missing-command', _all_lines)
+    assert_issue(res, 'unable to run command')
+
+
 def test_m_exec_pnpm(mocker: MockerFixture) -> None:
     call = mocker.patch('subprocess.call')
     call.return_value = 0
@@ -34,3 +78,46 @@ def test_m_exec_pnpm_error(mocker: MockerFixture) -> None:
     call.return_value = 1
     test_res = subprocess.exec_pnpm(['install'])
     assert_issue(test_res, 'non_zero_pnpm_exit_code')
+
+
+def test_eval_cmds_concurrently() -> None:
+    script = 'import sys, time; time.sleep(0.3); print(sys.argv[1])'
+    cmds = [f'{PYTHON} -c "{script}" {index}' for index in range(4)]
+    start = time.perf_counter()
+    results = subprocess.eval_cmds_concurrently(cmds, limit=4)
+    assert time.perf_counter() - start < 1
+    assert [assert_ok(res) for res in results] == ['0', '1', '2', '3']
+
+
+def test_eval_cmds_concurrently_issues() -> None:
+    failure = 'import sys; print(1); sys.exit(\'bad args\')'
+    cmds = [
+        f'{PYTHON} -c "print(\'ok\')"',
+        f'{PYTHON} -c "{failure}"',
+        f'{PYTHON} -c "import time; time.sleep(5)"',
+        'm-missing-command',
+    ]
+    results = subprocess.eval_cmds_concurrently(cmds, limit=2, timeout=0.5)
+    assert assert_ok(results[0]) == 'ok'
+    err = assert_issue(results[1], 'command returned a non zero exit code')
+    assert err.context == {
+        'cmd': cmds[1],
+        'output': 'bad args\n',
+        'stdout': '1\n',
+    }
+    err = assert_issue(results[2], 'command timed out')
+    assert err.context == {'cmd': cmds[2], 'timeout': 0.5}
+    assert_issue(results[3], 'unable to run command')
+
+
+async def _eval_cmds_in_loop(cmds: list[str]) -> list[OneOf[Issue, str]]:
+    return subprocess.eval_cmds_concurrently(cmds)
+
+
+def test_eval_cmds_concurrently_running_loop() -> None:
+    cmds = ['true', 'false']
+    results = asyncio.run(_eval_cmds_in_loop(cmds))
+    errors = [
+        assert_issue(res, 'event loop already running') for res in results
+    ]
+    assert [issue_context(err)['cmd'] for err in errors] == cmds
@@ -0,0 +1,251 @@
+import os
+import select
+import subprocess as sp
+import threading
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+from m.core import Good, issue, subprocess
+from m.devcontainer.bashrc import devex_snippet
+from m.devcontainer.inotify import IN_Q_OVERFLOW, Inotify, InotifyEvent
+from m.devcontainer.prompter_daemon import (
+    PromptDaemon,
+    default_socket_path,
+    request_prompt,
+)
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok
+
+PORCELAIN = '\n'.join([
+    '# branch.oid abcdef0123456789abcdef0123456789abcdef01',
+    '# branch.head master',
+    '1 .M N... 100644 100644 100644 a b src/a.txt',
+])
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    (tmp_path / 'repo' / '.git' / 'refs' / 'heads').mkdir(parents=True)
+    (tmp_path / 'repo' / 'src').mkdir()
+    return tmp_path / 'repo'
+
+
+@pytest.fixture
+def ls_files() -> List[str]:
+    return ['src/a.txt']
+
+
+@pytest.fixture
+def git_cmds(mocker: MockerFixture, ls_files: List[str]) -> List[str]:
+    cmds: List[str] = []
+
+    def _eval_cmd(cmd: str) -> object:
+        cmds.append(cmd)
+        if ' ls-files ' in cmd:
+            return Good('\0'.join(ls_files))
+        return issue('unexpected command')
+
+    def _eval_cmd_lines(cmd: str, consume: Any) -> object:
+        cmds.append(cmd)
+        return Good(consume(iter(PORCELAIN.splitlines())))
+
+    mocker.patch.object(subprocess, 'eval_cmd', side_effect=_eval_cmd)
+    mocker.patch.object(
+        subprocess,
+        'eval_cmd_lines',
+        side_effect=_eval_cmd_lines,
+    )
+    mocker.patch.dict(os.environ, {'NO_COLOR': 'true'}, clear=True)
+    return cmds
+
+
+@pytest.fixture
+def daemon() -> Iterator[PromptDaemon]:
+    inotify = assert_ok(Inotify.create())
+    yield PromptDaemon(inotify, debounce=0.05)
+    inotify.close()
+
+
+def _status_calls(cmds: List[str]) -> int:
+    return sum(' status ' in cmd for cmd in cmds)
+
+
+def _wait_events(prompt_daemon: PromptDaemon, now: float = 0) -> None:
+    readable, _, _ = select.select([prompt_daemon.inotify], [], [], 1)
+    assert readable
+    prompt_daemon.handle_events(now)
+
+
+def test_status_cached_until_change(
+    repo: Path,
+    git_cmds: List[str],
+    daemon: PromptDaemon,
+) -> None:
+    prompt = daemon.prompt(str(repo / 'src'))
+    assert '✖ master' in prompt
+    assert prompt.endswith(r'^/src\[\]$ ')
+    assert daemon.prompt(str(repo / 'src')) == prompt
+    assert _status_calls(git_cmds) == 1
+
+    # lock files are ignored, git renames them once done
+    (repo / '.git' / 'index.lock').write_text('')
+    (repo / '.git' / 'index.lock').rename(repo / '.git' / 'index')
+    _wait_events(daemon)
+    daemon.prompt(str(repo))
+    assert _status_calls(git_cmds) == 2
+
+    (repo / 'src' / 'a.txt').write_text('changed')
+    _wait_events(daemon)
+    daemon.prompt(str(repo))
+    assert _status_calls(git_cmds) == 3
+
+
+def test_new_directories_are_watched(
+    repo: Path,
+    git_cmds: List[str],
+    ls_files: List[str],
+    daemon: PromptDaemon,
+) -> None:
+    daemon.status(repo)
+    (repo / 'src' / 'new').mkdir()
+    ls_files.append('src/new/')
+    _wait_events(daemon)
+    daemon.status(repo)
+    assert sum(' ls-files ' in cmd for cmd in git_cmds) == 2
+    (repo / 'src' / 'new' / 'b.txt').write_text('new file')
+    _wait_events(daemon)
+    daemon.status(repo)
+    assert _status_calls(git_cmds) == 3
+
+
+def test_refresh_after_debounce(
+    repo: Path,
+    git_cmds: List[str],
+    daemon: PromptDaemon,
+) -> None:
+    assert daemon.refresh(0) is None
+    daemon.status(repo)
+    (repo / '.git' / 'refs' / 'heads' / 'topic').write_text('sha')
+    _wait_events(daemon, now=10)
+    assert daemon.refresh(10.01) == pytest.approx(0.04)
+    assert _status_calls(git_cmds) == 1
+    assert daemon.refresh(10.05) is None
+    assert _status_calls(git_cmds) == 2
+    daemon.status(repo)
+    assert _status_calls(git_cmds) == 2
+
+
+def test_queue_overflow(
+    repo: Path,
+    git_cmds: List[str],
+    daemon: PromptDaemon,
+    mocker: MockerFixture,
+) -> None:
+    daemon.status(repo)
+    overflow = InotifyEvent(wd=-1, mask=IN_Q_OVERFLOW, name='')
+    mocker.patch.object(daemon.inotify, 'read_events', return_value=[overflow])
+    daemon.handle_events(0)
+    daemon.status(repo)
+    assert sum(' ls-files ' in cmd for cmd in git_cmds) == 2
+    assert _status_calls(git_cmds) == 2
+
+
+def test_outside_repo(tmp_path: Path, daemon: PromptDaemon) -> None:
+    assert r'\w' in daemon.prompt(str(tmp_path))
+
+
+def _start(daemon: PromptDaemon, socket_path: str) -> threading.Thread:
+    server = threading.Thread(target=daemon.serve_forever, args=[socket_path])
+    server.start()
+    for _ in range(100):
+        if Path(f'{socket_path}.fifo').exists():
+            break
+        threading.Event().wait(0.01)
+    return server
+
+
+def test_serve(
+    repo: Path,
+    git_cmds: List[str],
+    daemon: PromptDaemon,
+) -> None:
+    socket_path = str(repo.parent / 'p.sock')
+    server = _start(daemon, socket_path)
+    try:
+        prompt = assert_ok(request_prompt(socket_path, str(repo)))
+        assert '✖ master' in prompt
+
+        reply_path = str(repo.parent / 'reply')
+        os.mkfifo(reply_path)
+        reply_fd = os.open(reply_path, os.O_RDWR)
+        with open(f'{socket_path}.fifo', 'w') as fifo:
+            fifo.write(f'{reply_path}\t{repo}\n')
+        with os.fdopen(reply_fd, 'rb') as reply:
+            assert reply.readline().decode() == f'{prompt}\n'
+    finally:
+        daemon.shutdown()
+        server.join()
+    assert _status_calls(git_cmds) == 1
+
+
+def test_bash_prompt(
+    repo: Path,
+    git_cmds: List[str],
+    daemon: PromptDaemon,
+) -> None:
+    socket_path = str(repo.parent / 'p.sock')
+    Path(f'{socket_path}.pid').write_text(f'{os.getpid()}\n')
+    server = _start(daemon, socket_path)
+    try:
+        bash = sp.run(
+            ['bash', '-c', f'{devex_snippet}\nprompter\nprintf %s "$PS1"'],
+            cwd=repo,
+            env={'MDC_PROMPTER_SOCKET': socket_path, 'PATH': os.defpath},
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    finally:
+        daemon.shutdown()
+        server.join()
+    assert '✖ master' in bash.stdout
+    # the reply fifo is removed once read
+    assert not list(repo.parent.glob('p.sock.[0-9]*'))
+
+
+def test_bash_prompt_stopped_daemon(repo: Path) -> None:
+    # the fifo and a live pid are left but nothing reads the requests
+    socket_path = str(repo.parent / 'p.sock')
+    os.mkfifo(f'{socket_path}.fifo')
+    Path(f'{socket_path}.pid').write_text(f'{os.getpid()}\n')
+    bash = sp.run(
+        ['bash', '-c', f'{devex_snippet}\nprompter'],
+        cwd=repo,
+        env={'MDC_PROMPTER_SOCKET': socket_path, 'PATH': os.defpath},
+        capture_output=True,
+        text=True,
+        timeout=5,
+    )
+    # falls back to `m devcontainer prompter`, not installed in this PATH
+    assert 'm: command not found' in bash.stderr
+    assert not list(repo.parent.glob('p.sock.[0-9]*'))
+
+
+@pytest.mark.parametrize(('environ', 'expected'), [
+    ({'MDC_PROMPTER_SOCKET': '/run/p.sock'}, '/run/p.sock'),
+    ({'XDG_RUNTIME_DIR': '/run/user/1'}, '/run/user/1/m-prompter-{uid}.sock'),
+    ({}, '/tmp/m-prompter-{uid}.sock'),
+])
+def test_default_socket_path(
+    mocker: MockerFixture,
+    environ: dict[str, str],
+    expected: str,
+) -> None:
+    mocker.patch.dict(os.environ, environ, clear=True)
+    assert default_socket_path() == expected.format(uid=os.getuid())
+
+
+def test_request_prompt_no_daemon(tmp_path: Path) -> None:
+    res = request_prompt(str(tmp_path / 'missing.sock'), '/')
+    assert_issue(res, 'prompter daemon unavailable')
@@ -0,0 +1,143 @@
+from unittest.mock import Mock
+
+import pytest
+from m.core import Good, issue
+from m.github.graphql.batch import (
+    Lookup,
+    batch_graphql,
+    build_batch_query,
+    chunk_lookups,
+)
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok
+
+PR_QUERY = """repository(owner: $owner, name: $repo) {
+  pullRequest(number: $pr) { mergeable }
+}"""
+PR_PARAMS = ['$owner: String!', '$repo: String!', '$pr: Int!']
+
+
+def _pr_lookup(repo: str, pr: int) -> Lookup:
+    return Lookup(
+        query=PR_QUERY,
+        params=PR_PARAMS,
+        variables={'owner': 'm', 'repo': repo, 'pr': pr},
+    )
+
+
+@pytest.fixture
+def request_mock(mocker: MockerFixture) -> Mock:
+    return mocker.patch('m.github.graphql.batch.request')
+
+
+def test_build_batch_query() -> None:
+    query, variables = build_batch_query([
+        _pr_lookup('a', 1),
+        _pr_lookup('b', 2),
+    ])
+    assert query.startswith(
+        'query ($owner_r0: String!, $repo_r0: String!, $pr_r0: Int!, '
+        '$owner_r1: String!, $repo_r1: String!, $pr_r1: Int!) {',
+    )
+    assert 'r0: repository(owner: $owner_r0, name: $repo_r0)' in query
+    assert 'r1: repository(owner: $owner_r1, name: $repo_r1)' in query
+    assert 'pullRequest(number: $pr_r1)' in query
+    assert variables == {
+        'owner_r0': 'm',
+        'repo_r0': 'a',
+        'pr_r0': 1,
+        'owner_r1': 'm',
+        'repo_r1': 'b',
+        'pr_r1': 2,
+    }
+
+
+def test_build_batch_query_no_params() -> None:
+    query, variables = build_batch_query([Lookup(query='viewer { login }')])
+    assert query == 'query {\nr0: viewer { login }\n}'
+    assert not variables
+
+
+def test_build_batch_query_strings() -> None:
+    query, _ = build_batch_query([Lookup(
+        query='search(query: "cost $x \\" $y", first: $n) {\n'
+        '  # sorted by $n\n'
+        '  nodes { ... on Issue { body(format: """$md""") } }\n'
+        '}',
+        params=['$n: Int!'],
+        variables={'n': 5},
+    )])
+    assert 'r0: search(query: "cost $x \\" $y", first: $n_r0) {' in query
+    assert '# sorted by $n\n' in query
+    assert 'body(format: """$md""")' in query
+
+
+def test_chunk_lookups() -> None:
+    lookups = [Lookup(query='viewer { login }', nodes=10) for _ in range(7)]
+    sizes = [len(chunk) for chunk in chunk_lookups(lookups, max_size=3)]
+    assert sizes == [3, 3, 1]
+    sizes = [len(chunk) for chunk in chunk_lookups(lookups, max_nodes=25)]
+    assert sizes == [2, 2, 2, 1]
+
+
+def test_chunk_large_lookup() -> None:
+    lookups = [
+        Lookup(query='a', nodes=1),
+        Lookup(query='b', nodes=100),
+        Lookup(query='c', nodes=1),
+    ]
+    chunks = list(chunk_lookups(lookups, max_nodes=50))
+    assert [[lk.query for lk in chunk] for chunk in chunks] == [
+        ['a'], ['b'], ['c'],
+    ]
+
+
+def test_batch_graphql(request_mock: Mock) -> None:
+    request_mock.side_effect = [
+        Good({
+            'data': {
+                'r0': {'pullRequest': {'mergeable': 'MERGEABLE'}},
+                'r1': None,
+            },
+            'errors': [{
+                'path': ['r1', 'pullRequest'],
+                'message': 'Could not resolve to a PullRequest',
+            }],
+        }),
+        Good({'data': {'r0': {'pullRequest': {'mergeable': 'CONFLICTING'}}}}),
+    ]
+    results = batch_graphql(
+        'token',
+        [_pr_lookup('a', 1), _pr_lookup('b', 2), _pr_lookup('c', 3)],
+        max_size=2,
+    )
+    assert request_mock.call_count == 2
+    assert assert_ok(results[0]) == {'pullRequest': {'mergeable': 'MERGEABLE'}}
+    err = assert_issue(results[1], 'github graphql errors')
+    assert err.context == {'errors': [{
+        'path': ['r1', 'pullRequest'],
+        'message': 'Could not resolve to a PullRequest',
+    }]}
+    assert assert_ok(results[2]) == {
+        'pullRequest': {'mergeable': 'CONFLICTING'},
+    }
+    _, endpoint, _, payload = request_mock.call_args.args
+    assert endpoint == '/graphql'
+    assert payload['variables'] == {'owner_r0': 'm', 'repo_r0': 'c', 'pr_r0': 3}
+
+
+def test_batch_graphql_request_failure(request_mock: Mock) -> None:
+    request_mock.return_value = issue('http request failure (502)')
+    results = batch_graphql('token', [_pr_lookup('a', 1), _pr_lookup('b', 2)])
+    assert request_mock.call_count == 1
+    for res in results:
+        assert_issue(res, 'http request failure (502)')
+
+
+def test_batch_graphql_query_errors(request_mock: Mock) -> None:
+    request_mock.return_value = Good({
+        'errors': [{'message': 'query too complex'}],
+    })
+    results = batch_graphql('token', [_pr_lookup('a', 1), _pr_lookup('b', 2)])
+    for res in results:
+        assert_issue(res, 'github graphql errors')
@@ -0,0 +1,128 @@
+from typing import Any, List, Optional
+from unittest.mock import Mock
+
+import pytest
+from m.core import Good, issue
+from m.github.ci import CommitInfo, get_ci_run_info
+from m.github.graphql.paginate import MAX_PAGE_SIZE, fetch_nodes, paginate
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok
+
+QUERY = 'query ($first: Int!, $after: String) { viewer { items } }'
+PATH = 'viewer.items'
+
+
+def _page(
+    nodes: List[Any],
+    cursor: Optional[str] = None,
+    path: str = PATH,
+) -> Any:
+    connection: Any = {
+        'nodes': nodes,
+        'pageInfo': {'hasNextPage': cursor is not None, 'endCursor': cursor},
+    }
+    for key in reversed(path.split('.')):
+        connection = {key: connection}
+    return Good(connection)
+
+
+@pytest.fixture
+def graphql(mocker: MockerFixture) -> Mock:
+    return mocker.patch('m.github.graphql.api.graphql')
+
+
+def test_paginate_all_pages(graphql: Mock) -> None:
+    graphql.side_effect = [
+        _page([1, 2], 'c1'),
+        _page([3], 'c2'),
+        _page([]),
+    ]
+    nodes = [assert_ok(node) for node in paginate('t', QUERY, {}, PATH)]
+    assert nodes == [1, 2, 3]
+    cursors = [call.args[2]['after'] for call in graphql.call_args_list]
+    assert cursors == [None, 'c1', 'c2']
+    assert graphql.call_args.args[2]['first'] == MAX_PAGE_SIZE
+
+
+def test_paginate_is_lazy(graphql: Mock) -> None:
+    graphql.side_effect = [_page([1, 2], 'c1'), _page([3])]
+    pages = paginate('t', QUERY, {'owner': 'm'}, PATH)
+    assert assert_ok(next(pages)) == 1
+    assert graphql.call_count == 1
+    assert graphql.call_args.args[2]['owner'] == 'm'
+
+
+def test_paginate_error(graphql: Mock) -> None:
+    graphql.side_effect = [_page([1], 'c1'), issue('rate limited')]
+    res = list(paginate('t', QUERY, {}, PATH))
+    assert assert_ok(res[0]) == 1
+    assert_issue(res[1], 'rate limited')
+    assert len(res) == 2
+
+
+def test_fetch_nodes_limit(graphql: Mock) -> None:
+    graphql.side_effect = [_page(list(range(100)), 'c1'), _page([1, 2], 'c2')]
+    nodes = assert_ok(fetch_nodes('t', QUERY, {}, PATH, limit=102))
+    assert len(nodes) == 102
+    sizes = [call.args[2]['first'] for call in graphql.call_args_list]
+    assert sizes == [100, 2]
+
+
+def test_fetch_nodes_missing_path(graphql: Mock) -> None:
+    graphql.return_value = Good({'viewer': {}})
+    res = fetch_nodes('t', QUERY, {}, PATH)
+    assert_issue(res, '`viewer.items` path was not found')
+
+
+def test_ci_run_info_pr_files(graphql: Mock) -> None:
+    first_page = _page(
+        [{'path': f'file{index}.py'} for index in range(100)],
+        'c1',
+        'repository.pullRequest.files',
+    ).value
+    pull_request = first_page['repository']['pullRequest']
+    pull_request.update(
+        author={'login': 'dev', 'avatarUrl': '', 'email': ''},
+        headRefName='feature',
+        baseRefName='master',
+        baseRefOid='abc',
+        url='url',
+        title='title',
+        body='body',
+        isDraft=False,
+    )
+    pull_request['files']['totalCount'] = 250
+    first_page['repository']['commit'] = {'oid': 'sha', 'message': 'msg'}
+    graphql.side_effect = [
+        Good(first_page),
+        _page(
+            [{'path': f'next{index}.py'} for index in range(100)],
+            'c2',
+            'repository.pullRequest.files',
+        ),
+        _page(
+            [{'path': 'CHANGELOG.md'}],
+            'c3',
+            'repository.pullRequest.files',
+        ),
+    ]
+    res = get_ci_run_info(
+        'token',
+        CommitInfo(owner='owner', repo='repo', sha='sha'),
+        pr_number=7,
+        file_count=201,
+        include_release=False,
+    )
+    pr = assert_ok(res).pull_request
+    assert pr is not None
+    assert len(pr.files) == 201
+    assert pr.files[-1] == 'CHANGELOG.md'
+    assert pr.file_count == 250
+    assert graphql.call_count == 3
+    assert graphql.call_args.args[2] == {
+        'owner': 'owner',
+        'repo': 'repo',
+        'pr': 7,
+        'first': 1,
+        'after': 'c2',
+    }
@@ -0,0 +1,76 @@
+import time
+from typing import Iterator
+
+import pytest
+from m.core.http import ConnectionPool
+from m.github import request as github_request
+from m.github.api import GithubShaStatus, commit_statuses
+from m.github.scheduler import RequestScheduler
+from m.testing import FakeGithub
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+LATENCY = 0.1
+
+
+def _statuses(count: int) -> list[GithubShaStatus]:
+    return [
+        GithubShaStatus(
+            sha='abc123',
+            context=f'image-{index}',
+            state='success',
+            description='built',
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def fake(
+    mocker: MockerFixture,
+    http_pool: ConnectionPool,
+    github_scheduler: RequestScheduler,
+) -> Iterator[FakeGithub]:
+    with FakeGithub(latency=LATENCY) as fake_github:
+        mocker.patch.object(github_request, 'GITHUB_API', fake_github.url)
+        yield fake_github
+
+
+def test_commit_statuses_concurrently(fake: FakeGithub) -> None:
+    start = time.perf_counter()
+    res = commit_statuses('t', 'o', 'r', _statuses(8), concurrency=4)
+    elapsed = time.perf_counter() - start
+    responses = assert_ok(res)
+    assert [res['context'] for res in responses] == [
+        f'image-{index}' for index in range(8)
+    ]
+    assert len(fake.state.statuses) == 8
+    # two rounds of 4 requests over 4 reused connections
+    assert elapsed < 4 * LATENCY
+    assert fake.connections == 4
+
+
+def test_commit_statuses_failures(fake: FakeGithub) -> None:
+    fake.fail_next(422)
+    res = commit_statuses('t', 'o', 'r', _statuses(3), concurrency=1)
+    err = assert_issue(res, 'commit status failures')
+    context = issue_context(err)
+    assert list(context['failed']) == ['abc123:image-0']
+    assert context['created'] == 2
+
+
+def test_commit_statuses_rate_limited(
+    fake: FakeGithub,
+    github_scheduler: RequestScheduler,
+) -> None:
+    fake.fail_next(429)
+    res = commit_statuses('t', 'o', 'r', _statuses(3), concurrency=1)
+    assert len(assert_ok(res)) == 3
+    assert len(fake.state.statuses) == 3
+    assert fake.count('POST', '/repos/o/r/statuses') == 4
+    assert github_scheduler.stats.retries == 1
+
+
+def test_commit_statuses_empty(fake: FakeGithub) -> None:
+    assert assert_ok(commit_statuses('t', 'o', 'r', [])) == []
+    assert not fake.requests
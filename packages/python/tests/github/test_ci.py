@@ -0,0 +1,83 @@
+import json
+import time
+from http import HTTPStatus
+from typing import Any, Iterator, List
+
+import pytest
+from m.core.http import ConnectionPool
+from m.github import request as github_request
+from m.github.ci import CommitInfo, get_ci_run_info
+from m.github.scheduler import RequestScheduler
+from m.testing import LocalServer, QuietHandler
+from pytest_mock import MockerFixture
+from tests.conftest import assert_ok
+
+# Round trip time simulated by the server.
+LATENCY = 0.2
+
+HEAD_SHA = '5d0a41d34f5b12cfbf42440c7f3d20e5916666e2'
+BASE_SHA = '7c1017d38a5081f1987420ef3962f2e9cb592c63'
+MERGE_SHA = '4538b2a2556efcbdfc1e7df80c4f71ade45f3958'
+
+
+def _commit(oid: str, message: str) -> Any:
+    return {
+        'oid': oid,
+        'message': message,
+        'author': {'name': 'dev', 'user': {'login': 'dev'}},
+    }
+
+
+class _GraphqlHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+    queries: List[str] = []
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        payload = json.loads(
+            self.rfile.read(int(self.headers['content-length'])),
+        )
+        self.queries.append(payload['query'])
+        time.sleep(LATENCY)
+        merge_commit = _commit(MERGE_SHA, f'Merge {HEAD_SHA} into {BASE_SHA}')
+        merge_commit['parents'] = {'nodes': [
+            _commit(BASE_SHA, 'base commit'),
+            _commit(HEAD_SHA, 'head commit'),
+        ]}
+        res_body = json.dumps({
+            'data': {'repository': {'commit': merge_commit}},
+        }).encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+
+
+@pytest.fixture
+def server(
+    mocker: MockerFixture,
+    http_pool: ConnectionPool,
+    github_scheduler: RequestScheduler,
+) -> Iterator[LocalServer]:
+    _GraphqlHandler.queries = []
+    with LocalServer(_GraphqlHandler) as local_server:
+        mocker.patch.object(github_request, 'GITHUB_API', local_server.url)
+        yield local_server
+
+
+def test_merge_commit_single_request(server: LocalServer) -> None:
+    start = time.perf_counter()
+    res = get_ci_run_info(
+        'token',
+        CommitInfo(owner='owner', repo='repo', sha=MERGE_SHA),
+        pr_number=None,
+        file_count=10,
+        include_release=False,
+    )
+    elapsed = time.perf_counter() - start
+    commit = assert_ok(res).commit
+    assert commit.sha == HEAD_SHA
+    assert commit.message == 'head commit'
+    # the merge commit and its parents are requested together
+    assert len(_GraphqlHandler.queries) == 1
+    assert 'parents(first: 2)' in _GraphqlHandler.queries[0]
+    assert elapsed < 2 * LATENCY
@@ -0,0 +1,241 @@
+from http import HTTPStatus
+from typing import Iterator, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+from m.core import Good, issue
+from m.core.http import ConnectionPool, HttpMethod
+from m.github import request as github_request
+from m.github.scheduler import RequestScheduler
+from m.testing import LocalServer, QuietHandler
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+# status code and headers of a response
+Reply = Tuple[int, dict]
+
+
+class _RateLimitHandler(QuietHandler):
+    protocol_version = 'HTTP/1.1'
+    # replies sent in order, the last one is repeated
+    replies: List[Reply] = []
+    received: List[str] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        self.rfile.read(int(self.headers.get('content-length', 0)))
+        self._reply()
+
+    def _reply(self) -> None:
+        self.received.append(self.command)
+        replies = type(self).replies
+        code, headers = replies.pop(0) if len(replies) > 1 else replies[0]
+        res_body = b'{"ok": true}'
+        self.send_response(code)
+        for name, header_value in headers.items():
+            self.send_header(name, header_value)
+        self.send_header('content-length', str(len(res_body)))
+        self.end_headers()
+        self.wfile.write(res_body)
+
+
+class _Clock:
+    """Time that only moves when sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def scheduler(mocker: MockerFixture, clock: _Clock) -> RequestScheduler:
+    req_scheduler = RequestScheduler(sleep=clock.sleep, clock=clock.time)
+    mocker.patch.object(github_request, 'scheduler', req_scheduler)
+    return req_scheduler
+
+
+@pytest.fixture
+def server(
+    mocker: MockerFixture,
+    http_pool: ConnectionPool,
+) -> Iterator[LocalServer]:
+    _RateLimitHandler.received = []
+    with LocalServer(_RateLimitHandler) as local_server:
+        mocker.patch.object(github_request, 'GITHUB_API', local_server.url)
+        yield local_server
+
+
+def test_retry_after(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+    clock: _Clock,
+) -> None:
+    _RateLimitHandler.replies = [
+        (HTTPStatus.TOO_MANY_REQUESTS, {'retry-after': '5'}),
+        (HTTPStatus.OK, {}),
+    ]
+    res = github_request.request('token', '/repos')
+    assert assert_ok(res) == {'ok': True}
+    assert clock.sleeps == [5]
+    assert scheduler.stats.requests == 2
+    assert scheduler.stats.retries == 1
+    assert scheduler.stats.wait_time == 5
+
+
+def test_retry_server_errors(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+    clock: _Clock,
+) -> None:
+    _RateLimitHandler.replies = [
+        (HTTPStatus.BAD_GATEWAY, {}),
+        (HTTPStatus.SERVICE_UNAVAILABLE, {}),
+        (HTTPStatus.OK, {}),
+    ]
+    res = github_request.request('token', '/graphql', HttpMethod.post, {
+        'query': '{ viewer { login } }',
+    }, cacheable=True)
+    assert_ok(res)
+    assert scheduler.stats.retries == 2
+    # jittered exponential backoff
+    assert 0.5 <= clock.sleeps[0] <= 1
+    assert 1 <= clock.sleeps[1] <= 2
+
+
+def test_give_up(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+) -> None:
+    _RateLimitHandler.replies = [(HTTPStatus.SERVICE_UNAVAILABLE, {})]
+    res = github_request.request('token', '/repos')
+    err = assert_issue(res, 'http request failure (503)')
+    assert issue_context(err)['code'] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert scheduler.stats.requests == 4
+    assert scheduler.stats.retries == 3
+
+
+def test_no_retry_for_writes(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+) -> None:
+    _RateLimitHandler.replies = [
+        (HTTPStatus.SERVICE_UNAVAILABLE, {}),
+        (HTTPStatus.OK, {}),
+    ]
+    res = github_request.request('token', '/statuses', HttpMethod.post, {
+        'state': 'success',
+    })
+    assert_issue(res, 'http request failure (503)')
+    assert _RateLimitHandler.received == ['POST']
+    assert scheduler.stats.retries == 0
+
+
+def test_no_retry_for_client_errors(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+) -> None:
+    _RateLimitHandler.replies = [(HTTPStatus.NOT_FOUND, {})]
+    res = github_request.request('token', '/repos')
+    assert_issue(res, 'http request failure (404)')
+    assert scheduler.stats.requests == 1
+
+
+def test_wait_for_reset(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+    clock: _Clock,
+) -> None:
+    _RateLimitHandler.replies = [(HTTPStatus.OK, {
+        'x-ratelimit-remaining': '1',
+        'x-ratelimit-reset': str(int(clock.now) + 60),
+    })]
+    assert_ok(github_request.request('token', '/repos'))
+    assert not clock.sleeps
+    assert_ok(github_request.request('token', '/repos'))
+    assert clock.sleeps == [60]
+
+
+def test_exhausted_primary_limit(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+    clock: _Clock,
+) -> None:
+    _RateLimitHandler.replies = [
+        (HTTPStatus.FORBIDDEN, {
+            'x-ratelimit-remaining': '0',
+            'x-ratelimit-reset': str(int(clock.now) + 30),
+        }),
+        (HTTPStatus.OK, {'x-ratelimit-remaining': '4999'}),
+    ]
+    assert_ok(github_request.request('token', '/repos'))
+    assert clock.sleeps == [30]
+    assert scheduler.stats.retries == 1
+
+
+def test_throttle(clock: _Clock) -> None:
+    req_scheduler = RequestScheduler(clock=clock.time, sleep=clock.sleep)
+    rate_limit = req_scheduler.limit('core')
+    rate_limit.remaining = 10
+    rate_limit.reset_at = clock.now + 100
+    assert req_scheduler.delay() == 10
+    rate_limit.remaining = 100
+    assert req_scheduler.delay() == 0
+
+
+def test_limits_per_resource(
+    server: LocalServer,
+    scheduler: RequestScheduler,
+    clock: _Clock,
+) -> None:
+    _RateLimitHandler.replies = [(HTTPStatus.OK, {
+        'x-ratelimit-resource': 'graphql',
+        'x-ratelimit-remaining': '0',
+        'x-ratelimit-reset': str(int(clock.now) + 60),
+    })]
+    assert_ok(github_request.request('token', '/graphql', HttpMethod.post, {
+        'query': '{ viewer { login } }',
+    }, cacheable=True))
+    assert scheduler.limit('graphql').remaining == 0
+    assert scheduler.limit('core').remaining is None
+    # an exhausted graphql limit does not throttle the rest api
+    _RateLimitHandler.replies = [(HTTPStatus.OK, {
+        'x-ratelimit-resource': 'core',
+        'x-ratelimit-remaining': '4999',
+    })]
+    assert_ok(github_request.request('token', '/repos'))
+    assert not clock.sleeps
+    assert scheduler.delay('graphql') == 60
+
+
+def test_max_wait(clock: _Clock) -> None:
+    req_scheduler = RequestScheduler(
+        clock=clock.time,
+        sleep=clock.sleep,
+        max_wait=10,
+    )
+    req_scheduler.retry_at = clock.now + 3600
+    assert req_scheduler.delay() == 10
+
+
+def test_retry_network_errors(clock: _Clock) -> None:
+    req_scheduler = RequestScheduler(clock=clock.time, sleep=clock.sleep)
+    send = Mock(side_effect=[
+        issue('https request failure', cause=ConnectionResetError()),
+        Good('done'),
+    ])
+    assert assert_ok(req_scheduler.run(send, idempotent=True)) == 'done'
+    assert req_scheduler.stats.retries == 1
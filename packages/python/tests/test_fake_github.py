@@ -0,0 +1,114 @@
+import time
+from http import HTTPStatus
+from http import client as httplib
+from typing import Iterator, List
+
+import pytest
+from m.core import http
+from m.core.http import ConnectionPool, HttpMethod
+from m.github import api
+from m.github import request as github_request
+from m.github.graphql.queries.branch_prs import fetch as fetch_branch_prs
+from m.github.scheduler import RequestScheduler
+from m.testing import FakeGithub
+from pytest_mock import MockerFixture
+from tests.conftest import assert_issue, assert_ok, issue_context
+
+PR_INFO = api.GithubPullRequest(
+    title='(release) 1.1.0',
+    body='release',
+    head='release/1.1.0',
+    base='master',
+)
+
+
+@pytest.fixture
+def fake(
+    mocker: MockerFixture,
+    http_pool: ConnectionPool,
+    github_scheduler: RequestScheduler,
+) -> Iterator[FakeGithub]:
+    with FakeGithub() as fake_github:
+        mocker.patch.object(github_request, 'GITHUB_API', fake_github.url)
+        yield fake_github
+
+
+def test_pull_requests(fake: FakeGithub) -> None:
+    created = assert_ok(api.create_pr('t', 'o', 'r', PR_INFO))
+    assert created['number'] == 1
+    prs = assert_ok(fetch_branch_prs('t', 'o', 'r', 'release/1.1.0'))
+    assert [(pr.number, pr.merged) for pr in prs] == [(1, False)]
+    assert_ok(api.merge_pr('t', 'o', 'r', 1, None))
+    assert fake.state.pull_requests[0].merged
+    res = api.merge_pr('t', 'o', 'r', 1, None)
+    assert_issue(res, 'http request failure (405)')
+    assert fake.count('PUT', '/repos/o/r/pulls/1/merge') == 2
+
+
+def test_releases_and_statuses(fake: FakeGithub) -> None:
+    assert_ok(api.create_release('t', 'o', 'r', '1.0.0'))
+    assert fake.state.releases == ['1.0.0']
+    status = api.GithubShaStatus(
+        sha='abc123',
+        context='build',
+        state='success',
+        description='done',
+    )
+    assert_ok(api.commit_status('t', 'o', 'r', status))
+    assert fake.state.statuses == [{
+        'sha': 'abc123',
+        'context': 'build',
+        'state': 'success',
+        'description': 'done',
+    }]
+
+
+def test_unknown_endpoint(fake: FakeGithub) -> None:
+    res = github_request.request('t', '/repos/o/r/unknown')
+    assert_issue(res, 'http request failure (404)')
+
+
+def test_injected_errors_are_retried(fake: FakeGithub) -> None:
+    fake.state.releases.append('1.0.0')
+    fake.fail_next(HTTPStatus.BAD_GATEWAY, HTTPStatus.TOO_MANY_REQUESTS)
+    prs = assert_ok(fetch_branch_prs('t', 'o', 'r', 'release/1.1.0'))
+    assert not prs
+    assert fake.count('POST', '/graphql') == 3
+    assert github_request.scheduler.stats.retries == 2
+
+
+def test_rate_limit_headers(http_pool: ConnectionPool) -> None:
+    remaining: List[str] = []
+
+    def _observe(res: httplib.HTTPResponse) -> None:
+        remaining.append(res.getheader('x-ratelimit-remaining', ''))
+
+    with FakeGithub(rate_limit=2) as fake:
+        results = [
+            http.fetch_json(
+                f'{fake.url}/graphql',
+                {},
+                HttpMethod.post,
+                {'query': 'query { viewer { login } }'},
+                on_response=_observe,
+            )
+            for _ in range(3)
+        ]
+    assert_ok(results[0])
+    assert_ok(results[1])
+    err = assert_issue(results[2], 'http request failure (403)')
+    assert 'API rate limit exceeded' in issue_context(err)['res_body']
+    assert remaining == ['1', '0', '0']
+
+
+def test_latency(http_pool: ConnectionPool) -> None:
+    with FakeGithub(latency=0.1) as fake:
+        start = time.perf_counter()
+        http.fetch_json(f'{fake.url}/graphql', {}, HttpMethod.post, {})
+        assert time.perf_counter() - start >= 0.1
+
+
+def test_error_rate(http_pool: ConnectionPool) -> None:
+    with FakeGithub(error_rate=1) as fake:
+        res = http.fetch_json(f'{fake.url}/graphql', {}, HttpMethod.post, {})
+    assert_issue(res, 'http request failure (502)')